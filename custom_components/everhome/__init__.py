@@ -1,19 +1,46 @@
 """The Everhome integration."""
 
 import logging
+from datetime import timedelta
+from functools import partial
 
 import aiohttp
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ConfigEntryAuthFailed, ConfigEntryNotReady
 from homeassistant.helpers import config_entry_oauth2_flow
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.typing import ConfigType
 
 from .api import EverhomeAuth
-from .const import DOMAIN, PLATFORMS
+from .capture import async_create_recorder
+from .command_queue import async_create_command_queue
+from .const import (
+    CONF_CAPTURE,
+    CONF_COMMAND_EXPIRY,
+    CONF_COMMAND_QUEUE,
+    CONF_TRACE,
+    DEFAULT_COMMAND_EXPIRY,
+    DOMAIN,
+    PLATFORMS,
+)
 from .coordinator import EverhomeDataUpdateCoordinator
+from .prometheus import EverhomeMetricsView
+from .push import async_setup_push
+from .scheduler import async_get_scheduler
+from .tracing import async_create_tracer
 
 _LOGGER = logging.getLogger(__name__)
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Everhome component."""
+    hass.http.register_view(EverhomeMetricsView(hass))
+    return True
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Everhome from a config entry."""
@@ -38,21 +65,56 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         raise ConfigEntryNotReady from err
 
     coordinator = EverhomeDataUpdateCoordinator(hass, auth, entry)
+    if entry.options.get(CONF_TRACE, False):
+        coordinator.tracer = await async_create_tracer(hass, entry.entry_id)
+        entry.async_on_unload(partial(coordinator.tracer.async_stop, hass))
+    if entry.options.get(CONF_CAPTURE, False):
+        coordinator.recorder = await async_create_recorder(hass, entry.entry_id)
+        entry.async_on_unload(partial(coordinator.recorder.async_stop, hass))
+    if entry.options.get(CONF_COMMAND_QUEUE, False):
+        coordinator.command_queue = await async_create_command_queue(
+            hass,
+            entry.entry_id,
+            entry.options.get(CONF_COMMAND_EXPIRY, DEFAULT_COMMAND_EXPIRY),
+        )
+        coordinator.metrics.command_queue_size = len(coordinator.command_queue)
+        entry.async_on_unload(coordinator.command_queue.async_save)
 
     await coordinator.async_config_entry_first_refresh()
+    coordinator.async_join_account()
+    entry.async_on_unload(async_get_scheduler(hass).async_add(coordinator))
+    if coordinator.push:
+        async_setup_push(hass, entry, coordinator)
+    elif coordinator.fast_poll_interval:
+        entry.async_on_unload(
+            async_track_time_interval(
+                hass,
+                coordinator.async_refresh_fast_tier,
+                timedelta(seconds=coordinator.fast_poll_interval),
+            )
+        )
 
     hass.data[DOMAIN][entry.entry_id] = coordinator
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+
     return True
 
 
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the config entry when its options change."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
     if unload_ok and DOMAIN in hass.data:
-        hass.data[DOMAIN].pop(entry.entry_id, None)
+        coordinator = hass.data[DOMAIN].pop(entry.entry_id, None)
+        if coordinator is not None:
+            coordinator.async_leave_account()
 
     return bool(unload_ok)
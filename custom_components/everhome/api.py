@@ -19,8 +19,13 @@ class EverhomeAuth:
         self.hass = hass
         self.session = oauth_session
         self.aiohttp_session = async_get_clientsession(hass)
+        self.token_refreshes = 0
 
     async def async_get_access_token(self) -> str:
         """Return a valid access token."""
+        previous = self.session.token.get("access_token")
         await self.session.async_ensure_token_valid()
-        return cast(str, self.session.token["access_token"])
+        token = cast(str, self.session.token["access_token"])
+        if previous is not None and token != previous:
+            self.token_refreshes += 1
+        return token
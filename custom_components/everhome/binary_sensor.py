@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 import logging
-from typing import Any, cast
+from typing import Any
 
 from homeassistant.components.binary_sensor import (
     BinarySensorDeviceClass,
@@ -13,10 +13,10 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import BINARY_SENSOR_SUBTYPES, DOMAIN
 from .coordinator import EverhomeDataUpdateCoordinator
+from .entity import EverhomeEntity
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -40,18 +40,17 @@ async def async_setup_entry(
     """Set up Everhome binary sensors based on a config entry."""
     coordinator: EverhomeDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
 
-    async_add_entities(
-        EverhomeBinarySensor(coordinator, device_id, device_data)
-        for device_id, device_data in coordinator.data.items()
-        if device_data.get("subtype") in BINARY_SENSOR_SUBTYPES
-    )
+    with coordinator.watchdog.measure("entities", len(coordinator.data)):
+        async_add_entities(
+            EverhomeBinarySensor(coordinator, device_id, device_data)
+            for device_id, device_data in coordinator.data.items()
+            if device_data.get("subtype") in BINARY_SENSOR_SUBTYPES
+        )
 
 
-class EverhomeBinarySensor(CoordinatorEntity, BinarySensorEntity):
+class EverhomeBinarySensor(EverhomeEntity, BinarySensorEntity):
     """Representation of an Everhome binary sensor."""
 
-    coordinator: EverhomeDataUpdateCoordinator
-
     def __init__(
         self,
         coordinator: EverhomeDataUpdateCoordinator,
@@ -59,8 +58,7 @@ class EverhomeBinarySensor(CoordinatorEntity, BinarySensorEntity):
         device_data: dict[str, Any],
     ) -> None:
         """Initialize the binary sensor."""
-        super().__init__(coordinator)
-        self._device_id = device_id
+        super().__init__(coordinator, device_id)
         self._attr_name = device_data.get("name", f"Sensor {device_id}")
         entry_id = coordinator.entry.entry_id
         self._attr_unique_id = f"{DOMAIN}_{entry_id}_{device_id}"
@@ -76,16 +74,6 @@ class EverhomeBinarySensor(CoordinatorEntity, BinarySensorEntity):
             sw_version=device_data.get("firmware_version", "Unknown"),
         )
 
-    @property
-    def device_data(self) -> dict[str, Any]:
-        """Return the device data."""
-        return cast(dict[str, Any], self.coordinator.data.get(self._device_id, {}))
-
-    @property
-    def available(self) -> bool:
-        """Return True if entity is available."""
-        return self._device_id in self.coordinator.data
-
     @property
     def is_on(self) -> bool | None:
         """Return True if the sensor is triggered."""
@@ -110,7 +98,7 @@ class EverhomeBinarySensor(CoordinatorEntity, BinarySensorEntity):
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return battery state attributes if present."""
-        attrs: dict[str, Any] = {}
+        attrs: dict[str, Any] = dict(super().extra_state_attributes or {})
         states = self.device_data.get("states", {})
 
         battery_bool = states.get("batteryboolean")
@@ -122,3 +110,7 @@ class EverhomeBinarySensor(CoordinatorEntity, BinarySensorEntity):
             attrs["battery_level"] = int(battery_pct)
 
         return attrs
+
+    def _state_key(self) -> tuple[Any, ...]:
+        """Return the derived sensor state."""
+        return (*super()._state_key(), self.is_on)
@@ -0,0 +1,93 @@
+"""Request budget planning for Everhome accounts.
+
+The Everhome cloud limits the number of requests an account may make per
+hour or day, shared between polling and device commands. The planner keeps
+a rolling window of the requests made and derives the poll interval that
+fits the rest of the budget after keeping a reserve for commands.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from collections import deque
+
+# Share of the budget kept free for interactive commands
+BUDGET_RESERVE = 0.1
+
+# Length in seconds of the supported budget periods
+BUDGET_PERIODS = {"hour": 3600, "day": 86400}
+
+
+class RequestBudget:
+    """Track requests in a rolling window and plan the poll interval."""
+
+    def __init__(
+        self, limit: int, period: float, reserve: float = BUDGET_RESERVE
+    ) -> None:
+        """Initialize a budget of limit requests per period seconds."""
+        self.limit = limit
+        self.period = period
+        self.reserve = math.ceil(limit * reserve)
+        self._requests: deque[float] = deque()
+        self._commands: deque[float] = deque()
+        self._start = time.monotonic()
+
+    def _expire(self) -> float:
+        """Forget requests that left the window; return the current time."""
+        now = time.monotonic()
+        cutoff = now - self.period
+        for requests in (self._requests, self._commands):
+            while requests and requests[0] <= cutoff:
+                requests.popleft()
+        return now
+
+    def spend(self, command: bool = False) -> None:
+        """Record a request against the budget."""
+        now = self._expire()
+        self._requests.append(now)
+        if command:
+            self._commands.append(now)
+
+    @property
+    def spent(self) -> int:
+        """Return the requests made within the window."""
+        self._expire()
+        return len(self._requests)
+
+    @property
+    def remaining(self) -> int:
+        """Return the requests left within the window."""
+        return max(0, self.limit - self.spent)
+
+    def poll_interval(self, minimum: float, background: float = 0) -> float:
+        """Return the poll interval that leaves the reserve for commands.
+
+        Commands beyond the reserve are taken out of the polling share, so a
+        busy period slows polling down instead of exhausting the budget. So
+        are the background requests, such as fast tier refreshes, planned
+        per period.
+        """
+        self._expire()
+        polls = self.limit - max(self.reserve, len(self._commands)) - background
+        if polls <= 0:
+            return self.period
+        return max(minimum, self.period / polls)
+
+    def allows(self, requests: int) -> bool:
+        """Return True if the requests fit without using the reserve."""
+        return self.remaining - requests >= self.reserve
+
+    def exhausted_in(self) -> float | None:
+        """Return seconds until the budget runs out at the current rate.
+
+        None means the current rate fits the budget.
+        """
+        now = self._expire()
+        window = min(self.period, now - self._start)
+        if not self._requests or window <= 0:
+            return None
+        rate = len(self._requests) / window
+        if rate * self.period <= self.limit:
+            return None
+        return self.remaining / rate
@@ -0,0 +1,220 @@
+"""Opt-in recording of Everhome cloud traffic.
+
+While capturing, every /device response and device command of an entry is
+appended with its time offset to a gzip compressed JSON-lines file in the
+config directory. Device ids are replaced with stable pseudonyms and names,
+rooms and other identifying values are redacted before anything is written,
+so a capture can be shared to reproduce the shape of a real account.
+
+Captures are read and replayed by the development tools in tests/.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+CAPTURE_VERSION = 1
+
+REDACTED = "**REDACTED**"
+
+# Keys whose values identify a home or a person
+REDACT_KEYS = frozenset(
+    {
+        "address",
+        "email",
+        "ip",
+        "latitude",
+        "longitude",
+        "mac",
+        "name",
+        "owner",
+        "room",
+        "serial",
+        "serial_number",
+    }
+)
+
+EVENT_DEVICES = "devices"
+EVENT_COMMAND = "command"
+
+
+def redact(value: Any, pseudonyms: dict[str, str]) -> Any:
+    """Return a copy of a payload with identifying values removed.
+
+    Ids are mapped to pseudonyms that stay the same for the whole capture,
+    so a device keeps its identity across polls and commands.
+    """
+    if isinstance(value, list):
+        return [redact(item, pseudonyms) for item in value]
+    if not isinstance(value, dict):
+        return value
+    redacted: dict[str, Any] = {}
+    for key, item in value.items():
+        if key in REDACT_KEYS:
+            redacted[key] = REDACTED
+        elif (key == "id" or key.endswith("_id")) and isinstance(item, (str, int)):
+            redacted[key] = pseudonym(str(item), pseudonyms)
+        else:
+            redacted[key] = redact(item, pseudonyms)
+    return redacted
+
+
+def pseudonym(device_id: str, pseudonyms: dict[str, str]) -> str:
+    """Return the stable pseudonym of an id."""
+    if device_id not in pseudonyms:
+        pseudonyms[device_id] = f"device_{len(pseudonyms) + 1}"
+    return pseudonyms[device_id]
+
+
+@dataclass
+class CaptureEvent:
+    """A recorded /device response or device command."""
+
+    offset: float
+    kind: str
+    status: int
+    devices: list[dict[str, Any]] | None = None
+    device_id: str | None = None
+    action: str | None = None
+    params: dict[str, Any] | None = None
+
+
+class CaptureRecorder:
+    """Append redacted events of one config entry to a capture file."""
+
+    def __init__(self, path: str, clock: Callable[[], float] = time.monotonic) -> None:
+        """Initialize the recorder; the file is opened on its writer thread."""
+        self.path = path
+        self._clock = clock
+        self._start = clock()
+        self._pseudonyms: dict[str, str] = {}
+        # One worker keeps the events in order and off the event loop
+        self._executor = ThreadPoolExecutor(1, thread_name_prefix="everhome_capture")
+        self._file: gzip.GzipFile | None = None
+        self._stopped = False
+        self._executor.submit(self._open)
+
+    def _open(self) -> None:
+        try:
+            self._file = gzip.open(self.path, "wb")
+        except OSError as err:
+            _LOGGER.error("Cannot record Everhome traffic to %s: %s", self.path, err)
+            return
+        self._write_line(
+            {
+                "version": CAPTURE_VERSION,
+                "started": datetime.now(timezone.utc).isoformat(),
+            }
+        )
+
+    def _write_line(self, data: dict[str, Any]) -> None:
+        if self._file is None:
+            return
+        self._file.write(json.dumps(data, separators=(",", ":")).encode() + b"\n")
+        # Keep what was recorded so far readable should Home Assistant stop
+        self._file.flush()
+
+    def _submit(self, func: Callable[..., None], *args: Any) -> None:
+        if not self._stopped:
+            self._executor.submit(func, *args)
+
+    def record_devices(self, status: int, body: bytes | None) -> None:
+        """Record a /device response; decoding happens on the writer thread."""
+        self._submit(self._write_devices, self._clock() - self._start, status, body)
+
+    def _write_devices(self, offset: float, status: int, body: bytes | None) -> None:
+        devices = None
+        if body is not None:
+            try:
+                devices = redact(json.loads(body), self._pseudonyms)
+            except ValueError:
+                _LOGGER.debug("Recording an undecodable /device response")
+        event = CaptureEvent(offset, EVENT_DEVICES, status, devices=devices)
+        self._write_line(_serialize(event))
+
+    def record_command(
+        self,
+        device_id: str,
+        action: str,
+        params: dict[str, Any] | None,
+        status: int,
+    ) -> None:
+        """Record a device command and the status it was answered with."""
+        self._submit(
+            self._write_command,
+            self._clock() - self._start,
+            device_id,
+            action,
+            params,
+            status,
+        )
+
+    def _write_command(
+        self,
+        offset: float,
+        device_id: str,
+        action: str,
+        params: dict[str, Any] | None,
+        status: int,
+    ) -> None:
+        event = CaptureEvent(
+            offset,
+            EVENT_COMMAND,
+            status,
+            device_id=pseudonym(device_id, self._pseudonyms),
+            action=action,
+            params=redact(params, self._pseudonyms) if params else None,
+        )
+        self._write_line(_serialize(event))
+
+    async def async_stop(self, hass: HomeAssistant) -> None:
+        """Stop recording without blocking the event loop."""
+        if self._stop_recording():
+            await hass.async_add_executor_job(self._executor.shutdown)
+
+    def stop(self) -> None:
+        """Write pending events and close the file.
+
+        This waits for the writer thread, so call it from an executor
+        thread, or await async_stop on the event loop.
+        """
+        if self._stop_recording():
+            self._executor.shutdown(wait=True)
+
+    def _stop_recording(self) -> bool:
+        """Refuse further events and queue closing the file, once."""
+        if self._stopped:
+            return False
+        self._stopped = True
+        self._executor.submit(self._close)
+        return True
+
+    def _close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def _serialize(event: CaptureEvent) -> dict[str, Any]:
+    """Return an event without its unset fields."""
+    return {key: value for key, value in asdict(event).items() if value is not None}
+
+
+async def async_create_recorder(hass: HomeAssistant, entry_id: str) -> CaptureRecorder:
+    """Create a recorder writing to the Home Assistant config directory."""
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    path = hass.config.path(f"everhome_capture_{entry_id}_{stamp}.jsonl.gz")
+    _LOGGER.info("Recording Everhome traffic to %s", path)
+    return CaptureRecorder(path)
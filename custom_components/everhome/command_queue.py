@@ -0,0 +1,214 @@
+"""Bounded queue for device commands issued while the cloud is unreachable.
+
+Without a queue a command that finds the cloud down is lost. With one, the
+coordinator parks such commands, and every command issued after them, until
+a poll succeeds again and the queue is flushed in order at a controlled
+rate. A queued command expires after a while, since opening the shutters an
+hour late is worse than not at all, and a newer command for a device
+replaces queued commands it supersedes, so only the last of a sequence of
+open and close commands is sent. The queue is saved with Home Assistant's
+storage helper and survives restarts.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    ACTION_CLOSE,
+    ACTION_OPEN,
+    ACTION_STOP,
+    COMMAND_FLUSH_INTERVAL,
+    COMMAND_QUEUE_SIZE,
+    DOMAIN,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+
+# Seconds to batch queue changes into one storage write
+SAVE_DELAY = 5
+
+# Actions replacing each other when queued for the same device
+_SUPERSEDING = (
+    frozenset({ACTION_OPEN, ACTION_CLOSE, ACTION_STOP, "set_position"}),
+    frozenset({"on", "off"}),
+)
+
+
+def _group(action: str) -> frozenset[str]:
+    """Return the actions a queued action supersedes."""
+    return next((group for group in _SUPERSEDING if action in group), frozenset())
+
+
+@dataclass
+class QueuedCommand:
+    """A device command waiting for the cloud."""
+
+    device_id: str
+    action: str
+    params: dict[str, Any] | None
+    # Wall clock time, so expiry holds across restarts
+    expires: float
+
+    def supersedes(self, other: QueuedCommand) -> bool:
+        """Return True if sending this command makes the other pointless."""
+        if other.device_id != self.device_id:
+            return False
+        return other.action == self.action or other.action in _group(self.action)
+
+
+@dataclass
+class FlushResult:
+    """What a flush of the queue did."""
+
+    sent: int = 0
+    failed: int = 0
+    expired: int = 0
+    # Commands left because the cloud went away again
+    remaining: int = 0
+    actions: list[str] = field(default_factory=list)
+
+
+class CommandQueue:
+    """Persisted, bounded queue of commands of one config entry."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry_id: str,
+        expiry: float,
+        max_size: int = COMMAND_QUEUE_SIZE,
+        flush_interval: float = COMMAND_FLUSH_INTERVAL,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """Initialize an empty queue; call async_load to restore it."""
+        self.expiry = expiry
+        self.max_size = max_size
+        self.flush_interval = flush_interval
+        self._clock = clock
+        self._store: Store[list[dict[str, Any]]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.commands"
+        )
+        self._commands: list[QueuedCommand] = []
+
+    def __len__(self) -> int:
+        """Return the number of queued commands."""
+        return len(self._commands)
+
+    @property
+    def commands(self) -> list[QueuedCommand]:
+        """Return the queued commands, oldest first."""
+        return list(self._commands)
+
+    async def async_load(self) -> None:
+        """Restore the commands saved before a restart."""
+        stored = await self._store.async_load() or []
+        self._commands = [QueuedCommand(**command) for command in stored]
+        expired = self._drop_expired()
+        if self._commands or expired:
+            _LOGGER.info(
+                "Restored %d queued commands, %d expired during the restart",
+                len(self._commands),
+                expired,
+            )
+
+    @callback
+    def async_add(
+        self, device_id: str, action: str, params: dict[str, Any] | None = None
+    ) -> tuple[int, int]:
+        """Queue a command.
+
+        Return how many queued commands it replaced and how many old ones
+        were dropped to make room.
+        """
+        command = QueuedCommand(
+            device_id, action, params or None, self._clock() + self.expiry
+        )
+        kept = [queued for queued in self._commands if not command.supersedes(queued)]
+        replaced = len(self._commands) - len(kept)
+        kept.append(command)
+        dropped = 0
+        while len(kept) > self.max_size:
+            oldest = kept.pop(0)
+            dropped += 1
+            _LOGGER.warning(
+                "Command queue full, dropping %s on device %s",
+                oldest.action,
+                oldest.device_id,
+            )
+        self._commands = kept
+        self._async_schedule_save()
+        return replaced, dropped
+
+    def _drop_expired(self) -> int:
+        """Remove expired commands and return how many there were."""
+        now = self._clock()
+        kept = [command for command in self._commands if command.expires > now]
+        expired = len(self._commands) - len(kept)
+        self._commands = kept
+        return expired
+
+    async def async_flush(
+        self, send: Callable[[QueuedCommand], Awaitable[bool | None]]
+    ) -> FlushResult:
+        """Send the queued commands in order, pausing between them.
+
+        send returns True for a command the cloud accepted, False for one it
+        rejected and None when the cloud could not be reached, which stops
+        the flush with the rest of the queue kept for the next recovery.
+        """
+        result = FlushResult()
+        try:
+            while self._commands:
+                result.expired += self._drop_expired()
+                if not self._commands:
+                    break
+                if result.sent or result.failed:
+                    await asyncio.sleep(self.flush_interval)
+                command = self._commands[0]
+                outcome = await send(command)
+                if outcome is None:
+                    break
+                # A command queued during the send may have replaced this one
+                if self._commands and self._commands[0] is command:
+                    self._commands.pop(0)
+                result.actions.append(command.action)
+                if outcome:
+                    result.sent += 1
+                else:
+                    result.failed += 1
+        finally:
+            result.remaining = len(self._commands)
+            self._async_schedule_save()
+        return result
+
+    async def async_save(self) -> None:
+        """Write the queue now instead of after the save delay."""
+        await self._store.async_save(self._data_to_save())
+
+    @callback
+    def _async_schedule_save(self) -> None:
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> list[dict[str, Any]]:
+        return [asdict(command) for command in self._commands]
+
+
+async def async_create_command_queue(
+    hass: HomeAssistant, entry_id: str, expiry: float
+) -> CommandQueue:
+    """Create the command queue of an entry with its saved commands."""
+    queue = CommandQueue(hass, entry_id, expiry)
+    await queue.async_load()
+    return queue
@@ -5,11 +5,40 @@ from typing import Any, Optional
 
 import aiohttp
 import voluptuous as vol
+from homeassistant.config_entries import ConfigEntry, OptionsFlow
+from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers import config_entry_oauth2_flow
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
-from .const import API_BASE_URL, API_DEVICE_URL, DOMAIN
+from .budget import BUDGET_PERIODS
+from .const import (
+    API_BASE_URL,
+    API_DEVICE_URL,
+    CONF_BUDGET_PERIOD,
+    CONF_CAPTURE,
+    CONF_COMMAND_EXPIRY,
+    CONF_COMMAND_QUEUE,
+    CONF_FAST_POLL_INTERVAL,
+    CONF_LOOP_STALL_THRESHOLD,
+    CONF_LOOP_WATCHDOG,
+    CONF_METRICS_PER_DEVICE,
+    CONF_PUSH,
+    CONF_REQUEST_BUDGET,
+    CONF_STALE_WINDOW,
+    CONF_TRACE,
+    CONF_UNAVAILABLE_AFTER,
+    CONF_UNAVAILABLE_MISSES,
+    DEFAULT_BUDGET_PERIOD,
+    DEFAULT_COMMAND_EXPIRY,
+    DEFAULT_FAST_POLL_INTERVAL,
+    DEFAULT_LOOP_STALL_THRESHOLD,
+    DEFAULT_REQUEST_BUDGET,
+    DEFAULT_STALE_WINDOW,
+    DEFAULT_UNAVAILABLE_AFTER,
+    DEFAULT_UNAVAILABLE_MISSES,
+    DOMAIN,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -22,6 +51,12 @@ class ConfigFlow(  # type: ignore[call-arg]
     DOMAIN = DOMAIN
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> OptionsFlow:
+        """Return the options flow for this handler."""
+        return EverhomeOptionsFlow(config_entry)
+
     @property
     def logger(self) -> logging.Logger:
         """Return logger."""
@@ -70,3 +105,92 @@ class ConfigFlow(  # type: ignore[call-arg]
         except Exception as err:
             _LOGGER.exception("Unexpected error occurred: %s", err)
             return self.async_abort(reason="unknown")
+
+
+class EverhomeOptionsFlow(OptionsFlow):
+    """Handle Everhome options."""
+
+    def __init__(self, config_entry: ConfigEntry) -> None:
+        """Initialize the options flow."""
+        self._entry = config_entry
+
+    async def async_step_init(
+        self, user_input: Optional[dict[str, Any]] = None
+    ) -> FlowResult:
+        """Manage the Everhome options."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        options = self._entry.options
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_UNAVAILABLE_MISSES,
+                        default=options.get(
+                            CONF_UNAVAILABLE_MISSES, DEFAULT_UNAVAILABLE_MISSES
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+                    vol.Required(
+                        CONF_UNAVAILABLE_AFTER,
+                        default=options.get(
+                            CONF_UNAVAILABLE_AFTER, DEFAULT_UNAVAILABLE_AFTER
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+                    vol.Required(
+                        CONF_STALE_WINDOW,
+                        default=options.get(CONF_STALE_WINDOW, DEFAULT_STALE_WINDOW),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+                    vol.Required(
+                        CONF_METRICS_PER_DEVICE,
+                        default=options.get(CONF_METRICS_PER_DEVICE, False),
+                    ): bool,
+                    vol.Required(
+                        CONF_TRACE, default=options.get(CONF_TRACE, False)
+                    ): bool,
+                    vol.Required(
+                        CONF_CAPTURE, default=options.get(CONF_CAPTURE, False)
+                    ): bool,
+                    vol.Required(
+                        CONF_LOOP_WATCHDOG,
+                        default=options.get(CONF_LOOP_WATCHDOG, False),
+                    ): bool,
+                    vol.Required(
+                        CONF_LOOP_STALL_THRESHOLD,
+                        default=options.get(
+                            CONF_LOOP_STALL_THRESHOLD, DEFAULT_LOOP_STALL_THRESHOLD
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+                    vol.Required(
+                        CONF_REQUEST_BUDGET,
+                        default=options.get(
+                            CONF_REQUEST_BUDGET, DEFAULT_REQUEST_BUDGET
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+                    vol.Required(
+                        CONF_BUDGET_PERIOD,
+                        default=options.get(CONF_BUDGET_PERIOD, DEFAULT_BUDGET_PERIOD),
+                    ): vol.In(list(BUDGET_PERIODS)),
+                    vol.Required(
+                        CONF_PUSH, default=options.get(CONF_PUSH, False)
+                    ): bool,
+                    vol.Required(
+                        CONF_FAST_POLL_INTERVAL,
+                        default=options.get(
+                            CONF_FAST_POLL_INTERVAL, DEFAULT_FAST_POLL_INTERVAL
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+                    vol.Required(
+                        CONF_COMMAND_QUEUE,
+                        default=options.get(CONF_COMMAND_QUEUE, False),
+                    ): bool,
+                    vol.Required(
+                        CONF_COMMAND_EXPIRY,
+                        default=options.get(
+                            CONF_COMMAND_EXPIRY, DEFAULT_COMMAND_EXPIRY
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+                }
+            ),
+        )
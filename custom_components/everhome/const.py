@@ -1,7 +1,9 @@
 """Constants for the Everhome integration."""
 
+import os
+
 DOMAIN = "everhome"
-PLATFORMS = ["cover", "binary_sensor", "light", "switch"]
+PLATFORMS = ["cover", "binary_sensor", "light", "switch", "sensor"]
 
 # Device subtypes grouped by platform
 COVER_SUBTYPES = {"shutter", "blind", "awning", "curtain", "garagedoor"}
@@ -12,6 +14,8 @@ BINARY_SENSOR_SUBTYPES = {
     "smokedetector",
     "waterdetector",
 }
+# Safety sensors refreshed between full polls
+FAST_TIER_SUBTYPES = {"smokedetector", "waterdetector"}
 LIGHT_SUBTYPES = {"light"}
 SWITCH_SUBTYPES = {"socket", "watering"}
 SUPPORTED_SUBTYPES = (
@@ -25,16 +29,85 @@ CONF_ACCESS_TOKEN = "access_token"
 CONF_REFRESH_TOKEN = "refresh_token"
 CONF_TOKEN_EXPIRY = "token_expiry"
 
-# API endpoints
-API_BASE_URL = "https://everhome.cloud"
+# Options
+CONF_UNAVAILABLE_MISSES = "unavailable_misses"
+CONF_UNAVAILABLE_AFTER = "unavailable_after"
+CONF_STALE_WINDOW = "stale_window"
+CONF_METRICS_PER_DEVICE = "metrics_per_device"
+CONF_TRACE = "trace"
+CONF_CAPTURE = "capture"
+CONF_LOOP_WATCHDOG = "loop_watchdog"
+CONF_LOOP_STALL_THRESHOLD = "loop_stall_threshold"
+CONF_REQUEST_BUDGET = "request_budget"
+CONF_BUDGET_PERIOD = "budget_period"
+CONF_FAST_POLL_INTERVAL = "fast_poll_interval"
+CONF_PUSH = "push"
+# Push URL last shown to the user, stored with the entry data
+CONF_PUSH_URL = "push_url"
+CONF_COMMAND_QUEUE = "command_queue"
+CONF_COMMAND_EXPIRY = "command_expiry"
+
+# hass.data key mapping account fingerprints to the polling coordinator
+DATA_ACCOUNTS = f"{DOMAIN}_accounts"
+# hass.data key of the poll scheduler shared by all entries
+DATA_SCHEDULER = f"{DOMAIN}_scheduler"
+
+# API endpoints; EVERHOME_API_BASE_URL points the integration at another
+# server, such as the local cloud simulator
+API_BASE_URL = os.environ.get("EVERHOME_API_BASE_URL", "https://everhome.cloud")
+API_BASE_URL = API_BASE_URL.rstrip("/")
 API_TOKEN_URL = "/oauth2/token"
 API_AUTHORIZE_URL = "/oauth2/authorize"
 API_DEVICE_URL = "/device"
+API_DEVICE_DETAIL_URL = "/device/{device_id}"
 API_DEVICE_EXECUTE_URL = "/device/{device_id}/execute"
 
 # Update interval in seconds (5 minutes)
 UPDATE_INTERVAL = 300
 
+# Seconds between targeted refreshes of fast tier devices (0 disables, the
+# default, as each refresh costs one request per device)
+DEFAULT_FAST_POLL_INTERVAL = 0
+
+# Fast tier devices fetched at once
+FAST_TIER_CONCURRENCY = 4
+
+# Seconds between safety net polls while device changes are pushed
+PUSH_POLL_INTERVAL = 1800
+
+# Polls of different entries are spread across the update interval, each
+# delayed by up to this many seconds of jitter, with at most this many
+# polls running at once
+POLL_JITTER = 10
+MAX_CONCURRENT_POLLS = 2
+
+# A device missing from /device stays available with its last known state
+# until it has been missed this many polls in a row or for this many seconds
+DEFAULT_UNAVAILABLE_MISSES = 3
+DEFAULT_UNAVAILABLE_AFTER = 1200
+
+# Seconds the last good snapshot keeps being served while polls fail
+# (0 marks entities unavailable on the first failed poll)
+DEFAULT_STALE_WINDOW = 900
+
+# Milliseconds a synchronous section may hold the event loop before the
+# loop watchdog reports it
+DEFAULT_LOOP_STALL_THRESHOLD = 50
+
+# Requests per budget period, 0 disables the request budget
+DEFAULT_REQUEST_BUDGET = 0
+DEFAULT_BUDGET_PERIOD = "day"
+
+# Seconds a command queued while the cloud is unreachable stays valid, the
+# most commands kept queued and the seconds between queued commands sent
+# once the cloud is back
+DEFAULT_COMMAND_EXPIRY = 300
+COMMAND_QUEUE_SIZE = 50
+COMMAND_FLUSH_INTERVAL = 1.0
+
+# Entity attributes
+ATTR_LAST_SNAPSHOT = "last_snapshot"
+
 # Shutter states
 STATE_OPEN = "open"
 STATE_CLOSED = "closed"
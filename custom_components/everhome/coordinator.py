@@ -1,110 +1,719 @@
 """Data update coordinator for Everhome integration."""
 
 import asyncio
+import hashlib
 import logging
-from datetime import timedelta
-from typing import Any, Optional
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Optional, cast
 
-from aiohttp.client_exceptions import ClientError
+from aiohttp.client_exceptions import ClientError, ClientResponseError
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers.update_coordinator import (
     DataUpdateCoordinator,
     UpdateFailed,
 )
+from homeassistant.util import dt as dt_util
+from homeassistant.util.json import json_loads
 
 from .api import EverhomeAuth
+from .budget import BUDGET_PERIODS, RequestBudget
+from .capture import CaptureRecorder
+from .command_queue import CommandQueue, QueuedCommand
 from .const import (
     API_BASE_URL,
+    API_DEVICE_DETAIL_URL,
     API_DEVICE_EXECUTE_URL,
     API_DEVICE_URL,
+    CONF_BUDGET_PERIOD,
+    CONF_FAST_POLL_INTERVAL,
+    CONF_LOOP_STALL_THRESHOLD,
+    CONF_LOOP_WATCHDOG,
+    CONF_PUSH,
+    CONF_REQUEST_BUDGET,
+    CONF_STALE_WINDOW,
+    CONF_UNAVAILABLE_AFTER,
+    CONF_UNAVAILABLE_MISSES,
+    DATA_ACCOUNTS,
+    DEFAULT_BUDGET_PERIOD,
+    DEFAULT_FAST_POLL_INTERVAL,
+    DEFAULT_LOOP_STALL_THRESHOLD,
+    DEFAULT_REQUEST_BUDGET,
+    DEFAULT_STALE_WINDOW,
+    DEFAULT_UNAVAILABLE_AFTER,
+    DEFAULT_UNAVAILABLE_MISSES,
     DOMAIN,
+    FAST_TIER_CONCURRENCY,
+    FAST_TIER_SUBTYPES,
+    PUSH_POLL_INTERVAL,
     SUPPORTED_SUBTYPES,
     UPDATE_INTERVAL,
 )
+from .metrics import EverhomeMetrics
+from .parser import DEVICE_FIELDS, DeviceListParser
+from .tracing import NULL_TRACER, NullTracer, Tracer, span
+from .watchdog import NULL_WATCHDOG, LoopWatchdog, NullWatchdog
 
 _LOGGER = logging.getLogger(__name__)
 
+# Bytes of the /device response read per step
+READ_CHUNK_SIZE = 16 * 1024
+
+# The first this many bytes of a /device response are parsed on the event
+# loop; the rest of a larger response is parsed in an executor, in batches
+# of this many bytes
+DECODE_EXECUTOR_THRESHOLD = 64 * 1024
+
+# Endpoint labels used for request metrics
+ENDPOINT_DEVICES = f"GET {API_DEVICE_URL}"
+ENDPOINT_DEVICE_DETAIL = f"GET {API_DEVICE_DETAIL_URL}"
+ENDPOINT_EXECUTE = f"POST {API_DEVICE_EXECUTE_URL}"
+
+
+def account_fingerprint(devices: dict[str, Any]) -> str | None:
+    """Identify an Everhome account by the set of its device ids.
+
+    The API does not expose an account id, but two config entries returning
+    the same devices are authorized for the same account. Device ids may be
+    numbers in captured or simulated responses.
+    """
+    if not devices:
+        return None
+    ids = "\n".join(sorted(map(str, devices))).encode()
+    return hashlib.sha256(ids).hexdigest()[:16]
+
+
+@dataclass(frozen=True)
+class CommandResult:
+    """Outcome of a device command; true when the cloud accepted it."""
+
+    success: bool
+    # HTTP status, 0 when no response was received
+    status: int = 0
+    # Queued to be sent once the cloud is reachable again
+    queued: bool = False
+    # Device state returned by the execute endpoint, if any
+    state: dict[str, Any] | None = None
+    # The returned state was merged and holds every state the device reports
+    complete: bool = False
+
+    def __bool__(self) -> bool:
+        """Return True if the cloud accepted the command."""
+        return self.success
+
+
+def _merge_device(current: dict[str, Any], device: dict[str, Any]) -> dict[str, Any]:
+    """Merge a possibly partial device state into the known one."""
+    update = {key: device[key] for key in DEVICE_FIELDS if key in device}
+    if isinstance(update.get("states"), dict):
+        update["states"] = {**current.get("states", {}), **update["states"]}
+    return {**current, **update}
+
+
+def _is_complete(current: dict[str, Any], device: dict[str, Any]) -> bool:
+    """Return True if a device state replaces every state polls report."""
+    states = device.get("states")
+    if not isinstance(states, dict):
+        return False
+    if not set(current.get("states", {})) <= set(states):
+        return False
+    return "position" not in current or "position" in device
+
+
+def _returned_state(body: bytes, device_id: str) -> dict[str, Any] | None:
+    """Return the device state in an execute response, if it has one.
+
+    The state may be the response itself or wrapped in a "device" member.
+    """
+    try:
+        response = json_loads(body) if body else None
+    except ValueError:
+        return None
+    if isinstance(response, dict) and isinstance(response.get("device"), dict):
+        response = response["device"]
+    if not isinstance(response, dict) or "states" not in response:
+        return None
+    if response.get("id", device_id) != device_id:
+        return None
+    return response
+
 
 class EverhomeDataUpdateCoordinator(DataUpdateCoordinator):
     """Class to manage fetching data from the API."""
 
+    # Set by DataUpdateCoordinator, and copied from the leader by followers
+    data: dict[str, Any]
+    last_update_success: bool
+    last_exception: Exception | None
+
     def __init__(
-        self, hass: HomeAssistant, auth: EverhomeAuth, entry: ConfigEntry
+        self,
+        hass: HomeAssistant,
+        auth: EverhomeAuth,
+        entry: ConfigEntry,
+        base_url: str = API_BASE_URL,
     ) -> None:
         """Initialize."""
         self.auth = auth
+        # The cloud, or a local simulator the load generator runs against
+        self.base_url = base_url
         self.hass = hass
         self.entry = entry
+        self.metrics = EverhomeMetrics()
+        self.tracer: Tracer | NullTracer = NULL_TRACER
+        self.recorder: CaptureRecorder | None = None
+        self.command_queue: CommandQueue | None = None
+        self._flush_task: asyncio.Task[None] | None = None
+        self.watchdog: LoopWatchdog | NullWatchdog = NULL_WATCHDOG
+        if entry.options.get(CONF_LOOP_WATCHDOG, False):
+            threshold = entry.options.get(
+                CONF_LOOP_STALL_THRESHOLD, DEFAULT_LOOP_STALL_THRESHOLD
+            )
+            self.watchdog = LoopWatchdog(self.metrics, threshold / 1000)
+        self._unavailable_misses: int = entry.options.get(
+            CONF_UNAVAILABLE_MISSES, DEFAULT_UNAVAILABLE_MISSES
+        )
+        self._unavailable_after: int = entry.options.get(
+            CONF_UNAVAILABLE_AFTER, DEFAULT_UNAVAILABLE_AFTER
+        )
+        self._stale_window: int = entry.options.get(
+            CONF_STALE_WINDOW, DEFAULT_STALE_WINDOW
+        )
+        self._snapshot_time: float | None = None
+        self.snapshot_timestamp: datetime | None = None
+        self.stale = False
+        self.last_seen: dict[str, float] = {}
+        self.missed_polls: dict[str, int] = {}
+        self.account: str | None = None
+        self._sharing = False
+        self.leader: EverhomeDataUpdateCoordinator | None = None
+        self.followers: list[EverhomeDataUpdateCoordinator] = []
+        self._unsub_leader: CALLBACK_TYPE | None = None
+        self.budget: RequestBudget | None = None
+        limit = entry.options.get(CONF_REQUEST_BUDGET, DEFAULT_REQUEST_BUDGET)
+        if limit:
+            period = entry.options.get(CONF_BUDGET_PERIOD, DEFAULT_BUDGET_PERIOD)
+            self.budget = RequestBudget(limit, BUDGET_PERIODS[period])
+        self._token_refreshes = 0
+        self.fast_tier_supported = True
+        self.push: bool = entry.options.get(CONF_PUSH, False)
+        # Pushed changes make the fast tier unnecessary
+        self.fast_poll_interval: int = (
+            0
+            if self.push
+            else entry.options.get(CONF_FAST_POLL_INTERVAL, DEFAULT_FAST_POLL_INTERVAL)
+        )
+        self._fast_tier_devices = 0
 
         super().__init__(
             hass,
             _LOGGER,
             name=DOMAIN,
-            update_interval=timedelta(seconds=UPDATE_INTERVAL),
+            # Polls are driven by the domain's PollScheduler
+            update_interval=None,
+        )
+
+    @property
+    def snapshot_age(self) -> float | None:
+        """Return the seconds since the last successful poll."""
+        if self._snapshot_time is None:
+            return None
+        return time.monotonic() - self._snapshot_time
+
+    @property
+    def stale_since(self) -> datetime | None:
+        """Return when the snapshot served while polls fail was taken.
+
+        Unlike the snapshot age this stays the same across failed polls,
+        so entities only write state when they go stale or recover.
+        """
+        return self.snapshot_timestamp if self.stale else None
+
+    @property
+    def poll_interval(self) -> float:
+        """Return the seconds between polls allowed by the request budget."""
+        # Pushed changes make polling a slow safety net
+        minimum = PUSH_POLL_INTERVAL if self.push else UPDATE_INTERVAL
+        if self.budget is None:
+            return minimum
+        return self.budget.poll_interval(minimum, self._fast_tier_requests())
+
+    def _fast_tier_requests(self) -> float:
+        """Return the requests fast tier refreshes plan to make per period."""
+        if (
+            self.budget is None
+            or not self.fast_poll_interval
+            or not self.fast_tier_supported
+        ):
+            return 0
+        refreshes = self.budget.period / self.fast_poll_interval
+        return refreshes * self._fast_tier_devices
+
+    def _spend(self, command: bool = False) -> None:
+        """Charge a request, and any token refresh, to the account's budget."""
+        budget = (self.leader or self).budget
+        if budget is None:
+            return
+        refreshes = self.auth.token_refreshes
+        for _ in range(refreshes - self._token_refreshes):
+            budget.spend()
+        self._token_refreshes = refreshes
+        budget.spend(command)
+        metrics = (self.leader or self).metrics
+        metrics.budget_remaining = budget.remaining
+        metrics.budget_exhausted_in = budget.exhausted_in()
+
+    async def async_request_refresh(self) -> None:
+        """Request a refresh from whichever coordinator polls the account."""
+        if self.leader is not None:
+            await self.leader.async_request_refresh()
+            return
+        await super().async_request_refresh()
+
+    @callback
+    def async_join_account(self) -> None:
+        """Share one poller with other entries authorized for this account."""
+        self._sharing = True
+        self._async_update_account()
+
+    @callback
+    def _async_update_account(self) -> None:
+        """Key this poller by its current devices, following any that matches.
+
+        Run after every poll, since an entry without devices or one whose
+        devices changed since the last poll only matches another entry later.
+        """
+        account = account_fingerprint(self.data or {})
+        if account == self.account:
+            return
+        accounts = self.hass.data.setdefault(DATA_ACCOUNTS, {})
+        if self.account is not None and accounts.get(self.account) is self:
+            del accounts[self.account]
+        self.account = account
+        for follower in self.followers:
+            follower.account = account
+        if account is None:
+            return
+        leader = accounts.setdefault(account, self)
+        if leader is self:
+            return
+        _LOGGER.info(
+            "Entry %s uses the same Everhome account as %s, sharing its poller",
+            self.entry.title,
+            leader.entry.title,
         )
+        followers, self.followers = self.followers, []
+        for follower in followers:
+            follower._async_unfollow()
+            follower._async_follow(leader)
+        self._async_follow(leader)
+
+    @callback
+    def async_leave_account(self) -> None:
+        """Stop sharing, handing polling over to a follower if needed."""
+        self._sharing = False
+        if self.leader is not None:
+            self.leader.followers.remove(self)
+            self._async_unfollow()
+            return
+        accounts = self.hass.data.get(DATA_ACCOUNTS, {})
+        if self.account is None or accounts.get(self.account) is not self:
+            return
+        if not self.followers:
+            del accounts[self.account]
+            return
+
+        successor, *others = self.followers
+        self.followers = []
+        successor._async_unfollow()
+        accounts[self.account] = successor
+        for follower in others:
+            follower._async_unfollow()
+            follower._async_follow(successor)
+
+    @callback
+    def _async_follow(self, leader: "EverhomeDataUpdateCoordinator") -> None:
+        """Mirror the leader's snapshot instead of polling."""
+        self.leader = leader
+        leader.followers.append(self)
+        self._unsub_leader = leader.async_add_listener(self._async_handle_leader_update)
+        self._async_handle_leader_update()
+
+    @callback
+    def _async_unfollow(self) -> None:
+        """Poll again, starting from the last mirrored snapshot."""
+        if self._unsub_leader is not None:
+            self._unsub_leader()
+            self._unsub_leader = None
+        self.leader = None
+
+    @callback
+    def _async_handle_leader_update(self) -> None:
+        """Mirror the leader's snapshot and notify this entry's entities."""
+        leader = cast(EverhomeDataUpdateCoordinator, self.leader)
+        self.data = leader.data
+        self.last_update_success = leader.last_update_success
+        self.last_exception = leader.last_exception
+        self.stale = leader.stale
+        self._snapshot_time = leader._snapshot_time
+        self.snapshot_timestamp = leader.snapshot_timestamp
+        self.last_seen = leader.last_seen
+        self.missed_polls = leader.missed_polls
+        self.async_update_listeners()
+        if self.last_update_success and not self.stale:
+            self._async_flush_commands()
+
+    async def _async_refresh(self, *args: Any, **kwargs: Any) -> None:
+        """Refresh data, tracing the poll and the resulting dispatch."""
+        with self.tracer.span("refresh"):
+            await super()._async_refresh(*args, **kwargs)
+        if self._sharing and self.leader is None and self.last_update_success:
+            self._async_update_account()
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Notify entities of new data."""
+        listeners = len(self._listeners)
+        with (
+            span("dispatch", listeners=listeners),
+            self.watchdog.measure("dispatch", listeners),
+        ):
+            super().async_update_listeners()
 
     async def _async_update_data(self) -> dict[str, Any]:
         """Update data via API."""
         try:
-            # Get all devices
+            devices = await self._fetch_devices()
+        except UpdateFailed as err:
+            self.metrics.poll_failures += 1
+            age = self.snapshot_age
+            if age is None or age >= self._stale_window:
+                raise
+            # Keep serving the last good snapshot so a single failed poll
+            # does not flip every entity to unavailable and back
+            _LOGGER.warning(
+                "Update failed, serving %d s old snapshot: %s", int(age), err
+            )
+            self.stale = True
+            self.metrics.stale_snapshots += 1
+            return self.data
+
+        self.stale = False
+        self._snapshot_time = time.monotonic()
+        self.snapshot_timestamp = dt_util.utcnow()
+        self._async_flush_commands()
+        with self.watchdog.measure("snapshot", len(devices)):
+            return self._retain_missing_devices(devices)
+
+    async def _fetch_devices(self) -> dict[str, Any]:
+        """Get all devices, translating transport errors."""
+        try:
             return await self._get_devices()
         except (ClientError, asyncio.TimeoutError) as err:
             raise UpdateFailed(f"Error communicating with API: {err}") from err
 
+    def _retain_missing_devices(self, devices: dict[str, Any]) -> dict[str, Any]:
+        """Keep briefly missing devices in the snapshot with their last state.
+
+        The cloud occasionally omits a device from a single /device response.
+        Such a device is only dropped (and its entities become unavailable)
+        once it has been missed for the configured number of consecutive
+        polls or the configured amount of time, whichever comes first.
+        """
+        now = time.monotonic()
+        for device_id in devices:
+            self.last_seen[device_id] = now
+            self.missed_polls.pop(device_id, None)
+
+        for device_id, device in (self.data or {}).items():
+            if device_id in devices:
+                continue
+            missed = self.missed_polls.get(device_id, 0) + 1
+            unseen_for = now - self.last_seen.get(device_id, now)
+            if (
+                missed >= self._unavailable_misses
+                or unseen_for >= self._unavailable_after
+            ):
+                _LOGGER.debug(
+                    "Device %s missing for %d polls, marking unavailable",
+                    device_id,
+                    missed,
+                )
+                self.missed_polls.pop(device_id, None)
+                self.last_seen.pop(device_id, None)
+                continue
+            self.missed_polls[device_id] = missed
+            devices[device_id] = device
+
+        return devices
+
     async def _get_devices(self) -> dict[str, Any]:
         """Get all devices from the API."""
-        access_token = await self.auth.async_get_access_token()
+        with span("token"):
+            access_token = await self.auth.async_get_access_token()
         headers = {"Authorization": f"Bearer {access_token}"}
 
-        async with self.auth.aiohttp_session.get(
-            f"{API_BASE_URL}{API_DEVICE_URL}", headers=headers
-        ) as resp:
-            if resp.status != 200:
-                _LOGGER.error("Failed to get devices: %s", await resp.text())
-                raise UpdateFailed(f"Failed to get devices: {resp.status}")
+        start = time.perf_counter()
+        status = 0
+        size = 0
+        parser = DeviceListParser(SUPPORTED_SUBTYPES, loads=json_loads)
+        supported_devices: dict[str, Any] = {}
+        # Data of a large response waiting to be parsed off the event loop
+        pending = bytearray()
+        # The full response is only kept while traffic is recorded
+        body = bytearray() if self.recorder is not None else None
+        try:
+            with span("request", endpoint=ENDPOINT_DEVICES):
+                async with self.auth.aiohttp_session.get(
+                    f"{self.base_url}{API_DEVICE_URL}", headers=headers
+                ) as resp:
+                    status = resp.status
+                    if resp.status != 200:
+                        _LOGGER.error("Failed to get devices: %s", await resp.text())
+                        raise UpdateFailed(f"Failed to get devices: {resp.status}")
+
+                    # Parse while reading so unsupported devices are dropped
+                    # before the rest of the list arrives
+                    with span("read"):
+                        async for chunk in resp.content.iter_chunked(READ_CHUNK_SIZE):
+                            size += len(chunk)
+                            if body is not None:
+                                body += chunk
+                            if size <= DECODE_EXECUTOR_THRESHOLD:
+                                with self.watchdog.measure("parse", len(chunk)):
+                                    devices = parser.feed(chunk)
+                            else:
+                                # aiohttp does not yield between chunks it
+                                # has buffered, so parse larger accounts in
+                                # an executor to keep the event loop free
+                                pending += chunk
+                                if len(pending) < DECODE_EXECUTOR_THRESHOLD:
+                                    continue
+                                devices = await self._parse_in_executor(parser, pending)
+                            for device in devices:
+                                supported_devices[device["id"]] = device
+                        if pending:
+                            for device in await self._parse_in_executor(
+                                parser, pending
+                            ):
+                                supported_devices[device["id"]] = device
+                        parser.close()
+        except ValueError as err:
+            raise UpdateFailed(f"Invalid device list: {err}") from err
+        finally:
+            self._spend()
+            self.metrics.record_call(
+                ENDPOINT_DEVICES, status, time.perf_counter() - start, size
+            )
+            if self.recorder is not None and status:
+                self.recorder.record_devices(
+                    status, bytes(body) if body is not None and status == 200 else None
+                )
+
+        self.metrics.parse_buffer_peak = parser.peak_buffer
+        self.metrics.record_poll(
+            time.perf_counter() - start,
+            size,
+            parser.decoded,
+            len(supported_devices),
+        )
+        return supported_devices
+
+    async def _parse_in_executor(
+        self, parser: DeviceListParser, pending: bytearray
+    ) -> list[dict[str, Any]]:
+        """Feed buffered response data to the parser in an executor."""
+        data = bytes(pending)
+        pending.clear()
+        with span("parse", bytes=len(data), executor=True):
+            devices: list[dict[str, Any]] = await self.hass.async_add_executor_job(
+                parser.feed, data
+            )
+        self.metrics.executor_decodes += 1
+        return devices
+
+    @callback
+    def async_apply_push(self, devices: list[dict[str, Any]]) -> int:
+        """Merge pushed device changes into the snapshot.
+
+        Pushed states may be partial, so they are merged into the known
+        states. Return the number of devices updated.
+        """
+        if not self.data:
+            return 0
+        data = dict(self.data)
+        applied = 0
+        for device in devices:
+            device_id = device.get("id")
+            if device_id not in data:
+                continue
+            data[device_id] = _merge_device(data[device_id], device)
+            applied += 1
+
+        self.metrics.push_events += 1
+        if applied:
+            self.data = data
+            self.async_update_listeners()
+        return applied
+
+    async def async_refresh_fast_tier(self, _now: datetime | None = None) -> None:
+        """Refresh fast tier devices between full polls.
 
-            devices = await resp.json()
+        Each device is fetched on its own, so safety sensors stay current
+        without downloading the whole account.
+        """
+        if not self.fast_tier_supported or self.leader is not None or not self.data:
+            return
+        device_ids = [
+            device_id
+            for device_id, device in self.data.items()
+            if device.get("subtype") in FAST_TIER_SUBTYPES
+        ]
+        self._fast_tier_devices = len(device_ids)
+        if not device_ids:
+            return
+        if self.budget is not None and not self.budget.allows(len(device_ids)):
+            # Leave the rest of the budget to polls and commands
+            self.metrics.fast_refreshes_skipped += 1
+            return
 
-            # Filter for supported device subtypes across all platforms
-            supported_devices = {}
-            for device in devices:
-                if device.get("subtype") in SUPPORTED_SUBTYPES:
-                    supported_devices[device["id"]] = device
+        semaphore = asyncio.Semaphore(FAST_TIER_CONCURRENCY)
+
+        async def get_device(device_id: str) -> dict[str, Any] | None:
+            async with semaphore:
+                return await self._get_device(device_id)
+
+        with self.tracer.span("fast_refresh", devices=len(device_ids)):
+            results = await asyncio.gather(*map(get_device, device_ids))
+        self.metrics.fast_refreshes += 1
+
+        data = dict(self.data)
+        changed = False
+        for device_id, device in zip(device_ids, results):
+            if device is not None and device_id in data:
+                data[device_id] = {**data[device_id], **device}
+                changed = True
+        if changed:
+            self.data = data
+            self.async_update_listeners()
+
+    async def _get_device(self, device_id: str) -> dict[str, Any] | None:
+        """Get a single device, or None if it could not be fetched."""
+        url = f"{self.base_url}{API_DEVICE_DETAIL_URL.format(device_id=device_id)}"
+        start = time.perf_counter()
+        status = 0
+        body = b""
+        try:
+            with span("token"):
+                access_token = await self.auth.async_get_access_token()
+            headers = {"Authorization": f"Bearer {access_token}"}
+            with span("request", endpoint=ENDPOINT_DEVICE_DETAIL):
+                async with self.auth.aiohttp_session.get(url, headers=headers) as resp:
+                    status = resp.status
+                    if resp.status in (404, 405, 501):
+                        # Fall back to the regular polls for every device
+                        _LOGGER.info(
+                            "Per-device fetches are not available (%s), "
+                            "refreshing safety sensors with regular polls",
+                            resp.status,
+                        )
+                        self.fast_tier_supported = False
+                        return None
+                    if resp.status != 200:
+                        _LOGGER.debug(
+                            "Failed to refresh device %s: %s", device_id, resp.status
+                        )
+                        return None
+                    body = await resp.read()
+            device = json_loads(body)
+        except (ClientError, asyncio.TimeoutError) as err:
+            _LOGGER.debug("Error refreshing device %s: %s", device_id, err)
+            return None
+        except ValueError as err:
+            _LOGGER.debug("Invalid response refreshing device %s: %s", device_id, err)
+            return None
+        finally:
+            self._spend()
+            self.metrics.record_call(
+                ENDPOINT_DEVICE_DETAIL, status, time.perf_counter() - start, len(body)
+            )
 
-            return supported_devices
+        if not isinstance(device, dict):
+            return None
+        return {key: device[key] for key in DEVICE_FIELDS if key in device}
 
     async def execute_device_action(
         self,
         device_id: str,
         action: str,
         params: Optional[dict[str, Any]] = None,
-    ) -> bool:
-        """Execute an action on a device."""
-        access_token = await self.auth.async_get_access_token()
+    ) -> CommandResult:
+        """Execute an action on a device.
+
+        A device state returned by the cloud is merged into the snapshot
+        right away. With the command queue enabled, a command that cannot
+        reach the cloud, or that would overtake commands already queued,
+        is queued and sent once the cloud is back.
+        """
+        if self.command_queue is not None and len(self.command_queue):
+            self._async_queue_command(device_id, action, params)
+            # The cloud may already be back without a poll having noticed
+            self._async_flush_commands()
+            return CommandResult(False, queued=True)
+
+        try:
+            result = await self._post_command(device_id, action, params)
+        except (ClientError, asyncio.TimeoutError) as err:
+            # The token refresh failed; queue only if the cloud is down
+            status = err.status if isinstance(err, ClientResponseError) else 0
+            if self.command_queue is None or not _unreachable(status):
+                raise
+            _LOGGER.debug("Cannot get a token, queueing %s: %s", action, err)
+            self._async_queue_command(device_id, action, params)
+            return CommandResult(False, status, queued=True)
+        if self.command_queue is not None and _unreachable(result.status):
+            self._async_queue_command(device_id, action, params)
+            return CommandResult(False, result.status, queued=True)
+        if result.state is None:
+            return result
+        return cast(CommandResult, self._async_apply_command_state(device_id, result))
+
+    async def _post_command(
+        self, device_id: str, action: str, params: Optional[dict[str, Any]]
+    ) -> CommandResult:
+        """Send a command and return its outcome with any returned state."""
+        with span("token"):
+            access_token = await self.auth.async_get_access_token()
         headers = {
             "Authorization": f"Bearer {access_token}",
             "Content-Type": "application/json",
         }
 
-        url = f"{API_BASE_URL}{API_DEVICE_EXECUTE_URL.format(device_id=device_id)}"
+        url = f"{self.base_url}{API_DEVICE_EXECUTE_URL.format(device_id=device_id)}"
         data = {"action": action}
         if params:
             data.update(params)
 
+        start = time.perf_counter()
+        status = 0
+        body = b""
         try:
-            async with self.auth.aiohttp_session.post(
-                url, headers=headers, json=data
-            ) as resp:
-                if resp.status >= 400:
-                    _LOGGER.error(
-                        "Failed to execute action %s on device %s: %s",
-                        action,
-                        device_id,
-                        await resp.text(),
-                    )
-                    return False
-                return True
+            with span("request", endpoint=ENDPOINT_EXECUTE, action=action):
+                async with self.auth.aiohttp_session.post(
+                    url, headers=headers, json=data
+                ) as resp:
+                    status = resp.status
+                    if resp.status >= 400:
+                        _LOGGER.error(
+                            "Failed to execute action %s on device %s: %s",
+                            action,
+                            device_id,
+                            await resp.text(),
+                        )
+                        return CommandResult(False, status)
+                    body = await resp.read()
         except (ClientError, asyncio.TimeoutError) as err:
             _LOGGER.error(
                 "Error executing action %s on device %s: %s",
@@ -112,4 +721,92 @@ class EverhomeDataUpdateCoordinator(DataUpdateCoordinator):
                 device_id,
                 err,
             )
-            return False
+            return CommandResult(False)
+        finally:
+            duration = time.perf_counter() - start
+            self.metrics.record_command(duration, 0 < status < 400, action)
+            self.metrics.record_call(ENDPOINT_EXECUTE, status, duration, len(body))
+            self._spend(command=True)
+            if self.recorder is not None:
+                self.recorder.record_command(device_id, action, params, status)
+
+        return CommandResult(True, status, state=_returned_state(body, device_id))
+
+    @callback
+    def _async_apply_command_state(
+        self, device_id: str, result: CommandResult
+    ) -> CommandResult:
+        """Merge the state returned for a command into the snapshot."""
+        # Followers mirror the snapshot of the coordinator polling for them
+        owner = self.leader or self
+        current = (owner.data or {}).get(device_id)
+        if current is None or result.state is None:
+            return result
+        complete = _is_complete(current, result.state)
+        owner.data = {**owner.data, device_id: _merge_device(current, result.state)}
+        owner.metrics.command_states_applied += 1
+        owner.async_update_listeners()
+        return CommandResult(True, result.status, state=result.state, complete=complete)
+
+    @callback
+    def _async_queue_command(
+        self, device_id: str, action: str, params: Optional[dict[str, Any]]
+    ) -> None:
+        """Park a command until the cloud is reachable again."""
+        queue = cast(CommandQueue, self.command_queue)
+        replaced, dropped = queue.async_add(device_id, action, params)
+        _LOGGER.info(
+            "Cloud unreachable, queued action %s on device %s", action, device_id
+        )
+        self.metrics.commands_queued += 1
+        self.metrics.commands_superseded += replaced
+        self.metrics.commands_dropped += dropped
+        self.metrics.command_queue_size = len(queue)
+
+    @callback
+    def _async_flush_commands(self) -> None:
+        """Start sending queued commands unless already doing so."""
+        if not self.command_queue or (
+            self._flush_task is not None and not self._flush_task.done()
+        ):
+            return
+        self._flush_task = self.entry.async_create_background_task(
+            self.hass,
+            self._async_flush_command_queue(),
+            f"everhome flush commands {self.entry.title}",
+        )
+
+    async def _async_flush_command_queue(self) -> None:
+        """Send the queued commands at a controlled rate."""
+        queue = cast(CommandQueue, self.command_queue)
+        _LOGGER.info("Sending %d queued commands", len(queue))
+        result = await queue.async_flush(self._async_send_queued)
+        self.metrics.commands_expired += result.expired
+        self.metrics.command_queue_size = len(queue)
+        if result.remaining:
+            _LOGGER.info(
+                "Cloud unreachable again, %d commands stay queued", result.remaining
+            )
+        if result.sent:
+            await self.async_request_refresh()
+
+    async def _async_send_queued(self, command: QueuedCommand) -> bool | None:
+        """Send a queued command; None means the cloud is unreachable."""
+        try:
+            result = await self._post_command(
+                command.device_id, command.action, command.params
+            )
+        except (ClientError, asyncio.TimeoutError) as err:
+            _LOGGER.debug("Cannot get a token to send queued commands: %s", err)
+            return None
+        if _unreachable(result.status):
+            return None
+        self.metrics.commands_flushed += 1
+        if result.state is not None:
+            self._async_apply_command_state(command.device_id, result)
+        return result.success
+
+
+def _unreachable(status: int) -> bool:
+    """Return True if a response means the cloud could not take commands."""
+    return status == 0 or status == 429 or status >= 500
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 import logging
-from typing import Any, Optional, cast
+from typing import Any, Optional
 
 from homeassistant.components.cover import (
     ATTR_POSITION,
@@ -15,7 +15,6 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import (
     ACTION_CLOSE,
@@ -26,6 +25,7 @@ from .const import (
     STATE_OPENING,
 )
 from .coordinator import EverhomeDataUpdateCoordinator
+from .entity import EverhomeEntity
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -39,18 +39,17 @@ async def async_setup_entry(
     coordinator = hass.data[DOMAIN][entry.entry_id]
 
     # Add covers from the coordinator data
-    covers = []
-    for device_id, device_data in coordinator.data.items():
-        covers.append(EverhomeCover(coordinator, device_id, device_data))
+    with coordinator.watchdog.measure("entities", len(coordinator.data)):
+        covers = []
+        for device_id, device_data in coordinator.data.items():
+            covers.append(EverhomeCover(coordinator, device_id, device_data))
 
-    async_add_entities(covers)
+        async_add_entities(covers)
 
 
-class EverhomeCover(CoordinatorEntity, CoverEntity):
+class EverhomeCover(EverhomeEntity, CoverEntity):
     """Representation of an Everhome cover."""
 
-    coordinator: EverhomeDataUpdateCoordinator
-
     def __init__(
         self,
         coordinator: EverhomeDataUpdateCoordinator,
@@ -58,8 +57,7 @@ class EverhomeCover(CoordinatorEntity, CoverEntity):
         device_data: dict[str, Any],
     ) -> None:
         """Initialize the cover."""
-        super().__init__(coordinator)
-        self._device_id = device_id
+        super().__init__(coordinator, device_id)
         self._attr_name = device_data.get("name", f"Cover {device_id}")
         # Include the entry_id in the unique_id to support multiple accounts
         entry_id = coordinator.entry.entry_id
@@ -102,16 +100,6 @@ class EverhomeCover(CoordinatorEntity, CoverEntity):
         else:
             self._attr_icon = "mdi:window-shutter"
 
-    @property
-    def device_data(self) -> dict[str, Any]:
-        """Return the device data."""
-        return cast(dict[str, Any], self.coordinator.data.get(self._device_id, {}))
-
-    @property
-    def available(self) -> bool:
-        """Return True if entity is available."""
-        return self._device_id in self.coordinator.data
-
     @property
     def assumed_state(self) -> bool:
         """Return True to keep all buttons available regardless of state."""
@@ -192,20 +180,27 @@ class EverhomeCover(CoordinatorEntity, CoverEntity):
         # This will hide the position slider in HA UI
         return None
 
+    def _state_key(self) -> tuple[Any, ...]:
+        """Return the derived cover state."""
+        return (
+            *super()._state_key(),
+            self.is_closed,
+            self.is_opening,
+            self.is_closing,
+            self.current_cover_position,
+        )
+
     async def async_open_cover(self, **kwargs: Any) -> None:
         """Open the cover."""
-        await self.coordinator.execute_device_action(self._device_id, ACTION_OPEN)
-        await self.coordinator.async_request_refresh()
+        await self._async_execute(ACTION_OPEN)
 
     async def async_close_cover(self, **kwargs: Any) -> None:
         """Close the cover."""
-        await self.coordinator.execute_device_action(self._device_id, ACTION_CLOSE)
-        await self.coordinator.async_request_refresh()
+        await self._async_execute(ACTION_CLOSE)
 
     async def async_stop_cover(self, **kwargs: Any) -> None:
         """Stop the cover."""
-        await self.coordinator.execute_device_action(self._device_id, ACTION_STOP)
-        await self.coordinator.async_request_refresh()
+        await self._async_execute(ACTION_STOP)
 
     async def async_set_cover_position(self, **kwargs: Any) -> None:
         """Move the cover to a specific position."""
@@ -213,13 +208,10 @@ class EverhomeCover(CoordinatorEntity, CoverEntity):
             position = kwargs[ATTR_POSITION]
             # If API supports direct position setting
             if "set_position" in self.device_data.get("capabilities", []):
-                await self.coordinator.execute_device_action(
-                    self._device_id, "set_position", {"position": position}
-                )
-                await self.coordinator.async_request_refresh()
+                await self._async_execute("set_position", {"position": position})
             else:
                 # Fallback to open/close based on position.
-                # These methods already call async_request_refresh internally.
+                # These methods already refresh the coordinator.
                 if position > 50:
                     await self.async_open_cover()
                 else:
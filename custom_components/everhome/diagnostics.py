@@ -0,0 +1,106 @@
+"""Diagnostics support for Everhome."""
+
+from __future__ import annotations
+
+import time
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_WEBHOOK_ID
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.device_registry import DeviceEntry
+
+from .const import (
+    CONF_ACCESS_TOKEN,
+    CONF_CLIENT_ID,
+    CONF_CLIENT_SECRET,
+    CONF_PUSH_URL,
+    CONF_REFRESH_TOKEN,
+    DOMAIN,
+    UPDATE_INTERVAL,
+)
+from .coordinator import EverhomeDataUpdateCoordinator
+
+TO_REDACT = {
+    CONF_ACCESS_TOKEN,
+    CONF_CLIENT_ID,
+    CONF_CLIENT_SECRET,
+    CONF_PUSH_URL,
+    CONF_REFRESH_TOKEN,
+    CONF_WEBHOOK_ID,
+    "name",
+    "room",
+}
+
+
+def _scheduling(coordinator: EverhomeDataUpdateCoordinator) -> dict[str, Any]:
+    """Return the coordinator's scheduling state."""
+    budget = coordinator.budget
+    return {
+        "update_interval": UPDATE_INTERVAL,
+        "poll_interval": coordinator.metrics.poll_interval,
+        "push": coordinator.push,
+        "budget": (
+            None
+            if budget is None
+            else {
+                "limit": budget.limit,
+                "period": budget.period,
+                "reserve": budget.reserve,
+                "spent": budget.spent,
+                "remaining": budget.remaining,
+                "exhausted_in": budget.exhausted_in(),
+            }
+        ),
+        "poll_phase": coordinator.metrics.poll_phase,
+        "last_poll_spacing": coordinator.metrics.last_poll_spacing,
+        "last_update_success": coordinator.last_update_success,
+        "last_exception": (
+            repr(coordinator.last_exception) if coordinator.last_exception else None
+        ),
+        "snapshot_age": coordinator.snapshot_age,
+        "stale": coordinator.stale,
+        "missed_polls": dict(coordinator.missed_polls),
+        "account": coordinator.account,
+        "leader": coordinator.leader.entry.entry_id if coordinator.leader else None,
+        "followers": [follower.entry.entry_id for follower in coordinator.followers],
+    }
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: EverhomeDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+
+    return {
+        "entry": {
+            "title": entry.title,
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "scheduling": _scheduling(coordinator),
+        "metrics": coordinator.metrics.as_dict(),
+        "devices": async_redact_data(coordinator.data or {}, TO_REDACT),
+    }
+
+
+async def async_get_device_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry, device: DeviceEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a device."""
+    coordinator: EverhomeDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    device_id = next(
+        identifier for domain, identifier in device.identifiers if domain == DOMAIN
+    )
+    last_seen = coordinator.last_seen.get(device_id)
+
+    return {
+        "device_id": device_id,
+        "data": async_redact_data(coordinator.data.get(device_id, {}), TO_REDACT),
+        "seconds_since_seen": (
+            None if last_seen is None else time.monotonic() - last_seen
+        ),
+        "missed_polls": coordinator.missed_polls.get(device_id, 0),
+    }
@@ -0,0 +1,83 @@
+"""Base entity for the Everhome integration."""
+
+from __future__ import annotations
+
+from typing import Any, cast
+
+from homeassistant.core import callback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import ATTR_LAST_SNAPSHOT
+from .coordinator import EverhomeDataUpdateCoordinator
+from .tracing import span
+
+
+class EverhomeEntity(CoordinatorEntity):
+    """Common behaviour for entities backed by an Everhome device."""
+
+    coordinator: EverhomeDataUpdateCoordinator
+
+    def __init__(
+        self, coordinator: EverhomeDataUpdateCoordinator, device_id: str
+    ) -> None:
+        """Initialize the entity."""
+        super().__init__(coordinator)
+        self._device_id = device_id
+        self._last_state_key: tuple[Any, ...] | None = None
+
+    @property
+    def device_data(self) -> dict[str, Any]:
+        """Return the device data."""
+        return cast(dict[str, Any], self.coordinator.data.get(self._device_id, {}))
+
+    @property
+    def available(self) -> bool:
+        """Return True if entity is available."""
+        return bool(
+            self.coordinator.last_update_success
+            and self._device_id in self.coordinator.data
+        )
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return when the last good snapshot was taken while serving it stale."""
+        since = self.coordinator.stale_since
+        if since is None:
+            return None
+        return {ATTR_LAST_SNAPSHOT: since}
+
+    def _state_key(self) -> tuple[Any, ...]:
+        """Return the derived state that ends up in the state machine.
+
+        Platforms extend this with their own state properties.
+        """
+        return (self.available, self.extra_state_attributes)
+
+    async def async_added_to_hass(self) -> None:
+        """Remember the state written when the entity is added."""
+        await super().async_added_to_hass()
+        self._last_state_key = self._state_key()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only when the derived state actually changed."""
+        state_key = self._state_key()
+        if state_key == self._last_state_key:
+            self.coordinator.metrics.state_writes_skipped += 1
+            return
+        self._last_state_key = state_key
+        self.coordinator.metrics.state_writes += 1
+        with span("state_write", entity_id=self.entity_id):
+            self.async_write_ha_state()
+
+    async def _async_execute(self, action: str, *params: dict[str, Any]) -> None:
+        """Execute an action on the device and refresh the coordinator if needed."""
+        with self.coordinator.tracer.span(
+            "command", device_id=self._device_id, action=action
+        ):
+            result = await self.coordinator.execute_device_action(
+                self._device_id, action, *params
+            )
+            # A complete returned state makes the follow-up poll redundant
+            if not result.complete:
+                await self.coordinator.async_request_refresh()
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 import logging
-from typing import Any, cast
+from typing import Any
 
 from homeassistant.components.light import (
     ATTR_BRIGHTNESS,
@@ -14,10 +14,10 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN, LIGHT_SUBTYPES
 from .coordinator import EverhomeDataUpdateCoordinator
+from .entity import EverhomeEntity
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -45,18 +45,17 @@ async def async_setup_entry(
     """Set up Everhome lights based on a config entry."""
     coordinator: EverhomeDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
 
-    async_add_entities(
-        EverhomeLight(coordinator, device_id, device_data)
-        for device_id, device_data in coordinator.data.items()
-        if device_data.get("subtype") in LIGHT_SUBTYPES
-    )
+    with coordinator.watchdog.measure("entities", len(coordinator.data)):
+        async_add_entities(
+            EverhomeLight(coordinator, device_id, device_data)
+            for device_id, device_data in coordinator.data.items()
+            if device_data.get("subtype") in LIGHT_SUBTYPES
+        )
 
 
-class EverhomeLight(CoordinatorEntity, LightEntity):
+class EverhomeLight(EverhomeEntity, LightEntity):
     """Representation of an Everhome light."""
 
-    coordinator: EverhomeDataUpdateCoordinator
-
     def __init__(
         self,
         coordinator: EverhomeDataUpdateCoordinator,
@@ -64,8 +63,7 @@ class EverhomeLight(CoordinatorEntity, LightEntity):
         device_data: dict[str, Any],
     ) -> None:
         """Initialize the light."""
-        super().__init__(coordinator)
-        self._device_id = device_id
+        super().__init__(coordinator, device_id)
         self._attr_name = device_data.get("name", f"Light {device_id}")
         entry_id = coordinator.entry.entry_id
         self._attr_unique_id = f"{DOMAIN}_{entry_id}_{device_id}"
@@ -86,16 +84,6 @@ class EverhomeLight(CoordinatorEntity, LightEntity):
             sw_version=device_data.get("firmware_version", "Unknown"),
         )
 
-    @property
-    def device_data(self) -> dict[str, Any]:
-        """Return the device data."""
-        return cast(dict[str, Any], self.coordinator.data.get(self._device_id, {}))
-
-    @property
-    def available(self) -> bool:
-        """Return True if entity is available."""
-        return self._device_id in self.coordinator.data
-
     @property
     def is_on(self) -> bool | None:
         """Return True if the light is on."""
@@ -114,6 +102,10 @@ class EverhomeLight(CoordinatorEntity, LightEntity):
             return None
         return _api_to_ha_brightness(int(api_val))
 
+    def _state_key(self) -> tuple[Any, ...]:
+        """Return the derived light state."""
+        return (*super()._state_key(), self.is_on, self.brightness)
+
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the light on, optionally setting brightness."""
         ha_brightness = kwargs.get(ATTR_BRIGHTNESS)
@@ -122,14 +114,10 @@ class EverhomeLight(CoordinatorEntity, LightEntity):
             and ColorMode.BRIGHTNESS in self._attr_supported_color_modes
         ):
             api_brightness = _ha_to_api_brightness(int(ha_brightness))
-            await self.coordinator.execute_device_action(
-                self._device_id, "set_brightness", {"brightness": api_brightness}
-            )
+            await self._async_execute("set_brightness", {"brightness": api_brightness})
         else:
-            await self.coordinator.execute_device_action(self._device_id, "on")
-        await self.coordinator.async_request_refresh()
+            await self._async_execute("on")
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the light off."""
-        await self.coordinator.execute_device_action(self._device_id, "off")
-        await self.coordinator.async_request_refresh()
+        await self._async_execute("off")
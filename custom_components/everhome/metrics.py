@@ -0,0 +1,278 @@
+"""In-process counters for the Everhome integration."""
+
+from __future__ import annotations
+
+import time
+from bisect import bisect_left
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any
+
+# Number of recent samples kept for rolling percentiles
+LATENCY_WINDOW = 64
+
+# Upper bounds (seconds) of the request latency histogram buckets
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Number of HTTP calls kept in the recent call log
+RECENT_CALLS = 50
+
+
+def _percentile(samples: deque[float], pct: float) -> float | None:
+    """Return the nearest-rank percentile of the samples."""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def _window() -> deque[float]:
+    return deque(maxlen=LATENCY_WINDOW)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram."""
+
+    __slots__ = ("counts", "count", "sum")
+
+    def __init__(self) -> None:
+        """Initialize an empty histogram."""
+        # One slot per bucket plus the overflow (+Inf) bucket
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """Add a sample."""
+        self.counts[bisect_left(LATENCY_BUCKETS, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the histogram as a JSON serializable dict."""
+        bounds = [str(bound) for bound in LATENCY_BUCKETS] + ["+Inf"]
+        return {
+            "buckets": dict(zip(bounds, self.counts)),
+            "count": self.count,
+            "sum": self.sum,
+        }
+
+
+class CallLog:
+    """Ring buffer of the most recent HTTP calls.
+
+    Calls are recorded on every request, so the buffer is preallocated as
+    parallel lists that are overwritten in place instead of allocating a
+    record per call.
+    """
+
+    __slots__ = (
+        "_size",
+        "_next",
+        "_len",
+        "_at",
+        "_endpoint",
+        "_status",
+        "_duration",
+        "_bytes",
+    )
+
+    def __init__(self, size: int = RECENT_CALLS) -> None:
+        """Initialize an empty call log."""
+        self._size = size
+        self._next = 0
+        self._len = 0
+        self._at = [0.0] * size
+        self._endpoint = [""] * size
+        self._status = [0] * size
+        self._duration = [0.0] * size
+        self._bytes = [0] * size
+
+    def __len__(self) -> int:
+        """Return the number of recorded calls."""
+        return self._len
+
+    def record(self, endpoint: str, status: int, duration: float, size: int) -> None:
+        """Record a call, overwriting the oldest one when full."""
+        index = self._next
+        self._at[index] = time.time()
+        self._endpoint[index] = endpoint
+        self._status[index] = status
+        self._duration[index] = duration
+        self._bytes[index] = size
+        self._next = (index + 1) % self._size
+        if self._len < self._size:
+            self._len += 1
+
+    def as_list(self) -> list[dict[str, Any]]:
+        """Return the recorded calls, oldest first."""
+        start = (self._next - self._len) % self._size
+        calls = []
+        for offset in range(self._len):
+            index = (start + offset) % self._size
+            calls.append(
+                {
+                    "at": self._at[index],
+                    "endpoint": self._endpoint[index],
+                    "status": self._status[index],
+                    "duration": self._duration[index],
+                    "bytes": self._bytes[index],
+                }
+            )
+        return calls
+
+
+@dataclass
+class EverhomeMetrics:
+    """Cheap counters describing the work done for one config entry."""
+
+    state_writes: int = 0
+    state_writes_skipped: int = 0
+
+    polls: int = 0
+    poll_failures: int = 0
+    fast_refreshes: int = 0
+    fast_refreshes_skipped: int = 0
+    push_events: int = 0
+    poll_phase: float | None = None
+    poll_interval: float | None = None
+    last_poll_spacing: float | None = None
+    last_poll_latency: float | None = None
+    poll_latencies: deque[float] = field(default_factory=_window)
+    payload_bytes: int | None = None
+    decoded_devices: int | None = None
+    supported_devices: int | None = None
+    parse_buffer_peak: int | None = None
+    executor_decodes: int = 0
+
+    stale_snapshots: int = 0
+    throttled: int = 0
+
+    budget_remaining: int | None = None
+    budget_exhausted_in: float | None = None
+
+    commands: int = 0
+    command_errors: int = 0
+    commands_by_action: dict[tuple[str, bool], int] = field(default_factory=dict)
+    last_command_latency: float | None = None
+    command_latencies: deque[float] = field(default_factory=_window)
+    command_states_applied: int = 0
+
+    commands_queued: int = 0
+    commands_flushed: int = 0
+    commands_expired: int = 0
+    commands_superseded: int = 0
+    commands_dropped: int = 0
+    command_queue_size: int | None = None
+
+    histograms: dict[str, LatencyHistogram] = field(default_factory=dict)
+    calls: CallLog = field(default_factory=CallLog)
+
+    loop_stalls: dict[str, int] = field(default_factory=dict)
+    loop_block_max: dict[str, float] = field(default_factory=dict)
+
+    def record_call(
+        self, endpoint: str, status: int, duration: float, size: int
+    ) -> None:
+        """Record an HTTP call; status 0 means no response was received."""
+        histogram = self.histograms.get(endpoint)
+        if histogram is None:
+            histogram = self.histograms[endpoint] = LatencyHistogram()
+        histogram.observe(duration)
+        self.calls.record(endpoint, status, duration, size)
+        if status == 429:
+            self.throttled += 1
+
+    def record_poll(
+        self, latency: float, payload_bytes: int, decoded: int, supported: int
+    ) -> None:
+        """Record a successful GET /device."""
+        self.polls += 1
+        self.last_poll_latency = latency
+        self.poll_latencies.append(latency)
+        self.payload_bytes = payload_bytes
+        self.decoded_devices = decoded
+        self.supported_devices = supported
+
+    def record_command(self, latency: float, success: bool, action: str) -> None:
+        """Record a device command."""
+        self.commands += 1
+        key = (action, success)
+        self.commands_by_action[key] = self.commands_by_action.get(key, 0) + 1
+        if not success:
+            self.command_errors += 1
+        self.last_command_latency = latency
+        self.command_latencies.append(latency)
+
+    def record_loop_block(self, section: str, elapsed: float, stalled: bool) -> None:
+        """Record the time a synchronous section held the event loop."""
+        if elapsed > self.loop_block_max.get(section, 0.0):
+            self.loop_block_max[section] = elapsed
+        if stalled:
+            self.loop_stalls[section] = self.loop_stalls.get(section, 0) + 1
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics as a JSON serializable dict."""
+        return {
+            "state_writes": self.state_writes,
+            "state_writes_skipped": self.state_writes_skipped,
+            "polls": self.polls,
+            "poll_failures": self.poll_failures,
+            "fast_refreshes": self.fast_refreshes,
+            "fast_refreshes_skipped": self.fast_refreshes_skipped,
+            "push_events": self.push_events,
+            "poll_phase": self.poll_phase,
+            "poll_interval": self.poll_interval,
+            "last_poll_spacing": self.last_poll_spacing,
+            "stale_snapshots": self.stale_snapshots,
+            "throttled": self.throttled,
+            "budget_remaining": self.budget_remaining,
+            "budget_exhausted_in": self.budget_exhausted_in,
+            "last_poll_latency": self.last_poll_latency,
+            "poll_latency_p50": self.poll_latency_p50,
+            "poll_latency_p95": self.poll_latency_p95,
+            "payload_bytes": self.payload_bytes,
+            "decoded_devices": self.decoded_devices,
+            "supported_devices": self.supported_devices,
+            "parse_buffer_peak": self.parse_buffer_peak,
+            "executor_decodes": self.executor_decodes,
+            "commands": self.commands,
+            "command_errors": self.command_errors,
+            "commands_by_action": {
+                f"{action}:{'success' if success else 'error'}": count
+                for (action, success), count in self.commands_by_action.items()
+            },
+            "last_command_latency": self.last_command_latency,
+            "command_states_applied": self.command_states_applied,
+            "commands_queued": self.commands_queued,
+            "commands_flushed": self.commands_flushed,
+            "commands_expired": self.commands_expired,
+            "commands_superseded": self.commands_superseded,
+            "commands_dropped": self.commands_dropped,
+            "command_queue_size": self.command_queue_size,
+            "histograms": {
+                endpoint: histogram.as_dict()
+                for endpoint, histogram in self.histograms.items()
+            },
+            "recent_calls": self.calls.as_list(),
+            "loop_stalls": dict(self.loop_stalls),
+            "loop_block_max": dict(self.loop_block_max),
+        }
+
+    @property
+    def poll_latency_p50(self) -> float | None:
+        """Return the rolling median poll latency."""
+        return _percentile(self.poll_latencies, 50)
+
+    @property
+    def poll_latency_p95(self) -> float | None:
+        """Return the rolling 95th percentile poll latency."""
+        return _percentile(self.poll_latencies, 95)
+
+    @property
+    def command_error_rate(self) -> float | None:
+        """Return the share of failed commands in percent."""
+        if not self.commands:
+            return None
+        return 100 * self.command_errors / self.commands
@@ -0,0 +1,185 @@
+"""Incremental parser for the Everhome /device list.
+
+The /device response is a JSON array with one object per device. Large
+accounts contain many devices the integration does not support (gateways,
+meters, cameras, ...), so instead of decoding the whole array the parser
+scans the byte stream for object boundaries and the top level ``subtype``
+key of each device. A device with an unsupported subtype is discarded as
+soon as its subtype is seen, without ever being decoded, and only the
+fields the platforms use are kept for supported devices. Peak memory is
+bounded by the chunk size plus the largest single device object,
+independent of the number of devices on the account.
+
+The module has no Home Assistant dependencies.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from collections.abc import Callable, Collection, Iterable
+from typing import Any
+
+# Device fields used by the platforms; everything else is dropped
+DEVICE_FIELDS = (
+    "id",
+    "name",
+    "subtype",
+    "model",
+    "firmware_version",
+    "states",
+    "position",
+    "capabilities",
+)
+
+# A complete string, a bracket, or the opening quote of a string that
+# continues in the next chunk
+_TOKEN = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"|[{}\[\]]|"', re.DOTALL)
+
+# First non-whitespace byte after a string, a colon if the string is a key
+_NEXT_TOKEN = re.compile(rb"\s*(\S)")
+
+_SUBTYPE_KEY = b"subtype"
+
+# Depth of the elements of the top level array and of their keys
+_ARRAY_DEPTH = 1
+_DEVICE_DEPTH = 2
+
+
+class DeviceListParser:
+    """Feed /device response chunks, collect the supported devices."""
+
+    def __init__(
+        self,
+        subtypes: Collection[str],
+        fields: Iterable[str] = DEVICE_FIELDS,
+        loads: Callable[[bytes], Any] = json.loads,
+    ) -> None:
+        """Initialize the parser for the given supported subtypes.
+
+        loads decodes the JSON of a single supported device.
+        """
+        self._subtypes = {subtype.encode() for subtype in subtypes}
+        self._fields = tuple(fields)
+        self._loads = loads
+        self._buffer = bytearray()
+        self._pos = 0
+        self._depth = 0
+        self._done = False
+        # Start offset of the device object being kept, None when skipping
+        self._start: int | None = None
+        # End offset of a depth 2 "subtype" key whose value comes next
+        self._subtype_key_end: int | None = None
+        self.decoded = 0
+        self.peak_buffer = 0
+
+    def feed(self, chunk: bytes) -> list[dict[str, Any]]:
+        """Parse a chunk and return the supported devices it completed."""
+        buffer = self._buffer
+        buffer += chunk
+        self.peak_buffer = max(self.peak_buffer, len(buffer))
+        devices: list[dict[str, Any]] = []
+
+        while not self._done:
+            match = _TOKEN.search(buffer, self._pos)
+            if match is None:
+                self._pos = len(buffer)
+                break
+            start, end = match.span()
+            char = buffer[start]
+
+            if char == 0x22:  # '"'
+                if end - start == 1:
+                    # The string continues in the next chunk
+                    self._pos = start
+                    break
+                if (
+                    self._depth == _DEVICE_DEPTH
+                    and self._start is not None
+                    and not self._check_subtype(buffer, start, end)
+                ):
+                    # Cannot tell a "subtype" key from a value yet
+                    self._pos = start
+                    break
+                self._pos = end
+                continue
+
+            self._pos = end
+            if char in b"{[":
+                self._open(char, start)
+            else:
+                device = self._close(buffer, start)
+                if device is not None:
+                    devices.append(device)
+
+        self._compact()
+        return devices
+
+    def close(self) -> None:
+        """Verify the whole array was received."""
+        if not self._done:
+            raise ValueError("Truncated device list")
+
+    def _check_subtype(self, buffer: bytearray, start: int, end: int) -> bool:
+        """Track the device's top level subtype key and value.
+
+        Return False when more data is needed to classify the string.
+        """
+        key_end = self._subtype_key_end
+        if key_end is not None:
+            self._subtype_key_end = None
+            value = bytes(buffer[start + 1 : end - 1])
+            if buffer[key_end:start].strip() != b":":
+                # The subtype value was not a string
+                self._start = None
+            elif value not in self._subtypes and b"\\" not in value:
+                self._start = None
+            return True
+        if buffer[start + 1 : end - 1] == _SUBTYPE_KEY:
+            follow = _NEXT_TOKEN.match(buffer, end)
+            if follow is None:
+                return False
+            if follow.group(1) == b":":
+                self._subtype_key_end = end
+        return True
+
+    def _open(self, char: int, start: int) -> None:
+        if self._depth == 0 and char != 0x5B:  # '['
+            raise ValueError("Device list is not a JSON array")
+        self._depth += 1
+        if self._depth == _DEVICE_DEPTH:
+            self._start = start
+            self._subtype_key_end = None
+
+    def _close(self, buffer: bytearray, end: int) -> dict[str, Any] | None:
+        self._depth -= 1
+        if self._depth == 0:
+            self._done = True
+            return None
+        if self._depth != _ARRAY_DEPTH:
+            return None
+
+        self.decoded += 1
+        start, self._start = self._start, None
+        if start is None:
+            return None
+        device = self._loads(bytes(buffer[start : end + 1]))
+        if not isinstance(device, dict):
+            return None
+        # Devices without a top level subtype string end up here as well
+        subtype = device.get("subtype")
+        if not isinstance(subtype, str) or subtype.encode() not in self._subtypes:
+            return None
+        return {key: device[key] for key in self._fields if key in device}
+
+    def _compact(self) -> None:
+        """Drop the consumed part of the buffer."""
+        if self._start is not None:
+            cut = self._start
+            self._start = 0
+        else:
+            cut = self._pos
+        if self._subtype_key_end is not None:
+            self._subtype_key_end -= cut
+        del self._buffer[:cut]
+        self._pos -= cut
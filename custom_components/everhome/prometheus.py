@@ -0,0 +1,291 @@
+"""Prometheus exposition of the Everhome integration's internal metrics."""
+
+from __future__ import annotations
+
+import time
+from collections import Counter
+
+from aiohttp import web
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+
+from .const import CONF_METRICS_PER_DEVICE, DOMAIN
+from .coordinator import EverhomeDataUpdateCoordinator
+from .metrics import LATENCY_BUCKETS
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels: str) -> str:
+    return ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items())
+
+
+class _Families:
+    """Collect samples grouped by metric family, in first-seen order."""
+
+    def __init__(self) -> None:
+        self._families: dict[str, tuple[str, str, list[str]]] = {}
+
+    def add(
+        self, name: str, kind: str, help_text: str, labels: str, value: float
+    ) -> None:
+        family = self._families.get(name)
+        if family is None:
+            family = self._families[name] = (kind, help_text, [])
+        family[2].append(f"{name}{{{labels}}} {value}")
+
+    def add_histogram(
+        self, name: str, help_text: str, labels: str, counts: list[int], total: float
+    ) -> None:
+        family = self._families.get(name)
+        if family is None:
+            family = self._families[name] = ("histogram", help_text, [])
+        samples = family[2]
+        cumulative = 0
+        bounds = [str(bound) for bound in LATENCY_BUCKETS] + ["+Inf"]
+        for bound, count in zip(bounds, counts):
+            cumulative += count
+            samples.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        samples.append(f"{name}_sum{{{labels}}} {total}")
+        samples.append(f"{name}_count{{{labels}}} {cumulative}")
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for name, (kind, help_text, samples) in self._families.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.extend(samples)
+        lines.append("")
+        return "\n".join(lines)
+
+
+def _add_coordinator(
+    families: _Families,
+    hass: HomeAssistant,
+    coordinator: EverhomeDataUpdateCoordinator,
+) -> None:
+    """Add the series of one config entry."""
+    entry = coordinator.entry
+    metrics = coordinator.metrics
+    base = _labels(entry=entry.entry_id)
+
+    families.add(
+        "everhome_polls_total",
+        "counter",
+        "Successful GET /device polls.",
+        base,
+        metrics.polls,
+    )
+    families.add(
+        "everhome_poll_failures_total",
+        "counter",
+        "Failed GET /device polls.",
+        base,
+        metrics.poll_failures,
+    )
+    families.add(
+        "everhome_push_events_total",
+        "counter",
+        "Device change pushes received through the webhook.",
+        base,
+        metrics.push_events,
+    )
+    families.add(
+        "everhome_stale_snapshots_total",
+        "counter",
+        "Failed polls answered from the last good snapshot.",
+        base,
+        metrics.stale_snapshots,
+    )
+    for result, count in (
+        ("written", metrics.state_writes),
+        ("skipped", metrics.state_writes_skipped),
+    ):
+        families.add(
+            "everhome_state_writes_total",
+            "counter",
+            "Entity state writes after a coordinator update.",
+            f'{base},result="{result}"',
+            count,
+        )
+    for (action, success), count in metrics.commands_by_action.items():
+        families.add(
+            "everhome_commands_total",
+            "counter",
+            "Device commands by action and outcome.",
+            _labels(
+                entry=entry.entry_id,
+                action=action,
+                outcome="success" if success else "error",
+            ),
+            count,
+        )
+    if metrics.command_queue_size is not None:
+        for outcome, count in (
+            ("queued", metrics.commands_queued),
+            ("flushed", metrics.commands_flushed),
+            ("expired", metrics.commands_expired),
+            ("superseded", metrics.commands_superseded),
+            ("dropped", metrics.commands_dropped),
+        ):
+            families.add(
+                "everhome_queued_commands_total",
+                "counter",
+                "Commands queued while the cloud was unreachable, by outcome.",
+                f'{base},outcome="{outcome}"',
+                count,
+            )
+        families.add(
+            "everhome_command_queue_size",
+            "gauge",
+            "Commands waiting for the cloud to be reachable.",
+            base,
+            metrics.command_queue_size,
+        )
+    families.add(
+        "everhome_token_refreshes_total",
+        "counter",
+        "OAuth access token refreshes.",
+        base,
+        coordinator.auth.token_refreshes,
+    )
+    families.add(
+        "everhome_throttled_total",
+        "counter",
+        "Requests answered with HTTP 429.",
+        base,
+        metrics.throttled,
+    )
+    if metrics.poll_phase is not None:
+        families.add(
+            "everhome_poll_phase_seconds",
+            "gauge",
+            "Offset of the entry's polls within the update interval.",
+            base,
+            metrics.poll_phase,
+        )
+    if metrics.last_poll_spacing is not None:
+        families.add(
+            "everhome_poll_spacing_seconds",
+            "gauge",
+            "Time between the entry's last two scheduled polls.",
+            base,
+            metrics.last_poll_spacing,
+        )
+    if metrics.budget_remaining is not None:
+        families.add(
+            "everhome_budget_remaining",
+            "gauge",
+            "Requests left in the rolling request budget window.",
+            base,
+            metrics.budget_remaining,
+        )
+    if metrics.poll_interval is not None:
+        families.add(
+            "everhome_poll_interval_seconds",
+            "gauge",
+            "Scheduled seconds between polls after budget planning.",
+            base,
+            metrics.poll_interval,
+        )
+    families.add(
+        "everhome_devices",
+        "gauge",
+        "Devices in the current snapshot.",
+        base,
+        len(coordinator.data or {}),
+    )
+
+    platforms = Counter(
+        entity.domain
+        for entity in er.async_entries_for_config_entry(
+            er.async_get(hass), entry.entry_id
+        )
+    )
+    for platform, count in platforms.items():
+        families.add(
+            "everhome_entities",
+            "gauge",
+            "Registered entities by platform.",
+            _labels(entry=entry.entry_id, platform=platform),
+            count,
+        )
+
+    for endpoint, histogram in metrics.histograms.items():
+        families.add_histogram(
+            "everhome_request_duration_seconds",
+            "HTTP request duration by endpoint.",
+            _labels(entry=entry.entry_id, endpoint=endpoint),
+            histogram.counts,
+            histogram.sum,
+        )
+
+    for section, count in metrics.loop_stalls.items():
+        families.add(
+            "everhome_loop_stalls_total",
+            "counter",
+            "Synchronous sections that blocked the event loop past the threshold.",
+            _labels(entry=entry.entry_id, section=section),
+            count,
+        )
+    for section, seconds in metrics.loop_block_max.items():
+        families.add(
+            "everhome_loop_block_max_seconds",
+            "gauge",
+            "Longest time a synchronous section held the event loop.",
+            _labels(entry=entry.entry_id, section=section),
+            seconds,
+        )
+
+    if not entry.options.get(CONF_METRICS_PER_DEVICE, False):
+        return
+
+    now = time.monotonic()
+    for device_id in coordinator.data or {}:
+        labels = _labels(entry=entry.entry_id, device=device_id)
+        families.add(
+            "everhome_device_missed_polls",
+            "gauge",
+            "Consecutive polls the device was missing from /device.",
+            labels,
+            coordinator.missed_polls.get(device_id, 0),
+        )
+        families.add(
+            "everhome_device_seconds_since_seen",
+            "gauge",
+            "Seconds since the device was last reported by /device.",
+            labels,
+            round(now - coordinator.last_seen.get(device_id, now), 3),
+        )
+
+
+def render_metrics(hass: HomeAssistant) -> str:
+    """Render all Everhome metrics in Prometheus text exposition format."""
+    families = _Families()
+    for coordinator in hass.data.get(DOMAIN, {}).values():
+        _add_coordinator(families, hass, coordinator)
+    return families.render()
+
+
+class EverhomeMetricsView(HomeAssistantView):
+    """Serve the integration's metrics to an authenticated scraper."""
+
+    url = "/api/everhome/metrics"
+    name = "api:everhome:metrics"
+    requires_auth = True
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the view."""
+        self.hass = hass
+
+    async def get(self, request: web.Request) -> web.Response:
+        """Return the current metrics."""
+        return web.Response(
+            body=render_metrics(self.hass).encode(),
+            headers={"Content-Type": CONTENT_TYPE},
+        )
@@ -0,0 +1,122 @@
+"""Webhook receiver for device changes pushed by the Everhome cloud.
+
+When push mode is enabled every config entry registers a Home Assistant
+webhook. A request carries either a single device object or
+``{"devices": [...]}`` with one object per changed device. Each device is
+merged into the coordinator's snapshot and only that device's entities are
+written, while polling continues at a slow cadence as a safety net. The
+cloud only posts to a URL entered in the Everhome account, so the webhook
+URL is shown in a persistent notification whenever it is new or changes.
+"""
+
+from __future__ import annotations
+
+import logging
+from http import HTTPStatus
+from typing import Any
+
+from aiohttp import web
+from homeassistant.components import persistent_notification, webhook
+from homeassistant.components.diagnostics import REDACTED
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_WEBHOOK_ID
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.network import NoURLAvailableError
+
+from .const import CONF_PUSH_URL, DOMAIN
+from .coordinator import EverhomeDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _devices(payload: Any) -> list[dict[str, Any]] | None:
+    """Return the device objects of a push payload, None if it is invalid."""
+    if isinstance(payload, dict) and isinstance(payload.get("devices"), list):
+        payload = payload["devices"]
+    elif isinstance(payload, dict):
+        payload = [payload]
+    if not isinstance(payload, list):
+        return None
+    return [device for device in payload if isinstance(device, dict)]
+
+
+async def _async_handle_webhook(
+    hass: HomeAssistant, webhook_id: str, request: web.Request
+) -> web.Response:
+    """Apply a pushed device change."""
+    try:
+        payload = await request.json()
+    except ValueError:
+        return web.Response(status=HTTPStatus.BAD_REQUEST)
+
+    devices = _devices(payload)
+    if devices is None:
+        return web.Response(status=HTTPStatus.BAD_REQUEST)
+
+    coordinator = next(
+        (
+            coordinator
+            for coordinator in hass.data.get(DOMAIN, {}).values()
+            if coordinator.entry.data.get(CONF_WEBHOOK_ID) == webhook_id
+        ),
+        None,
+    )
+    if coordinator is None:
+        return web.Response(status=HTTPStatus.NOT_FOUND)
+
+    # Entries sharing an account mirror the entry that polls it
+    (coordinator.leader or coordinator).async_apply_push(devices)
+    return web.Response(status=HTTPStatus.OK)
+
+
+@callback
+def async_setup_push(
+    hass: HomeAssistant, entry: ConfigEntry, coordinator: EverhomeDataUpdateCoordinator
+) -> None:
+    """Register the entry's webhook."""
+    webhook_id = entry.data.get(CONF_WEBHOOK_ID)
+    if webhook_id is None:
+        webhook_id = webhook.async_generate_id()
+        hass.config_entries.async_update_entry(
+            entry, data={**entry.data, CONF_WEBHOOK_ID: webhook_id}
+        )
+
+    # The Everhome cloud posts from outside the local network
+    webhook.async_register(
+        hass,
+        DOMAIN,
+        f"Everhome {entry.title}",
+        webhook_id,
+        _async_handle_webhook,
+        local_only=False,
+    )
+    entry.async_on_unload(lambda: webhook.async_unregister(hass, webhook_id))
+
+    try:
+        url = webhook.async_generate_url(hass, webhook_id)
+    except NoURLAvailableError:
+        _LOGGER.warning(
+            "Push enabled for %s but Home Assistant has no URL the cloud can "
+            "reach, relying on polling",
+            entry.title,
+        )
+        return
+    # Anyone knowing the webhook id can post device states
+    _LOGGER.debug(
+        "Everhome push URL for %s: %s", entry.title, url.replace(webhook_id, REDACTED)
+    )
+    if entry.data.get(CONF_PUSH_URL) == url:
+        return
+    # The cloud only pushes once the URL is entered in the Everhome account,
+    # so show it whenever it is new or has changed
+    persistent_notification.async_create(
+        hass,
+        f"To receive device changes for {entry.title} without waiting for a "
+        "poll, enter this URL as the webhook of your Everhome account:\n\n"
+        f"{url}\n\nKeep it private, anyone knowing it can post device states.",
+        title="Everhome push",
+        notification_id=f"{DOMAIN}_push_{entry.entry_id}",
+    )
+    hass.config_entries.async_update_entry(
+        entry, data={**entry.data, CONF_PUSH_URL: url}
+    )
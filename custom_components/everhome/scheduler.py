@@ -0,0 +1,139 @@
+"""Domain level poll scheduling for Everhome config entries.
+
+Coordinators do not schedule their own refreshes. Instead every config
+entry is registered with one scheduler per Home Assistant instance, which
+spreads the entries' poll phases evenly across the update interval, adds a
+little jitter to each poll and caps how many polls run at the same time.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from functools import partial
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import (
+    DATA_SCHEDULER,
+    MAX_CONCURRENT_POLLS,
+    POLL_JITTER,
+    UPDATE_INTERVAL,
+)
+from .coordinator import EverhomeDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class _Slot:
+    """Scheduling state of one config entry."""
+
+    coordinator: EverhomeDataUpdateCoordinator
+    phase: float = 0.0
+    last_poll: float | None = None
+    unsub: CALLBACK_TYPE | None = None
+
+
+class PollScheduler:
+    """Poll all Everhome entries on one evenly spaced, jittered grid."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        interval: float = UPDATE_INTERVAL,
+        jitter: float = POLL_JITTER,
+        max_concurrent: int = MAX_CONCURRENT_POLLS,
+    ) -> None:
+        """Initialize the scheduler."""
+        self._hass = hass
+        self.interval = interval
+        self.jitter = jitter
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._epoch = time.monotonic()
+        self._slots: dict[str, _Slot] = {}
+
+    @callback
+    def async_add(self, coordinator: EverhomeDataUpdateCoordinator) -> CALLBACK_TYPE:
+        """Schedule a coordinator, returning a callback that removes it."""
+        entry_id = coordinator.entry.entry_id
+        self._slots[entry_id] = _Slot(coordinator, last_poll=time.monotonic())
+        self._async_rebalance()
+
+        @callback
+        def remove() -> None:
+            slot = self._slots.pop(entry_id, None)
+            if slot is not None and slot.unsub is not None:
+                slot.unsub()
+            self._async_rebalance()
+
+        return remove
+
+    @callback
+    def _async_rebalance(self) -> None:
+        """Spread the phases of all entries evenly across the interval."""
+        count = len(self._slots)
+        for rank, slot in enumerate(self._slots.values()):
+            slot.phase = rank * self.interval / count
+            slot.coordinator.metrics.poll_phase = slot.phase
+            _LOGGER.debug(
+                "Polling %s at +%.0f s of every %d s",
+                slot.coordinator.entry.title,
+                slot.phase,
+                self.interval,
+            )
+            self._async_schedule(slot)
+
+    @callback
+    def _async_schedule(self, slot: _Slot) -> None:
+        """Schedule the next poll of an entry at its phase plus jitter."""
+        if slot.unsub is not None:
+            slot.unsub()
+        # A request budget may stretch the interval of an entry
+        interval = max(self.interval, slot.coordinator.poll_interval)
+        slot.coordinator.metrics.poll_interval = interval
+        now = time.monotonic()
+        delay = (slot.phase - (now - self._epoch)) % interval
+        if slot.last_poll is not None:
+            # Never poll an entry twice within half an interval, e.g. right
+            # after its first refresh or when a rebalance moves its phase
+            while delay < slot.last_poll + interval / 2 - now:
+                delay += interval
+        delay += random.uniform(0, self.jitter)
+        slot.unsub = async_call_later(self._hass, delay, partial(self._fire, slot))
+
+    @callback
+    def _fire(self, slot: _Slot, _now: datetime) -> None:
+        slot.unsub = None
+        self._hass.async_create_background_task(
+            self._async_poll(slot), f"everhome poll {slot.coordinator.entry.entry_id}"
+        )
+
+    async def _async_poll(self, slot: _Slot) -> None:
+        """Poll an entry, unless it mirrors another entry of its account."""
+        coordinator = slot.coordinator
+        try:
+            if coordinator.leader is None:
+                async with self._semaphore:
+                    now = time.monotonic()
+                    if slot.last_poll is not None:
+                        coordinator.metrics.last_poll_spacing = now - slot.last_poll
+                    slot.last_poll = now
+                    await coordinator.async_refresh()
+        finally:
+            if self._slots.get(coordinator.entry.entry_id) is slot:
+                self._async_schedule(slot)
+
+
+@callback
+def async_get_scheduler(hass: HomeAssistant) -> PollScheduler:
+    """Return the scheduler shared by all Everhome entries."""
+    scheduler: PollScheduler | None = hass.data.get(DATA_SCHEDULER)
+    if scheduler is None:
+        scheduler = hass.data[DATA_SCHEDULER] = PollScheduler(hass)
+    return scheduler
@@ -0,0 +1,209 @@
+"""Diagnostic sensors describing the Everhome integration itself."""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import (
+    PERCENTAGE,
+    EntityCategory,
+    UnitOfInformation,
+    UnitOfTime,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.device_registry import DeviceEntryType
+from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.typing import StateType
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import DOMAIN
+from .coordinator import EverhomeDataUpdateCoordinator
+from .metrics import EverhomeMetrics
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _ms(seconds: float | None) -> float | None:
+    return None if seconds is None else round(seconds * 1000, 1)
+
+
+@dataclass(frozen=True, kw_only=True)
+class EverhomeSensorEntityDescription(SensorEntityDescription):
+    """Describe an Everhome diagnostic sensor."""
+
+    value_fn: Callable[[EverhomeMetrics], StateType]
+    # Recorded by the coordinator polling the account, which belongs to
+    # another entry while this one follows it
+    account: bool = False
+
+
+SENSORS: tuple[EverhomeSensorEntityDescription, ...] = (
+    EverhomeSensorEntityDescription(
+        key="poll_latency",
+        account=True,
+        translation_key="poll_latency",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda m: _ms(m.last_poll_latency),
+    ),
+    EverhomeSensorEntityDescription(
+        key="poll_latency_p50",
+        account=True,
+        translation_key="poll_latency_p50",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda m: _ms(m.poll_latency_p50),
+    ),
+    EverhomeSensorEntityDescription(
+        key="poll_latency_p95",
+        account=True,
+        translation_key="poll_latency_p95",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda m: _ms(m.poll_latency_p95),
+    ),
+    EverhomeSensorEntityDescription(
+        key="payload_size",
+        account=True,
+        translation_key="payload_size",
+        device_class=SensorDeviceClass.DATA_SIZE,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda m: m.payload_bytes,
+    ),
+    EverhomeSensorEntityDescription(
+        key="decoded_devices",
+        account=True,
+        translation_key="decoded_devices",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda m: m.decoded_devices,
+    ),
+    EverhomeSensorEntityDescription(
+        key="supported_devices",
+        account=True,
+        translation_key="supported_devices",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda m: m.supported_devices,
+    ),
+    EverhomeSensorEntityDescription(
+        key="command_latency",
+        translation_key="command_latency",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda m: _ms(m.last_command_latency),
+    ),
+    EverhomeSensorEntityDescription(
+        key="command_error_rate",
+        translation_key="command_error_rate",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda m: (
+            None if m.command_error_rate is None else round(m.command_error_rate, 1)
+        ),
+    ),
+)
+
+
+# Only created when a request budget is configured
+BUDGET_SENSORS: tuple[EverhomeSensorEntityDescription, ...] = (
+    EverhomeSensorEntityDescription(
+        key="budget_remaining",
+        account=True,
+        translation_key="budget_remaining",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda m: m.budget_remaining,
+    ),
+    EverhomeSensorEntityDescription(
+        key="budget_exhausted_in",
+        account=True,
+        translation_key="budget_exhausted_in",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        value_fn=lambda m: (
+            None if m.budget_exhausted_in is None else round(m.budget_exhausted_in)
+        ),
+    ),
+    EverhomeSensorEntityDescription(
+        key="poll_interval",
+        account=True,
+        translation_key="poll_interval",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        value_fn=lambda m: (
+            None if m.poll_interval is None else round(m.poll_interval)
+        ),
+    ),
+)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up Everhome diagnostic sensors based on a config entry."""
+    coordinator: EverhomeDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+
+    descriptions = SENSORS
+    if coordinator.budget is not None:
+        descriptions += BUDGET_SENSORS
+
+    async_add_entities(
+        EverhomeDiagnosticSensor(coordinator, description)
+        for description in descriptions
+    )
+
+
+class EverhomeDiagnosticSensor(CoordinatorEntity, SensorEntity):
+    """Sensor exposing one of the integration's own counters."""
+
+    coordinator: EverhomeDataUpdateCoordinator
+    entity_description: EverhomeSensorEntityDescription
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_has_entity_name = True
+
+    def __init__(
+        self,
+        coordinator: EverhomeDataUpdateCoordinator,
+        description: EverhomeSensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self.entity_description = description
+        entry = coordinator.entry
+        self._attr_unique_id = f"{DOMAIN}_{entry.entry_id}_{description.key}"
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, entry.entry_id)},
+            name=entry.title,
+            manufacturer="Everhome",
+            model="Cloud API",
+            entry_type=DeviceEntryType.SERVICE,
+        )
+
+    @property
+    def available(self) -> bool:
+        """Return True; the counters are meaningful even when polls fail."""
+        return True
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the current counter value."""
+        coordinator = self.coordinator
+        if self.entity_description.account:
+            coordinator = coordinator.leader or coordinator
+        return self.entity_description.value_fn(coordinator.metrics)
@@ -3,17 +3,17 @@
 from __future__ import annotations
 
 import logging
-from typing import Any, cast
+from typing import Any
 
 from homeassistant.components.switch import SwitchDeviceClass, SwitchEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN, SWITCH_SUBTYPES
 from .coordinator import EverhomeDataUpdateCoordinator
+from .entity import EverhomeEntity
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -35,18 +35,17 @@ async def async_setup_entry(
     """Set up Everhome switches based on a config entry."""
     coordinator: EverhomeDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
 
-    async_add_entities(
-        EverhomeSwitch(coordinator, device_id, device_data)
-        for device_id, device_data in coordinator.data.items()
-        if device_data.get("subtype") in SWITCH_SUBTYPES
-    )
+    with coordinator.watchdog.measure("entities", len(coordinator.data)):
+        async_add_entities(
+            EverhomeSwitch(coordinator, device_id, device_data)
+            for device_id, device_data in coordinator.data.items()
+            if device_data.get("subtype") in SWITCH_SUBTYPES
+        )
 
 
-class EverhomeSwitch(CoordinatorEntity, SwitchEntity):
+class EverhomeSwitch(EverhomeEntity, SwitchEntity):
     """Representation of an Everhome switch."""
 
-    coordinator: EverhomeDataUpdateCoordinator
-
     def __init__(
         self,
         coordinator: EverhomeDataUpdateCoordinator,
@@ -54,8 +53,7 @@ class EverhomeSwitch(CoordinatorEntity, SwitchEntity):
         device_data: dict[str, Any],
     ) -> None:
         """Initialize the switch."""
-        super().__init__(coordinator)
-        self._device_id = device_id
+        super().__init__(coordinator, device_id)
         self._attr_name = device_data.get("name", f"Switch {device_id}")
         entry_id = coordinator.entry.entry_id
         self._attr_unique_id = f"{DOMAIN}_{entry_id}_{device_id}"
@@ -72,16 +70,6 @@ class EverhomeSwitch(CoordinatorEntity, SwitchEntity):
             sw_version=device_data.get("firmware_version", "Unknown"),
         )
 
-    @property
-    def device_data(self) -> dict[str, Any]:
-        """Return the device data."""
-        return cast(dict[str, Any], self.coordinator.data.get(self._device_id, {}))
-
-    @property
-    def available(self) -> bool:
-        """Return True if entity is available."""
-        return self._device_id in self.coordinator.data
-
     @property
     def is_on(self) -> bool | None:
         """Return True if the switch is on."""
@@ -92,12 +80,14 @@ class EverhomeSwitch(CoordinatorEntity, SwitchEntity):
             return False
         return None
 
+    def _state_key(self) -> tuple[Any, ...]:
+        """Return the derived switch state."""
+        return (*super()._state_key(), self.is_on)
+
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the switch on."""
-        await self.coordinator.execute_device_action(self._device_id, "on")
-        await self.coordinator.async_request_refresh()
+        await self._async_execute("on")
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the switch off."""
-        await self.coordinator.execute_device_action(self._device_id, "off")
-        await self.coordinator.async_request_refresh()
+        await self._async_execute("off")
@@ -0,0 +1,146 @@
+"""Opt-in tracing of the Everhome poll and command paths.
+
+Spans are tracked with a context variable so nested sections (token check,
+request, decode, state writes, ...) attach to the command or poll that
+caused them. Finished spans are written as Chrome trace events, one JSON
+object per line, to a rotating file that Perfetto or chrome://tracing can
+load after wrapping the lines in a JSON array.
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+import logging
+import os
+import time
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from queue import SimpleQueue
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+# Rotate the trace file at this size, keeping this many old files
+TRACE_MAX_BYTES = 5 * 1024 * 1024
+TRACE_BACKUP_COUNT = 3
+
+_NULL_SPAN: AbstractContextManager[None] = nullcontext()
+_ids = itertools.count(1)
+
+# (tracer, trace id, span id) of the innermost open span
+_current: ContextVar[tuple[Tracer, int, int] | None] = ContextVar(
+    "everhome_span", default=None
+)
+
+
+class NullTracer:
+    """Tracer used when tracing is disabled."""
+
+    def span(self, name: str, **attrs: Any) -> AbstractContextManager[None]:
+        """Return a no-op span, or a child span of an active trace."""
+        return span(name, **attrs)
+
+    def stop(self) -> None:
+        """Do nothing."""
+
+    async def async_stop(self, hass: HomeAssistant) -> None:
+        """Do nothing."""
+
+
+NULL_TRACER = NullTracer()
+
+
+class Tracer:
+    """Write spans of one config entry to a rotating JSON-lines file."""
+
+    def __init__(self, handler: logging.Handler, name: str) -> None:
+        """Initialize the tracer around an opened file handler."""
+        queue: SimpleQueue[logging.LogRecord] = SimpleQueue()
+        self._logger = logging.getLogger(f"{__name__}.{name}")
+        self._logger.propagate = False
+        self._logger.setLevel(logging.INFO)
+        self._queue_handler = QueueHandler(queue)
+        self._logger.addHandler(self._queue_handler)
+        # File writes happen on the listener thread, never on the event loop
+        self._listener = QueueListener(queue, handler)
+        self._listener.start()
+        self._stopped = False
+        self._pid = os.getpid()
+
+    def span(self, name: str, **attrs: Any) -> AbstractContextManager[None]:
+        """Open a span, starting a new trace when none is active."""
+        return self._span(name, attrs)
+
+    @contextmanager
+    def _span(self, name: str, attrs: dict[str, Any]) -> Iterator[None]:
+        parent = _current.get()
+        if parent is None or parent[0] is not self:
+            trace_id, parent_id = next(_ids), None
+        else:
+            trace_id, parent_id = parent[1], parent[2]
+        span_id = next(_ids)
+        token = _current.set((self, trace_id, span_id))
+        start_us = time.time_ns() // 1000
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration_us = int((time.perf_counter() - start) * 1_000_000)
+            _current.reset(token)
+            self._logger.info(
+                json.dumps(
+                    {
+                        "name": name,
+                        "ph": "X",
+                        "ts": start_us,
+                        "dur": duration_us,
+                        "pid": self._pid,
+                        "tid": trace_id,
+                        "args": {"span_id": span_id, "parent_id": parent_id, **attrs},
+                    }
+                )
+            )
+
+    async def async_stop(self, hass: HomeAssistant) -> None:
+        """Stop the tracer without blocking the event loop."""
+        await hass.async_add_executor_job(self.stop)
+
+    def stop(self) -> None:
+        """Flush pending spans and close the file.
+
+        This joins the listener thread and closes the file, so call it from
+        an executor thread, or await async_stop on the event loop.
+        """
+        if self._stopped:
+            return
+        self._stopped = True
+        self._listener.stop()
+        self._logger.removeHandler(self._queue_handler)
+        for handler in self._listener.handlers:
+            handler.close()
+
+
+def span(name: str, **attrs: Any) -> AbstractContextManager[None]:
+    """Open a child span of the active trace, or do nothing."""
+    current = _current.get()
+    if current is None:
+        return _NULL_SPAN
+    return current[0].span(name, **attrs)
+
+
+async def async_create_tracer(hass: HomeAssistant, entry_id: str) -> Tracer:
+    """Create a tracer writing to the Home Assistant config directory."""
+    path = hass.config.path(f"everhome_trace_{entry_id}.jsonl")
+
+    def _open() -> logging.Handler:
+        handler = RotatingFileHandler(
+            path, maxBytes=TRACE_MAX_BYTES, backupCount=TRACE_BACKUP_COUNT
+        )
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        return handler
+
+    handler = await hass.async_add_executor_job(_open)
+    return Tracer(handler, entry_id)
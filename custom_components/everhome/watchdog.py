@@ -0,0 +1,66 @@
+"""Detect integration code holding the event loop for too long.
+
+Everything in the integration runs on Home Assistant's event loop, so any
+synchronous section (decoding and filtering a /device payload, building the
+snapshot, creating entities, dispatching updates) delays every other
+integration. The watchdog times these sections, keeps the worst time per
+section and logs the ones exceeding the configured threshold.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+
+from .metrics import EverhomeMetrics
+
+_LOGGER = logging.getLogger(__name__)
+
+_NULL_MEASURE: AbstractContextManager[None] = nullcontext()
+
+
+class NullWatchdog:
+    """Watchdog used when loop stall detection is disabled."""
+
+    def measure(
+        self, section: str, size: int | None = None
+    ) -> AbstractContextManager[None]:
+        """Return a no-op context manager."""
+        return _NULL_MEASURE
+
+
+NULL_WATCHDOG = NullWatchdog()
+
+
+class LoopWatchdog:
+    """Time synchronous sections and report those blocking the loop."""
+
+    def __init__(self, metrics: EverhomeMetrics, threshold: float) -> None:
+        """Initialize the watchdog with a threshold in seconds."""
+        self._metrics = metrics
+        self.threshold = threshold
+
+    def measure(
+        self, section: str, size: int | None = None
+    ) -> AbstractContextManager[None]:
+        """Time a section; size is the number of items or bytes it handled."""
+        return self._measure(section, size)
+
+    @contextmanager
+    def _measure(self, section: str, size: int | None) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            stalled = elapsed >= self.threshold
+            self._metrics.record_loop_block(section, elapsed, stalled)
+            if stalled:
+                _LOGGER.warning(
+                    "%s blocked the event loop for %.1f ms (size %s)",
+                    section,
+                    elapsed * 1000,
+                    size,
+                )
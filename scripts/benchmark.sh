@@ -0,0 +1,41 @@
+#!/bin/bash
+# Performance benchmark runner for Everhome integration
+#
+#   scripts/benchmark.sh        compare with the stored baseline, failing on
+#                               a regression of more than 25%, or when this
+#                               machine type has no baseline yet
+#   scripts/benchmark.sh save   store the results as the new baseline
+#
+# Baselines are kept per machine type (OS, Python version) under
+# tests/benchmarks/baselines. Timings only compare on the same hardware, so
+# record the baseline on the machine that runs the comparison.
+#
+# Extra arguments are passed to pytest, e.g. -k "10000_devices".
+
+set -e
+
+if [[ ! -f "custom_components/everhome/manifest.json" ]]; then
+    echo "❌ Please run this script from the ha-everhome repository root"
+    exit 1
+fi
+
+STORAGE="tests/benchmarks/baselines"
+ARGS=(tests/benchmarks -m perf --no-cov "--benchmark-storage=$STORAGE")
+
+if [[ "$1" == "save" ]]; then
+    shift
+    echo "📏 Recording benchmark baseline..."
+    pytest "${ARGS[@]}" --benchmark-save=baseline "$@"
+else
+    MACHINE=$(python -c "from pytest_benchmark.utils import get_machine_id; print(get_machine_id())")
+    BASELINE=$(ls "$STORAGE/$MACHINE"/*_baseline.json 2>/dev/null | tail -n 1)
+    if [[ -z "$BASELINE" ]]; then
+        echo "❌ No benchmark baseline for $MACHINE in $STORAGE"
+        echo "   Record one with: scripts/benchmark.sh save"
+        exit 1
+    fi
+    RUN=$(basename "$BASELINE")
+    echo "📏 Comparing benchmarks with $MACHINE/$RUN..."
+    pytest "${ARGS[@]}" "--benchmark-compare=${RUN%%_*}" \
+        --benchmark-compare-fail=min:25% "$@"
+fi
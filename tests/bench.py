@@ -0,0 +1,363 @@
+"""Command line load generator for the Everhome API client.
+
+Runs one coordinator per simulated account against the local cloud
+simulator, or against the /device payloads of a recorded capture served by
+it, and reports throughput, latency percentiles, error rates and event
+loop lag::
+
+    python -m tests.bench --accounts 3 \\
+        --polls-per-minute 12 --concurrency 4 --duration 60 \\
+        --report everhome-bench.json
+
+Every account polls at the given rate while the command workers, spread
+over the accounts, send cover commands back to back. The JSON report keeps
+a versioned layout so results can be tracked across releases.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import platform
+import tempfile
+import time
+from collections.abc import Iterator
+from contextlib import AsyncExitStack
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, cast
+
+import aiohttp
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from custom_components import everhome
+from custom_components.everhome.api import EverhomeAuth
+from custom_components.everhome.capture import (
+    EVENT_COMMAND,
+    EVENT_DEVICES,
+    CaptureEvent,
+)
+from custom_components.everhome.const import (
+    ACTION_CLOSE,
+    ACTION_OPEN,
+    COVER_SUBTYPES,
+    DOMAIN,
+)
+from custom_components.everhome.coordinator import EverhomeDataUpdateCoordinator
+
+from .chaos import PROFILES
+from .replay import read_capture
+from .simulator import (
+    EverhomeSimulator,
+    SimulatorAuth,
+    build_population,
+)
+
+REPORT_VERSION = 1
+
+# Seconds between event loop lag probes
+LAG_PROBE_INTERVAL = 0.05
+
+_MANIFEST = Path(everhome.__file__).with_name("manifest.json")
+
+
+def _percentiles(samples: list[float]) -> dict[str, float | None]:
+    """Return nearest-rank percentiles of samples, in milliseconds."""
+    ordered = sorted(samples)
+
+    def rank(pct: float) -> float | None:
+        if not ordered:
+            return None
+        index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+        return round(ordered[index] * 1000, 3)
+
+    return {
+        "p50": rank(50),
+        "p90": rank(90),
+        "p99": rank(99),
+        "max": rank(100),
+    }
+
+
+@dataclass
+class _Operations:
+    """Latencies and failures of one kind of operation."""
+
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+
+    def record(self, latency: float, success: bool) -> None:
+        self.latencies.append(latency)
+        if not success:
+            self.errors += 1
+
+    def as_dict(self, duration: float) -> dict[str, Any]:
+        count = len(self.latencies)
+        return {
+            "count": count,
+            "errors": self.errors,
+            "error_rate": self.errors / count if count else 0.0,
+            "per_second": count / duration,
+            "latency_ms": _percentiles(self.latencies),
+        }
+
+
+class _Source:
+    """What the simulator serves: its population or a capture."""
+
+    def __init__(self, args: argparse.Namespace) -> None:
+        self.simulator = EverhomeSimulator(
+            (
+                build_population(
+                    args.devices, unsupported=args.unsupported, seed=args.seed
+                )
+                if args.capture is None
+                else ()
+            ),
+            latency=args.latency,
+            latency_jitter=args.jitter,
+            seed=args.seed,
+            chaos=PROFILES[args.profile] if args.profile else None,
+        )
+        self._payloads: Iterator[CaptureEvent] | None = None
+        if args.capture is None:
+            self.targets = [
+                device.id
+                for device in self.simulator.devices.values()
+                if device.subtype in COVER_SUBTYPES
+            ]
+            return
+
+        events = read_capture(args.capture)
+        payloads = [event for event in events if event.kind == EVENT_DEVICES]
+        if not payloads:
+            raise SystemExit(f"{args.capture} holds no /device responses")
+        self._payloads = itertools.cycle(payloads)
+        # Commands in a capture were answered by the cloud, so answer
+        # them the same way without simulating the devices
+        self.simulator.recorded_command_status = 200
+        self.targets = sorted(
+            {str(event.device_id) for event in events if event.kind == EVENT_COMMAND}
+            or {
+                device["id"]
+                for event in payloads
+                for device in event.devices or ()
+                if device.get("subtype") in COVER_SUBTYPES
+            }
+        )
+
+    def next_payload(self) -> None:
+        """Serve the next recorded /device response, when replaying."""
+        if self._payloads is not None:
+            event = next(self._payloads)
+            self.simulator.recorded_response = (event.status, event.devices)
+
+
+async def _probe_loop_lag(lags: list[float], stop: asyncio.Event) -> None:
+    """Sample how late the event loop wakes a sleeping task."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(LAG_PROBE_INTERVAL)
+        lags.append(max(0.0, time.perf_counter() - start - LAG_PROBE_INTERVAL))
+
+
+async def _wait(stop: asyncio.Event, seconds: float) -> None:
+    """Sleep, returning early once the run is stopped."""
+    try:
+        await asyncio.wait_for(stop.wait(), max(0.0, seconds))
+    except asyncio.TimeoutError:
+        pass
+
+
+async def _poll(
+    coordinator: EverhomeDataUpdateCoordinator,
+    source: _Source,
+    interval: float,
+    polls: _Operations,
+    stop: asyncio.Event,
+) -> None:
+    """Poll an account at a fixed rate."""
+    while not stop.is_set():
+        failures = coordinator.metrics.poll_failures
+        start = time.perf_counter()
+        source.next_payload()
+        await coordinator.async_refresh()
+        latency = time.perf_counter() - start
+        # A failed poll may still serve the last snapshot successfully
+        polls.record(latency, coordinator.metrics.poll_failures == failures)
+        await _wait(stop, interval - latency)
+
+
+async def _command(
+    coordinator: EverhomeDataUpdateCoordinator,
+    targets: list[str],
+    offset: int,
+    commands: _Operations,
+    stop: asyncio.Event,
+) -> None:
+    """Send cover commands back to back."""
+    for index in itertools.count(offset):
+        if stop.is_set():
+            return
+        action = ACTION_CLOSE if index % 2 else ACTION_OPEN
+        start = time.perf_counter()
+        try:
+            result = await coordinator.execute_device_action(
+                targets[index % len(targets)], action
+            )
+            success = result.success
+        except aiohttp.ClientError:
+            # A failed token refresh reaches the caller
+            success = False
+        commands.record(time.perf_counter() - start, success)
+
+
+async def run_benchmark(args: argparse.Namespace) -> dict[str, Any]:
+    """Run the configured load and return the report."""
+    source = _Source(args)
+    simulator = source.simulator
+    polls, commands = _Operations(), _Operations()
+    lags: list[float] = []
+    stop = asyncio.Event()
+
+    async with AsyncExitStack() as stack:
+        config_dir = stack.enter_context(tempfile.TemporaryDirectory())
+        hass = HomeAssistant(config_dir)
+        stack.push_async_callback(hass.async_stop, force=True)
+        base_url = await simulator.start()
+        stack.push_async_callback(simulator.stop)
+
+        coordinators = []
+        for account in range(args.accounts):
+            session = await stack.enter_async_context(aiohttp.ClientSession())
+            entry = ConfigEntry(
+                version=1,
+                minor_version=1,
+                domain=DOMAIN,
+                title=f"Account {account + 1}",
+                data={},
+                source="user",
+            )
+            coordinator = EverhomeDataUpdateCoordinator(
+                hass,
+                cast(EverhomeAuth, SimulatorAuth(session, base_url)),
+                entry,
+                base_url=base_url,
+            )
+            # The first poll fetches a token and warms up the connection
+            source.next_payload()
+            await coordinator.async_refresh()
+            coordinators.append(coordinator)
+
+        if args.concurrency and not source.targets:
+            raise SystemExit("No cover devices to send commands to")
+        simulator.requests.clear()
+        interval = 60 / args.polls_per_minute if args.polls_per_minute else None
+
+        start = time.perf_counter()
+        tasks = [asyncio.create_task(_probe_loop_lag(lags, stop))]
+        if interval is not None:
+            tasks.extend(
+                asyncio.create_task(_poll(coordinator, source, interval, polls, stop))
+                for coordinator in coordinators
+            )
+        tasks.extend(
+            asyncio.create_task(
+                _command(
+                    coordinators[worker % len(coordinators)],
+                    source.targets,
+                    worker,
+                    commands,
+                    stop,
+                )
+            )
+            for worker in range(args.concurrency)
+        )
+        await _wait(stop, args.duration)
+        stop.set()
+        await asyncio.gather(*tasks)
+        duration = time.perf_counter() - start
+
+    requests = sum(simulator.requests.values())
+    return {
+        "version": REPORT_VERSION,
+        "integration_version": json.loads(_MANIFEST.read_text())["version"],
+        "python": platform.python_version(),
+        "config": {
+            key: value for key, value in sorted(vars(args).items()) if key != "report"
+        },
+        "duration": round(duration, 3),
+        "requests": requests,
+        "requests_per_second": requests / duration,
+        "polls": polls.as_dict(duration),
+        "commands": commands.as_dict(duration),
+        "loop_lag_ms": _percentiles(lags),
+    }
+
+
+def _print_report(report: dict[str, Any]) -> None:
+    """Print a human readable summary of a report."""
+    print(
+        f"{report['duration']:.1f} s, {report['requests']} requests "
+        f"({report['requests_per_second']:.1f}/s)"
+    )
+    for name in ("polls", "commands"):
+        stats = report[name]
+        latency = stats["latency_ms"]
+        print(
+            f"{name:<9}{stats['count']:>7} {stats['per_second']:>8.1f}/s"
+            f"  errors {stats['error_rate']:>6.1%}"
+            f"  p50 {latency['p50']} ms  p90 {latency['p90']} ms"
+            f"  p99 {latency['p99']} ms  max {latency['max']} ms"
+        )
+    lag = report["loop_lag_ms"]
+    print(f"loop lag  p50 {lag['p50']} ms  p99 {lag['p99']} ms  max {lag['max']} ms")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Return the command line parser."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--capture", help="serve the /device responses of this capture")
+    parser.add_argument("--devices", type=int, default=50)
+    parser.add_argument("--unsupported", type=int, default=0)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--profile", choices=sorted(PROFILES))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--accounts", type=int, default=1)
+    parser.add_argument(
+        "--polls-per-minute", type=float, default=12, help="per account, 0 for none"
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=1, help="concurrent command workers"
+    )
+    parser.add_argument("--duration", type=float, default=30, help="seconds")
+    parser.add_argument("--report", help="write the JSON report to this file")
+    parser.add_argument("--verbose", action="store_true")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run the benchmark from the command line."""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.accounts < 1:
+        parser.error("--accounts must be at least 1")
+
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.WARNING)
+    if not args.verbose:
+        # Injected faults would otherwise log every failed request
+        logging.getLogger(__package__).setLevel(logging.CRITICAL)
+
+    report = asyncio.run(run_benchmark(args))
+    _print_report(report)
+    if args.report:
+        Path(args.report).write_text(json.dumps(report, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,6 @@
+"""Performance benchmarks for the Everhome integration.
+
+The benchmarks carry the ``perf`` marker and are deselected by default.
+Run them with ``scripts/benchmark.sh``, which compares every run with the
+stored baseline and fails on regressions.
+"""
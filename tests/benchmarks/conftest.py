@@ -0,0 +1,103 @@
+"""Fixtures for the Everhome benchmarks."""
+
+from __future__ import annotations
+
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.everhome.const import DOMAIN
+from custom_components.everhome.coordinator import (
+    READ_CHUNK_SIZE,
+    EverhomeDataUpdateCoordinator,
+)
+from custom_components.everhome.entity import EverhomeEntity
+from custom_components.everhome.parser import DEVICE_FIELDS
+
+from ..harness import async_attach_entities
+from ..simulator import build_population
+
+# Supported devices per simulated account
+DEVICE_COUNTS = (10, 100, 1_000, 10_000)
+
+
+@pytest.fixture(params=DEVICE_COUNTS, ids=lambda count: f"{count}_devices")
+def device_count(request: pytest.FixtureRequest) -> int:
+    """Return the number of supported devices on the account."""
+    return request.param
+
+
+@pytest.fixture
+def device_list(device_count: int) -> list[dict]:
+    """Return a /device payload, a fifth of it unsupported devices."""
+    population = build_population(device_count, unsupported=device_count // 4)
+    return [device.as_dict() for device in population]
+
+
+@pytest.fixture
+def device_body(device_list: list[dict]) -> bytes:
+    """Return the encoded /device response."""
+    return json.dumps(device_list).encode()
+
+
+@pytest.fixture
+def response(device_body: bytes) -> MagicMock:
+    """Mock a /device response streaming the body."""
+
+    async def iter_chunked(size: int):
+        for index in range(0, len(device_body), READ_CHUNK_SIZE):
+            yield device_body[index : index + READ_CHUNK_SIZE]
+
+    resp = AsyncMock()
+    resp.status = 200
+    resp.content = MagicMock()
+    resp.content.iter_chunked = iter_chunked
+    return resp
+
+
+@pytest.fixture
+def coordinator(
+    hass: HomeAssistant, device_list: list[dict], response: MagicMock
+) -> EverhomeDataUpdateCoordinator:
+    """Create a coordinator holding the account's supported devices."""
+
+    class Request:
+        async def __aenter__(self):
+            return response
+
+        async def __aexit__(self, *exc_info):
+            return None
+
+    auth = AsyncMock()
+    auth.async_get_access_token.return_value = "token"
+    auth.token_refreshes = 0
+    auth.aiohttp_session.get = lambda *args, **kwargs: Request()
+    entry = MockConfigEntry(domain=DOMAIN)
+    coordinator = EverhomeDataUpdateCoordinator(hass, auth, entry)
+    coordinator.data = hass.loop.run_until_complete(coordinator._get_devices())
+    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
+    return coordinator
+
+
+@pytest.fixture
+def entities(
+    hass: HomeAssistant, coordinator: EverhomeDataUpdateCoordinator
+) -> list[EverhomeEntity]:
+    """Create the device entities, subscribed to the coordinator."""
+    return hass.loop.run_until_complete(async_attach_entities(hass, coordinator))
+
+
+def toggled(data: dict[str, dict]) -> dict[str, dict]:
+    """Return a snapshot with every device's general state changed."""
+    flipped = {}
+    for device_id, device in data.items():
+        states = dict(device.get("states", {}))
+        general = states.get("general")
+        states["general"] = "off" if general == "on" else "on"
+        flipped[device_id] = {
+            key: device[key] for key in DEVICE_FIELDS if key in device
+        } | {"states": states}
+    return flipped
@@ -0,0 +1,80 @@
+"""Benchmark the coordinator and entity hot paths at scale."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.everhome import binary_sensor, cover, light, switch
+from custom_components.everhome.binary_sensor import EverhomeBinarySensor
+from custom_components.everhome.cover import EverhomeCover
+from custom_components.everhome.light import EverhomeLight
+from custom_components.everhome.switch import EverhomeSwitch
+
+from .conftest import toggled
+
+pytestmark = pytest.mark.perf
+
+
+def test_get_devices(hass: HomeAssistant, benchmark, coordinator, device_count):
+    """Decode and filter a streamed /device response."""
+    devices = benchmark(
+        lambda: hass.loop.run_until_complete(coordinator._get_devices())
+    )
+
+    assert len(devices) == device_count
+
+
+def test_dispatch(benchmark, coordinator, entities):
+    """Dispatch a changed snapshot to every entity."""
+    snapshots = [toggled(coordinator.data), coordinator.data]
+    rounds = iter(range(1_000_000))
+
+    def dispatch() -> None:
+        coordinator.async_set_updated_data(snapshots[next(rounds) % 2])
+
+    benchmark(dispatch)
+
+    assert coordinator.metrics.state_writes
+
+
+@pytest.mark.parametrize(
+    "entity_class",
+    [EverhomeCover, EverhomeLight, EverhomeSwitch, EverhomeBinarySensor],
+    ids=lambda entity_class: entity_class.__name__,
+)
+def test_state_properties(benchmark, entities, entity_class: type[Any]):
+    """Evaluate the state properties of every entity of a platform."""
+    platform_entities = [entity for entity in entities if type(entity) is entity_class]
+
+    def evaluate() -> None:
+        for entity in platform_entities:
+            entity._state_key()
+
+    benchmark(evaluate)
+
+    assert platform_entities
+
+
+@pytest.mark.parametrize(
+    "platform",
+    [cover, binary_sensor, light, switch],
+    ids=lambda platform: platform.__name__.rsplit(".", 1)[1],
+)
+def test_setup_entry(hass: HomeAssistant, benchmark, coordinator, platform):
+    """Create a platform's entities for the account."""
+    created: list[Any] = []
+
+    def setup() -> None:
+        created.clear()
+        hass.loop.run_until_complete(
+            platform.async_setup_entry(
+                hass, coordinator.entry, lambda new, *_: created.extend(new)
+            )
+        )
+
+    benchmark(setup)
+
+    assert created
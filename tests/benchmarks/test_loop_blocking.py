@@ -0,0 +1,75 @@
+"""Measure how long parsing the /device list holds the event loop."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable
+from typing import Any, TypeVar
+from unittest.mock import patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+pytestmark = pytest.mark.perf
+
+
+async def _longest_block(awaitable: Awaitable[_T]) -> tuple[_T, float]:
+    """Await and return the longest time the event loop was held meanwhile."""
+    longest = 0.0
+    done = False
+
+    async def probe() -> None:
+        nonlocal longest
+        while not done:
+            start = time.perf_counter()
+            await asyncio.sleep(0)
+            longest = max(longest, time.perf_counter() - start)
+
+    task = asyncio.create_task(probe())
+    await asyncio.sleep(0)
+    try:
+        result = await awaitable
+    finally:
+        done = True
+        await task
+    return result, longest
+
+
+@pytest.mark.parametrize("device_count", [10_000], ids=["10000_devices"])
+def test_executor_parse_frees_the_loop(
+    hass: HomeAssistant,
+    coordinator: Any,
+    device_body: bytes,
+    device_count: int,
+    record_property: Any,
+) -> None:
+    """Parsing past the threshold in an executor keeps loop blocks short."""
+    with patch(
+        "custom_components.everhome.coordinator.DECODE_EXECUTOR_THRESHOLD",
+        len(device_body),
+    ):
+        devices, inline = hass.loop.run_until_complete(
+            _longest_block(coordinator._get_devices())
+        )
+    assert len(devices) == device_count
+
+    devices, executor = hass.loop.run_until_complete(
+        _longest_block(coordinator._get_devices())
+    )
+    assert len(devices) == device_count
+
+    _LOGGER.info(
+        "Longest loop block parsing %d bytes: %.1f ms inline, %.1f ms executor",
+        len(device_body),
+        inline * 1000,
+        executor * 1000,
+    )
+    record_property("loop_block_inline_ms", round(inline * 1000, 1))
+    record_property("loop_block_executor_ms", round(executor * 1000, 1))
+    assert executor < inline / 2
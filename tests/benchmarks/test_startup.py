@@ -0,0 +1,193 @@
+"""Benchmark the time until Everhome entities appear after a restart."""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable, Iterator
+from contextlib import ExitStack, contextmanager
+from functools import partial, wraps
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import Event, HomeAssistant
+from homeassistant.helpers import config_entry_oauth2_flow
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.entity_platform import EntityPlatform
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.everhome import binary_sensor, cover, light, sensor, switch
+from custom_components.everhome.api import EverhomeAuth
+from custom_components.everhome.const import API_AUTHORIZE_URL, API_TOKEN_URL, DOMAIN
+from custom_components.everhome.coordinator import EverhomeDataUpdateCoordinator
+
+from ..simulator import EverhomeSimulator, build_population
+
+pytestmark = pytest.mark.perf
+
+PLATFORM_MODULES = (cover, binary_sensor, light, switch, sensor)
+
+
+class StartupPhases:
+    """Time the phases of setting up a config entry."""
+
+    def __init__(self) -> None:
+        """Initialize the recorder."""
+        self.start = 0.0
+        self.phases: dict[str, float] = {}
+
+    def record(self, phase: str, duration: float) -> None:
+        """Add the duration of a phase."""
+        self.phases[phase] = self.phases.get(phase, 0.0) + duration
+
+    def timed(
+        self, phase: str | Callable[[Any], str], func: Any, first_only: bool = False
+    ) -> Any:
+        """Wrap a coroutine function to record its duration."""
+
+        @wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                name = phase if isinstance(phase, str) else phase(args[0])
+                if not first_only or name not in self.phases:
+                    self.record(name, time.perf_counter() - start)
+
+        return wrapper
+
+    @contextmanager
+    def patched(self, hass: HomeAssistant) -> Iterator[None]:
+        """Instrument the setup path of the integration."""
+        with ExitStack() as stack:
+            stack.enter_context(
+                patch.object(
+                    EverhomeAuth,
+                    "async_get_access_token",
+                    # Later calls are part of the first refresh
+                    self.timed(
+                        "token", EverhomeAuth.async_get_access_token, first_only=True
+                    ),
+                )
+            )
+            stack.enter_context(
+                patch.object(
+                    EverhomeDataUpdateCoordinator,
+                    "async_config_entry_first_refresh",
+                    self.timed(
+                        "first_refresh",
+                        EverhomeDataUpdateCoordinator.async_config_entry_first_refresh,
+                    ),
+                )
+            )
+            for module in PLATFORM_MODULES:
+                name = module.__name__.rsplit(".", 1)[1]
+                stack.enter_context(
+                    patch.object(
+                        module,
+                        "async_setup_entry",
+                        self.timed(f"platform:{name}", module.async_setup_entry),
+                    )
+                )
+            stack.enter_context(
+                patch.object(
+                    EntityPlatform,
+                    "async_add_entities",
+                    self.timed(
+                        lambda platform: f"register:{platform.domain}",
+                        EntityPlatform.async_add_entities,
+                    ),
+                )
+            )
+
+            def first_entity(event: Event) -> None:
+                if "first_entity" not in self.phases:
+                    self.phases["first_entity"] = time.perf_counter() - self.start
+
+            stack.callback(hass.bus.async_listen(EVENT_STATE_CHANGED, first_entity))
+            yield
+
+
+@pytest.mark.parametrize("latency", [0.0, 0.05], ids=["local", "50ms"])
+@pytest.mark.parametrize("devices", [10, 100, 1_000], ids=lambda n: f"{n}_devices")
+def test_time_to_first_entity(
+    hass: HomeAssistant, socket_enabled, benchmark, devices: int, latency: float
+):
+    """Set up a config entry against the simulator, phase by phase."""
+    simulator = EverhomeSimulator(
+        build_population(devices, unsupported=devices // 4), latency=latency
+    )
+    base_url = hass.loop.run_until_complete(simulator.start())
+    config_entry_oauth2_flow.async_register_implementation(
+        hass,
+        DOMAIN,
+        config_entry_oauth2_flow.LocalOAuth2Implementation(
+            hass,
+            DOMAIN,
+            "client_id",
+            "client_secret",
+            f"{base_url}{API_AUTHORIZE_URL}",
+            f"{base_url}{API_TOKEN_URL}",
+        ),
+    )
+    entries: list[MockConfigEntry] = []
+    rounds: list[dict[str, float]] = []
+
+    def add_entry() -> tuple[tuple[MockConfigEntry], dict[str, Any]]:
+        # Remove the previous round's entities so every round registers anew
+        for entry in entries:
+            hass.loop.run_until_complete(
+                hass.config_entries.async_remove(entry.entry_id)
+            )
+        entries.clear()
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            data={
+                "auth_implementation": DOMAIN,
+                # An expired token makes setup refresh it, as after a restart
+                "token": {
+                    "access_token": "expired",
+                    "refresh_token": "refresh",
+                    "expires_at": 0,
+                },
+            },
+        )
+        entry.add_to_hass(hass)
+        entries.append(entry)
+        return (entry,), {}
+
+    def set_up(entry: MockConfigEntry) -> None:
+        recorder = StartupPhases()
+        with recorder.patched(hass):
+            recorder.start = time.perf_counter()
+            assert hass.loop.run_until_complete(
+                hass.config_entries.async_setup(entry.entry_id)
+            )
+            hass.loop.run_until_complete(hass.async_block_till_done())
+            recorder.record("total", time.perf_counter() - recorder.start)
+        rounds.append(recorder.phases)
+
+    with patch(
+        "custom_components.everhome.EverhomeDataUpdateCoordinator",
+        partial(EverhomeDataUpdateCoordinator, base_url=base_url),
+    ):
+        benchmark.pedantic(set_up, setup=add_entry, rounds=3)
+
+        entry = entries[0]
+        assert entry.state is ConfigEntryState.LOADED
+        registered = er.async_entries_for_config_entry(
+            er.async_get(hass), entry.entry_id
+        )
+        assert len(registered) > devices
+        hass.loop.run_until_complete(hass.config_entries.async_unload(entry.entry_id))
+    hass.loop.run_until_complete(simulator.stop())
+
+    # Keep the fastest round's breakdown with the benchmark results
+    fastest = min(rounds, key=lambda phases: phases["total"])
+    benchmark.extra_info["phases"] = {
+        phase: round(duration * 1000, 3) for phase, duration in sorted(fastest.items())
+    }
+    assert {"token", "first_refresh", "first_entity"} <= fastest.keys()
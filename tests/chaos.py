@@ -0,0 +1,110 @@
+"""Fault injection profiles for the Everhome cloud simulator.
+
+A profile describes how a misbehaving cloud answers: latency spikes, bursts
+of server errors, throttling with ``Retry-After``, truncated JSON, devices
+missing from single responses, bodies trickling in slowly and a failing
+token endpoint. Rates are the probability that one request is affected,
+drawn from a seeded generator so runs are reproducible.
+
+The module has no Home Assistant dependencies.
+"""
+
+from __future__ import annotations
+
+import random
+from collections import Counter
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class ChaosProfile:
+    """Faults injected into simulated cloud responses."""
+
+    name: str
+    latency_spike_rate: float = 0.0
+    latency_spike: float = 0.0
+    error_rate: float = 0.0
+    # Requests failing in a row once an error is triggered
+    error_burst: int = 1
+    error_status: int = 503
+    throttle_rate: float = 0.0
+    retry_after: int = 60
+    truncate_rate: float = 0.0
+    # Probability of a single device being left out of a /device response
+    missing_rate: float = 0.0
+    drip_rate: float = 0.0
+    drip_chunk: int = 256
+    drip_delay: float = 0.05
+    token_error_rate: float = 0.0
+
+
+PROFILES: dict[str, ChaosProfile] = {
+    profile.name: profile
+    for profile in (
+        ChaosProfile("healthy"),
+        ChaosProfile("latency_spikes", latency_spike_rate=0.3, latency_spike=5.0),
+        ChaosProfile("error_bursts", error_rate=0.15, error_burst=3),
+        ChaosProfile("throttled", throttle_rate=0.3, retry_after=120),
+        ChaosProfile("truncated_json", truncate_rate=0.3),
+        ChaosProfile("missing_devices", missing_rate=0.1),
+        ChaosProfile("slow_drip", drip_rate=0.5),
+        ChaosProfile("token_failures", token_error_rate=0.5),
+    )
+}
+
+
+class ChaosInjector:
+    """Decide, request by request, which faults of a profile to inject."""
+
+    def __init__(self, profile: ChaosProfile, seed: int = 0) -> None:
+        """Initialize the injector."""
+        self.profile = profile
+        # Faults are only injected while active
+        self.active = True
+        self.injected: Counter[str] = Counter()
+        self._rng = random.Random(seed)
+        self._burst = 0
+
+    def _roll(self, fault: str, rate: float) -> bool:
+        if not self.active or rate <= 0 or self._rng.random() >= rate:
+            return False
+        self.injected[fault] += 1
+        return True
+
+    def delay(self) -> float:
+        """Return the extra seconds to delay a request by."""
+        if self._roll("latency_spike", self.profile.latency_spike_rate):
+            return self.profile.latency_spike
+        return 0.0
+
+    def error(self) -> tuple[int, dict[str, str]] | None:
+        """Return the status and headers of an injected error response."""
+        if not self.active:
+            self._burst = 0
+            return None
+        if self._burst or self._roll("error", self.profile.error_rate):
+            if self._burst:
+                self.injected["error"] += 1
+            else:
+                self._burst = self.profile.error_burst
+            self._burst -= 1
+            return self.profile.error_status, {}
+        if self._roll("throttle", self.profile.throttle_rate):
+            return 429, {"Retry-After": str(self.profile.retry_after)}
+        return None
+
+    def token_error(self) -> bool:
+        """Return True to fail a token request."""
+        return self._roll("token_error", self.profile.token_error_rate)
+
+    def truncate(self) -> bool:
+        """Return True to cut a /device body short."""
+        return self._roll("truncate", self.profile.truncate_rate)
+
+    def drip(self) -> bool:
+        """Return True to send a body in small, delayed chunks."""
+        return self._roll("drip", self.profile.drip_rate)
+
+    def drop_device(self) -> bool:
+        """Return True to leave a device out of a /device response."""
+        return self._roll("missing_device", self.profile.missing_rate)
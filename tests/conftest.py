@@ -18,6 +18,10 @@ from custom_components.everhome.const import (
     CONF_TOKEN_EXPIRY,
     DOMAIN,
 )
+from custom_components.everhome.coordinator import CommandResult
+from custom_components.everhome.metrics import EverhomeMetrics
+from custom_components.everhome.tracing import NULL_TRACER
+from custom_components.everhome.watchdog import NULL_WATCHDOG
 
 
 @pytest.fixture(autouse=True)
@@ -44,6 +48,27 @@ def mock_config_entry() -> MockConfigEntry:
     )
 
 
+@pytest.fixture
+def mock_coordinator(mock_config_entry: MockConfigEntry) -> AsyncMock:
+    """Mock a coordinator without devices that polls its own account.
+
+    Platform tests override this fixture to add the devices they need.
+    """
+    coordinator = AsyncMock()
+    coordinator.entry = mock_config_entry
+    coordinator.data = {}
+    coordinator.last_update_success = True
+    coordinator.stale_since = None
+    coordinator.leader = None
+    coordinator.budget = None
+    coordinator.metrics = EverhomeMetrics()
+    coordinator.tracer = NULL_TRACER
+    coordinator.watchdog = NULL_WATCHDOG
+    coordinator.execute_device_action = AsyncMock(return_value=CommandResult(True, 200))
+    coordinator.async_request_refresh = AsyncMock()
+    return coordinator
+
+
 @pytest.fixture
 def mock_oauth_config() -> Dict[str, Any]:
     """Mock OAuth configuration."""
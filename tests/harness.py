@@ -0,0 +1,362 @@
+"""Run the integration against the local cloud simulator."""
+
+from __future__ import annotations
+
+import asyncio
+import gc
+import time
+import tracemalloc
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Any, cast
+
+import aiohttp
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.everhome import binary_sensor, cover, light, switch
+from custom_components.everhome.api import EverhomeAuth
+from custom_components.everhome.const import (
+    COVER_SUBTYPES,
+    DOMAIN,
+    UPDATE_INTERVAL,
+)
+from custom_components.everhome.coordinator import EverhomeDataUpdateCoordinator
+from custom_components.everhome.cover import EverhomeCover
+from custom_components.everhome.entity import EverhomeEntity
+from custom_components.everhome.scheduler import async_get_scheduler
+
+from .chaos import ChaosProfile
+from .simulator import (
+    EverhomeSimulator,
+    SimulatorAuth,
+    build_population,
+)
+
+# Device platforms, in the order the integration forwards them
+DEVICE_PLATFORMS = (cover, binary_sensor, light, switch)
+
+
+@asynccontextmanager
+async def async_simulated_coordinator(
+    hass: HomeAssistant,
+    simulator: EverhomeSimulator,
+    options: dict[str, Any] | None = None,
+) -> AsyncIterator[EverhomeDataUpdateCoordinator]:
+    """Serve the simulator and yield a coordinator polling it."""
+    base_url = await simulator.start()
+    entry = MockConfigEntry(domain=DOMAIN, options=options or {})
+    try:
+        async with aiohttp.ClientSession() as session:
+            auth = SimulatorAuth(session, base_url, simulator.clock)
+            coordinator = EverhomeDataUpdateCoordinator(
+                hass, cast(EverhomeAuth, auth), entry, base_url=base_url
+            )
+            hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
+            try:
+                yield coordinator
+            finally:
+                hass.data[DOMAIN].pop(entry.entry_id)
+    finally:
+        await simulator.stop()
+
+
+async def async_attach_entities(
+    hass: HomeAssistant, coordinator: EverhomeDataUpdateCoordinator
+) -> list[EverhomeEntity]:
+    """Create the device entities and subscribe them to the coordinator.
+
+    State writes are counted by the coordinator's metrics but do not reach
+    the state machine.
+    """
+    entities: list[EverhomeEntity] = []
+    for platform in DEVICE_PLATFORMS:
+        await platform.async_setup_entry(
+            hass, coordinator.entry, lambda new, *_: entities.extend(new)
+        )
+    for index, entity in enumerate(entities):
+        entity.hass = hass
+        entity.entity_id = f"everhome.entity_{index}"
+        entity.async_write_ha_state = lambda: None  # type: ignore[method-assign]
+        entity._last_state_key = entity._state_key()
+        coordinator.async_add_listener(entity._handle_coordinator_update)
+    return entities
+
+
+@dataclass
+class ChaosReport:
+    """What a chaos profile did to the coordinator."""
+
+    profile: str
+    entities: int
+    polls: int = 0
+    commands: int = 0
+    failed_commands: int = 0
+    requests: int = 0
+    failed_polls: int = 0
+    stale_polls: int = 0
+    state_writes: int = 0
+    peak_writes: int = 0
+    recovery_time: float | None = None
+    injected: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def amplification(self) -> float:
+        """Return the requests made per poll or command."""
+        return self.requests / (self.polls + self.commands)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the report as a dict."""
+        return {**asdict(self), "amplification": round(self.amplification, 3)}
+
+
+async def async_run_chaos_profile(
+    hass: HomeAssistant,
+    profile: ChaosProfile,
+    advance: Callable[[float], Any],
+    devices: int = 40,
+    fault_polls: int = 24,
+    recovery_polls: int = 4,
+    command_every: int = 4,
+    seed: int = 0,
+) -> ChaosReport:
+    """Poll and command a simulated account while a profile injects faults.
+
+    advance moves the virtual clock shared by the coordinator and the
+    simulator. After the first healthy poll the faults stay active for
+    fault_polls polls, with a cover command every command_every polls, and
+    the run then measures how long the coordinator needs to serve a fresh
+    and complete snapshot again.
+    """
+    simulator = EverhomeSimulator(
+        build_population(devices, unsupported=devices // 4, seed=seed),
+        clock=lambda: time.monotonic(),
+        seed=seed,
+        chaos=profile,
+        time_scale=0,
+        token_lifetime=UPDATE_INTERVAL * 4,
+    )
+    chaos = simulator.chaos
+    assert chaos is not None
+    chaos.active = False
+    covers = [
+        device.id
+        for device in simulator.devices.values()
+        if device.subtype in COVER_SUBTYPES
+    ]
+
+    async with async_simulated_coordinator(hass, simulator) as coordinator:
+        await coordinator.async_refresh()
+        expected = set(coordinator.data)
+        entities = await async_attach_entities(hass, coordinator)
+        report = ChaosReport(profile.name, len(entities))
+        metrics = coordinator.metrics
+        writes = metrics.state_writes
+        simulator.requests.clear()
+
+        async def poll() -> None:
+            before = metrics.state_writes
+            advance(UPDATE_INTERVAL)
+            await coordinator.async_refresh()
+            report.polls += 1
+            report.peak_writes = max(report.peak_writes, metrics.state_writes - before)
+            if not coordinator.last_update_success:
+                report.failed_polls += 1
+            elif coordinator.stale:
+                report.stale_polls += 1
+
+        chaos.active = True
+        for index in range(fault_polls):
+            if index % command_every == 0:
+                action = "down" if index % (2 * command_every) else "up"
+                report.commands += 1
+                try:
+                    ok = await coordinator.execute_device_action(
+                        covers[index % len(covers)], action
+                    )
+                except aiohttp.ClientError:
+                    # A failed token refresh reaches the caller
+                    ok = False
+                if not ok:
+                    report.failed_commands += 1
+            await poll()
+
+        chaos.active = False
+        fault_end = time.monotonic()
+        for _ in range(recovery_polls):
+            await poll()
+            if (
+                coordinator.last_update_success
+                and not coordinator.stale
+                and set(coordinator.data) == expected
+            ):
+                report.recovery_time = time.monotonic() - fault_end
+                break
+
+        report.requests = sum(simulator.requests.values())
+        report.state_writes = metrics.state_writes - writes
+        report.injected = dict(chaos.injected)
+    return report
+
+
+@dataclass
+class SoakSample:
+    """Resources in use at one point of a soak run."""
+
+    elapsed: float
+    # Requests and mean wall seconds per poll since the previous sample
+    requests: int
+    latency: float | None
+    # Traced bytes, when tracemalloc is tracing
+    memory: int | None
+    timers: int
+    tasks: int
+
+
+@dataclass
+class SoakReport:
+    """Resource usage of a coordinator sampled over a long run."""
+
+    polls: int = 0
+    commands: int = 0
+    samples: list[SoakSample] = field(default_factory=list)
+
+    def series(self, name: str) -> list[float]:
+        """Return the recorded values of one resource."""
+        values = (getattr(sample, name) for sample in self.samples)
+        return [value for value in values if value is not None]
+
+    def growing(self, tolerance: float = 0.02) -> list[str]:
+        """Return the resources whose series never decreases and ends higher.
+
+        The last sample has to exceed the first by more than tolerance, a
+        fraction of the first sample, since a jittered poll landing on
+        either side of a sample shifts the counts slightly.
+        """
+        growing = []
+        for name in ("requests", "latency", "memory", "timers", "tasks"):
+            values = self.series(name)
+            if (
+                len(values) > 2
+                and values[-1] > values[0] * (1 + tolerance)
+                and all(a <= b for a, b in zip(values, values[1:]))
+            ):
+                growing.append(name)
+        return growing
+
+
+def _wall_clock() -> float:
+    """Return seconds of a clock freezegun leaves running."""
+    return time.clock_gettime(time.CLOCK_MONOTONIC)
+
+
+def _traced_memory() -> int | None:
+    """Return the traced bytes, leaving out the report's own samples."""
+    if not tracemalloc.is_tracing():
+        return None
+    snapshot = tracemalloc.take_snapshot().filter_traces(
+        [tracemalloc.Filter(False, __file__)]
+    )
+    return sum(stat.size for stat in snapshot.statistics("filename"))
+
+
+def _active_timers(hass: HomeAssistant) -> int:
+    """Return the number of timers scheduled on the event loop."""
+    scheduled: list[asyncio.TimerHandle] = getattr(hass.loop, "_scheduled")
+    return sum(not handle.cancelled() for handle in scheduled)
+
+
+async def async_run_soak(
+    hass: HomeAssistant,
+    advance: Callable[[float], Any],
+    days: float,
+    devices: int = 20,
+    step: float = 60,
+    sample_every: float = 86400,
+    command_every: float = 3600,
+) -> SoakReport:
+    """Poll and command a simulated account for days of virtual time.
+
+    The domain's poll scheduler drives the polls through Home Assistant's
+    timers while advance moves the virtual clock step seconds at a time,
+    and a cover is moved every command_every seconds through its entity.
+    The first sample is taken once the run has warmed up for one
+    sample_every period.
+    """
+    simulator = EverhomeSimulator(
+        build_population(devices),
+        clock=lambda: time.monotonic(),
+        time_scale=0,
+        token_lifetime=UPDATE_INTERVAL * 12,
+    )
+    report = SoakReport()
+
+    async with async_simulated_coordinator(hass, simulator) as coordinator:
+        await coordinator.async_refresh()
+        covers = [
+            entity
+            for entity in await async_attach_entities(hass, coordinator)
+            if isinstance(entity, EverhomeCover)
+            and entity.device_data.get("subtype") in COVER_SUBTYPES
+        ]
+        remove = async_get_scheduler(hass).async_add(coordinator)
+        metrics = coordinator.metrics
+        polls = metrics.polls
+        poll_time = 0.0
+        elapsed = 0.0
+        # Warm up the caches a snapshot fills, so they are not sampled
+        _traced_memory()
+
+        try:
+            while elapsed < days * 86400:
+                advance(step)
+                elapsed += step
+                before = metrics.polls
+                start = _wall_clock()
+                async_fire_time_changed(hass)
+                await hass.async_block_till_done()
+                # Scheduled polls run as background tasks
+                await asyncio.gather(
+                    *(
+                        task
+                        for task in asyncio.all_tasks()
+                        if task.get_name().startswith("everhome poll")
+                    )
+                )
+                if metrics.polls > before:
+                    poll_time += _wall_clock() - start
+
+                if elapsed % command_every < step:
+                    cover = covers[report.commands % len(covers)]
+                    if report.commands % 2:
+                        await cover.async_close_cover()
+                    else:
+                        await cover.async_open_cover()
+                    report.commands += 1
+
+                if elapsed % sample_every < step:
+                    new_polls = metrics.polls - polls
+                    report.polls += new_polls
+                    if elapsed >= 2 * sample_every:
+                        gc.collect()
+                        report.samples.append(
+                            SoakSample(
+                                elapsed=elapsed,
+                                requests=sum(simulator.requests.values()),
+                                latency=poll_time / new_polls if new_polls else None,
+                                memory=_traced_memory(),
+                                timers=_active_timers(hass),
+                                tasks=len(asyncio.all_tasks()),
+                            )
+                        )
+                    simulator.requests.clear()
+                    polls = metrics.polls
+                    poll_time = 0.0
+        finally:
+            remove()
+            await coordinator.async_shutdown()
+    return report
@@ -0,0 +1,507 @@
+"""Local stand-in for the Everhome cloud.
+
+Serves the endpoints the integration uses (``/oauth2/token``, ``/device``,
+``/device/{id}`` and ``/device/{id}/execute``) from an in-memory device
+population, so the real HTTP path can be exercised at scale. Covers travel
+over time after a command, every request can be delayed to mimic a slow
+cloud and a chaos profile injects faults. To run Home Assistant against a
+simulator, start it with::
+
+    python -m tests.simulator --devices 500 --port 8765
+
+and set ``EVERHOME_API_BASE_URL=http://127.0.0.1:8765`` before starting
+Home Assistant.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import secrets
+import time
+from collections import Counter
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+import aiohttp
+from aiohttp import web
+
+from custom_components.everhome.const import (
+    ACTION_CLOSE,
+    ACTION_OPEN,
+    ACTION_STOP,
+    API_DEVICE_DETAIL_URL,
+    API_DEVICE_EXECUTE_URL,
+    API_DEVICE_URL,
+    API_TOKEN_URL,
+    BINARY_SENSOR_SUBTYPES,
+    COVER_SUBTYPES,
+    LIGHT_SUBTYPES,
+    STATE_CLOSING,
+    STATE_OPENING,
+    STATE_STOPPED,
+    SUPPORTED_SUBTYPES,
+)
+
+from .chaos import PROFILES, ChaosInjector, ChaosProfile
+
+# Percent of travel a cover moves per second
+COVER_SPEED = 5.0
+
+# Seconds an issued access token stays valid
+TOKEN_LIFETIME = 3600
+
+# Subtypes the integration ignores, mixed in to exercise filtering
+UNSUPPORTED_SUBTYPES = ("gateway", "meter", "thermostat", "camera")
+
+# Seconds before expiry a token is refreshed, as Home Assistant's
+# OAuth2Session does
+TOKEN_REFRESH_MARGIN = 20
+
+_CONTACT_SUBTYPES = {"door", "window"}
+
+
+@dataclass
+class SimulatedDevice:
+    """A device of the simulated account."""
+
+    id: str
+    name: str
+    subtype: str
+    states: dict[str, Any] = field(default_factory=dict)
+    position: float | None = None
+    capabilities: list[str] = field(default_factory=list)
+    model: str = "Simulated"
+    firmware_version: str = "1.0.0"
+    # Position a moving cover travels to and when it was last advanced
+    target: float | None = None
+    moved_at: float = 0.0
+
+    def advance(self, now: float) -> None:
+        """Move a travelling cover up to the given time."""
+        if self.target is None or self.position is None:
+            return
+        step = COVER_SPEED * (now - self.moved_at)
+        self.moved_at = now
+        distance = self.target - self.position
+        if abs(distance) > step:
+            self.position += step if distance > 0 else -step
+            return
+        self.position = self.target
+        self.target = None
+        self.states["general"] = _resting_state(self.position)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the device the way the API reports it."""
+        device: dict[str, Any] = {
+            "id": self.id,
+            "name": self.name,
+            "subtype": self.subtype,
+            "model": self.model,
+            "firmware_version": self.firmware_version,
+            "states": dict(self.states),
+            "capabilities": list(self.capabilities),
+        }
+        if self.position is not None:
+            device["position"] = round(self.position)
+        return device
+
+    def execute(self, action: str, params: dict[str, Any], now: float) -> bool:
+        """Apply a command, returning False if the device does not support it."""
+        if self.subtype in COVER_SUBTYPES:
+            return self._execute_cover(action, params, now)
+        if self.subtype in BINARY_SENSOR_SUBTYPES:
+            return False
+        if action in ("on", "off"):
+            self.states["general"] = action
+            return True
+        if action == "set_brightness" and "set_brightness" in self.capabilities:
+            self.states["brightness"] = int(params.get("brightness", 0))
+            self.states["general"] = "on" if self.states["brightness"] else "off"
+            return True
+        return False
+
+    def _execute_cover(self, action: str, params: dict[str, Any], now: float) -> bool:
+        self.advance(now)
+        if action == ACTION_STOP:
+            self.target = None
+            if self.position is not None:
+                self.states["general"] = _resting_state(self.position)
+            return True
+        if action == ACTION_OPEN:
+            target = 100.0
+        elif action == ACTION_CLOSE:
+            target = 0.0
+        elif action == "set_position" and "set_position" in self.capabilities:
+            target = float(max(0, min(100, int(params.get("position", 0)))))
+        else:
+            return False
+
+        if self.position is None:
+            # Covers without position feedback report the final state at once
+            self.states["general"] = action
+            return True
+        if target != self.position:
+            self.target = target
+            self.moved_at = now
+            self.states["general"] = (
+                STATE_OPENING if target > self.position else STATE_CLOSING
+            )
+        return True
+
+
+def _resting_state(position: float) -> str:
+    """Return the general state of a cover standing at a position."""
+    if position >= 100:
+        return ACTION_OPEN
+    if position <= 0:
+        return ACTION_CLOSE
+    return STATE_STOPPED
+
+
+def build_population(
+    count: int,
+    subtypes: Iterable[str] = tuple(sorted(SUPPORTED_SUBTYPES)),
+    unsupported: int = 0,
+    seed: int = 0,
+) -> list[SimulatedDevice]:
+    """Build count supported devices spread evenly across the subtypes.
+
+    A further unsupported devices of subtypes the integration ignores are
+    mixed in, as real accounts contain gateways, meters and the like.
+    """
+    rng = random.Random(seed)
+    devices: list[SimulatedDevice] = []
+    plan = itertools.chain(
+        itertools.islice(itertools.cycle(subtypes), count),
+        itertools.islice(itertools.cycle(UNSUPPORTED_SUBTYPES), unsupported),
+    )
+    for index, subtype in enumerate(plan):
+        devices.append(_build_device(f"{subtype}_{index:05d}", subtype, rng))
+    rng.shuffle(devices)
+    return devices
+
+
+def _build_device(device_id: str, subtype: str, rng: random.Random) -> SimulatedDevice:
+    """Build one device with a plausible initial state."""
+    device = SimulatedDevice(
+        id=device_id,
+        name=f"{subtype.title()} {device_id.rsplit('_', 1)[1]}",
+        subtype=subtype,
+        model=f"Simulated {subtype.title()}",
+        firmware_version=f"1.{rng.randint(0, 9)}.{rng.randint(0, 9)}",
+    )
+    if subtype in COVER_SUBTYPES:
+        device.capabilities = [ACTION_OPEN, ACTION_CLOSE, ACTION_STOP]
+        if subtype != "garagedoor":
+            device.capabilities.append("set_position")
+            device.position = float(rng.choice((0, 100)))
+            device.states["general"] = _resting_state(device.position)
+        else:
+            device.states["general"] = rng.choice((ACTION_OPEN, ACTION_CLOSE))
+    elif subtype in _CONTACT_SUBTYPES:
+        device.states = {
+            "state": rng.choice(("open", "closed")),
+            "batteryboolean": "battery-ok",
+        }
+    elif subtype in BINARY_SENSOR_SUBTYPES:
+        device.states = {
+            "general": "off",
+            "batterypercentage": str(rng.randint(20, 100)),
+        }
+    elif subtype in LIGHT_SUBTYPES:
+        device.capabilities = ["on", "off"]
+        device.states["general"] = rng.choice(("on", "off"))
+        if rng.random() < 0.5:
+            device.capabilities.append("set_brightness")
+            device.states["brightness"] = rng.randint(0, 100)
+    elif subtype in SUPPORTED_SUBTYPES:
+        device.capabilities = ["on", "off"]
+        device.states["general"] = rng.choice(("on", "off"))
+    else:
+        device.states["general"] = "online"
+    return device
+
+
+class EverhomeSimulator:
+    """Serve a simulated Everhome account over HTTP."""
+
+    def __init__(
+        self,
+        devices: Iterable[SimulatedDevice] = (),
+        latency: float = 0.0,
+        latency_jitter: float = 0.0,
+        clock: Callable[[], float] = time.monotonic,
+        seed: int = 0,
+        chaos: ChaosProfile | None = None,
+        time_scale: float = 1.0,
+        token_lifetime: float = TOKEN_LIFETIME,
+    ) -> None:
+        """Initialize the simulator.
+
+        Every request is delayed by latency plus up to latency_jitter
+        seconds. Delays actually waited are scaled by time_scale, so runs
+        on a virtual clock can skip them while still accounting for them.
+        """
+        self.devices = {device.id: device for device in devices}
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.clock = clock
+        self.time_scale = time_scale
+        self.token_lifetime = token_lifetime
+        self.chaos = ChaosInjector(chaos, seed) if chaos is not None else None
+        self.requests: Counter[str] = Counter()
+        # Status and devices of a recorded /device response to serve instead
+        # of the population, and the status to answer commands with
+        self.recorded_response: tuple[int, list[dict[str, Any]] | None] | None = None
+        self.recorded_command_status: int | None = None
+        # Seconds of delay added to responses, before scaling
+        self.delayed = 0.0
+        self._rng = random.Random(seed)
+        self._tokens: dict[str, float] = {}
+        self._runner: web.AppRunner | None = None
+        self.base_url: str | None = None
+
+        self.app = web.Application(middlewares=[self._middleware])
+        self.app.router.add_post(API_TOKEN_URL, self._handle_token)
+        self.app.router.add_get(API_DEVICE_URL, self._handle_devices)
+        self.app.router.add_get(API_DEVICE_DETAIL_URL, self._handle_device)
+        self.app.router.add_post(API_DEVICE_EXECUTE_URL, self._handle_execute)
+
+    def issue_token(self) -> str:
+        """Issue an access token, e.g. for a client that skips OAuth."""
+        now = self.clock()
+        # Forget expired tokens so long runs do not accumulate them
+        self._tokens = {
+            token: expiry for token, expiry in self._tokens.items() if expiry > now
+        }
+        token = secrets.token_hex(16)
+        self._tokens[token] = now + self.token_lifetime
+        return token
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start serving and return the base URL."""
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound_host, bound_port = self._runner.addresses[0][:2]
+        self.base_url = f"http://{bound_host}:{bound_port}"
+        return self.base_url
+
+    async def stop(self) -> None:
+        """Stop serving."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    @web.middleware
+    async def _middleware(
+        self,
+        request: web.Request,
+        handler: Callable[[web.Request], Any],
+    ) -> web.StreamResponse:
+        """Count and delay every request, injecting faults."""
+        route = request.match_info.route.resource
+        path = route.canonical if route is not None else request.path
+        self.requests[f"{request.method} {path}"] += 1
+        delay = self.latency + self._rng.uniform(0, self.latency_jitter)
+        if self.chaos is not None:
+            delay += self.chaos.delay()
+        await self._sleep(delay)
+
+        if self.chaos is not None:
+            if path == API_TOKEN_URL:
+                if self.chaos.token_error():
+                    return web.json_response({"error": "server_error"}, status=500)
+            elif (error := self.chaos.error()) is not None:
+                status, headers = error
+                return web.json_response(
+                    {"error": "injected"}, status=status, headers=headers
+                )
+        response: web.StreamResponse = await handler(request)
+        return response
+
+    async def _sleep(self, seconds: float) -> None:
+        """Delay a response, scaled to the run's time."""
+        if seconds <= 0:
+            return
+        self.delayed += seconds
+        if self.time_scale > 0:
+            await asyncio.sleep(seconds * self.time_scale)
+
+    async def _respond(
+        self, request: web.Request, payload: Any, truncate: bool = False
+    ) -> web.StreamResponse:
+        """Send a JSON payload, cut short or trickled in by the chaos profile."""
+        body = json.dumps(payload).encode()
+        chaos = self.chaos
+        cut = truncate and chaos is not None and chaos.truncate()
+        drip = chaos is not None and chaos.drip()
+        if not cut and not drip:
+            return web.Response(body=body, content_type="application/json")
+
+        if cut:
+            body = body[: len(body) // 2]
+        # Without a content length the cut is only visible in the JSON
+        response = web.StreamResponse()
+        response.content_type = "application/json"
+        response.enable_chunked_encoding()
+        await response.prepare(request)
+        if drip and chaos is not None:
+            size = chaos.profile.drip_chunk
+            for index in range(0, len(body), size):
+                await response.write(body[index : index + size])
+                await self._sleep(chaos.profile.drip_delay)
+        else:
+            await response.write(body)
+        await response.write_eof()
+        return response
+
+    def _authorized(self, request: web.Request) -> bool:
+        header = request.headers.get("Authorization", "")
+        token = header.removeprefix("Bearer ")
+        expiry = self._tokens.get(token)
+        return expiry is not None and expiry > self.clock()
+
+    async def _handle_token(self, request: web.Request) -> web.Response:
+        data = await request.post()
+        if data.get("grant_type") not in ("authorization_code", "refresh_token"):
+            return web.json_response({"error": "unsupported_grant_type"}, status=400)
+        return web.json_response(
+            {
+                "access_token": self.issue_token(),
+                "refresh_token": secrets.token_hex(16),
+                "token_type": "Bearer",
+                "expires_in": int(self.token_lifetime),
+            }
+        )
+
+    async def _handle_devices(self, request: web.Request) -> web.StreamResponse:
+        if not self._authorized(request):
+            return web.json_response({"error": "unauthorized"}, status=401)
+        if self.recorded_response is not None:
+            return await self._respond_recorded(request, *self.recorded_response)
+        now = self.clock()
+        devices = []
+        for device in self.devices.values():
+            device.advance(now)
+            if self.chaos is not None and self.chaos.drop_device():
+                continue
+            devices.append(device.as_dict())
+        return await self._respond(request, devices, truncate=True)
+
+    async def _respond_recorded(
+        self, request: web.Request, status: int, devices: list[dict[str, Any]] | None
+    ) -> web.StreamResponse:
+        """Replay a recorded /device response."""
+        if status != 200:
+            return web.json_response({"error": "recorded"}, status=status)
+        if devices is None:
+            # The recorded body could not be decoded
+            return web.Response(body=b"[", content_type="application/json")
+        return await self._respond(request, devices, truncate=True)
+
+    async def _handle_device(self, request: web.Request) -> web.StreamResponse:
+        if not self._authorized(request):
+            return web.json_response({"error": "unauthorized"}, status=401)
+        device = self.devices.get(request.match_info["device_id"])
+        if device is None:
+            return web.json_response({"error": "not found"}, status=404)
+        device.advance(self.clock())
+        return await self._respond(request, device.as_dict())
+
+    async def _handle_execute(self, request: web.Request) -> web.Response:
+        if not self._authorized(request):
+            return web.json_response({"error": "unauthorized"}, status=401)
+        if (status := self.recorded_command_status) is not None:
+            if status >= 400:
+                return web.json_response({"error": "recorded"}, status=status)
+            return web.json_response({"success": True}, status=status)
+        device = self.devices.get(request.match_info["device_id"])
+        if device is None:
+            return web.json_response({"error": "not found"}, status=404)
+        try:
+            params = await request.json()
+        except ValueError:
+            params = None
+        if not isinstance(params, dict):
+            return web.json_response({"error": "invalid body"}, status=400)
+        action = params.pop("action", None)
+        if not device.execute(str(action), params, self.clock()):
+            return web.json_response({"error": "unsupported action"}, status=400)
+        return web.json_response({"success": True, "device": device.as_dict()})
+
+
+class SimulatorAuth:
+    """EverhomeAuth stand-in refreshing its token at the simulator."""
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        base_url: str,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the auth."""
+        self.aiohttp_session = session
+        self._base_url = base_url
+        self._clock = clock
+        self._token: str | None = None
+        self._expiry = 0.0
+        self.token_refreshes = 0
+
+    async def async_get_access_token(self) -> str:
+        """Return a valid access token, refreshing it when it expires."""
+        if self._token is None or self._clock() >= self._expiry:
+            async with self.aiohttp_session.post(
+                f"{self._base_url}{API_TOKEN_URL}",
+                data={"grant_type": "refresh_token", "refresh_token": "simulated"},
+            ) as resp:
+                resp.raise_for_status()
+                token = await resp.json()
+            if self._token is not None:
+                self.token_refreshes += 1
+            self._token = token["access_token"]
+            self._expiry = self._clock() + token["expires_in"] - TOKEN_REFRESH_MARGIN
+        return self._token
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    simulator = EverhomeSimulator(
+        build_population(args.devices, unsupported=args.unsupported, seed=args.seed),
+        latency=args.latency,
+        latency_jitter=args.jitter,
+        seed=args.seed,
+        chaos=PROFILES[args.profile] if args.profile else None,
+    )
+    url = await simulator.start(args.host, args.port)
+    print(f"Simulating {args.devices} devices at {url}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await simulator.stop()
+
+
+def main() -> None:
+    """Run a simulator until interrupted."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--devices", type=int, default=50)
+    parser.add_argument("--unsupported", type=int, default=0)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--profile", choices=sorted(PROFILES))
+    try:
+        asyncio.run(_serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
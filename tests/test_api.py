@@ -201,3 +201,16 @@ class TestEverhomeAuth:
 
         assert token == refreshed_token
         mock_oauth_session.async_ensure_token_valid.assert_called_once()
+
+    async def test_token_refresh_counted(self, everhome_auth, mock_oauth_session):
+        """A changed access token is counted as a refresh."""
+
+        async def refresh():
+            mock_oauth_session.token = {"access_token": "new_access_token"}
+
+        mock_oauth_session.async_ensure_token_valid.side_effect = refresh
+
+        await everhome_auth.async_get_access_token()
+        await everhome_auth.async_get_access_token()
+
+        assert everhome_auth.token_refreshes == 1
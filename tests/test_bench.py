@@ -0,0 +1,115 @@
+"""Test the Everhome command line benchmark."""
+
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+
+import pytest
+
+from .bench import (
+    REPORT_VERSION,
+    build_parser,
+    main,
+    run_benchmark,
+)
+
+
+@pytest.fixture(autouse=True)
+def _sockets(socket_enabled):
+    """Allow the simulator to listen on localhost."""
+
+
+def _capture(path, *events: dict) -> str:
+    with gzip.open(path, "wt") as capture:
+        capture.write(json.dumps({"version": 1}) + "\n")
+        for event in events:
+            capture.write(json.dumps(event) + "\n")
+    return str(path)
+
+
+class TestBenchmark:
+    """Test running load against the simulator."""
+
+    async def test_simulator_load(self):
+        """Polls and commands of every account are measured."""
+        args = build_parser().parse_args(
+            [
+                "--accounts",
+                "2",
+                "--devices",
+                "20",
+                "--polls-per-minute",
+                "600",
+                "--concurrency",
+                "2",
+                "--duration",
+                "0.5",
+            ]
+        )
+
+        report = await run_benchmark(args)
+
+        assert report["version"] == REPORT_VERSION
+        assert report["config"]["accounts"] == 2
+        # Each account polls every 0.1 s
+        assert 2 <= report["polls"]["count"] <= 12
+        assert report["commands"]["count"] > 0
+        assert report["commands"]["errors"] == 0
+        assert report["requests"] >= report["polls"]["count"]
+        assert report["polls"]["latency_ms"]["p50"] > 0
+        assert report["loop_lag_ms"]["max"] is not None
+
+    async def test_capture_load(self, tmp_path):
+        """Recorded responses are served in turn, failures included."""
+        path = _capture(
+            tmp_path / "capture.jsonl.gz",
+            {
+                "offset": 0,
+                "kind": "devices",
+                "status": 200,
+                "devices": [
+                    {"id": "device_1", "subtype": "shutter", "name": "x"},
+                    {"id": "device_2", "subtype": "gateway", "name": "y"},
+                ],
+            },
+            {"offset": 1, "kind": "devices", "status": 503},
+        )
+        args = build_parser().parse_args(
+            [
+                "--capture",
+                path,
+                "--polls-per-minute",
+                "1200",
+                "--concurrency",
+                "1",
+                "--duration",
+                "0.3",
+            ]
+        )
+
+        report = await run_benchmark(args)
+
+        polls = report["polls"]
+        # The warm-up poll took the first response, so failures come first
+        assert polls["errors"] == (polls["count"] + 1) // 2
+        assert report["commands"]["count"] > 0
+        assert report["commands"]["error_rate"] == 0.0
+
+
+def test_main_writes_report(tmp_path, capsys):
+    """The command line prints a summary and writes the JSON report."""
+    path = tmp_path / "report.json"
+    logger = logging.getLogger("custom_components.everhome")
+    level = logger.level
+
+    try:
+        main(["--devices", "10", "--duration", "0.2", "--report", str(path)])
+    finally:
+        # The command line quiets the integration's loggers
+        logger.setLevel(level)
+
+    report = json.loads(path.read_text())
+    assert report["polls"]["count"] == 1
+    assert "loop lag" in capsys.readouterr().out
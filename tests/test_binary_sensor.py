@@ -2,8 +2,6 @@
 
 from __future__ import annotations
 
-from unittest.mock import AsyncMock
-
 import pytest
 from homeassistant.components.binary_sensor import BinarySensorDeviceClass
 from homeassistant.core import HomeAssistant
@@ -19,11 +17,9 @@ class TestEverhomeBinarySensor:
     """Test Everhome binary sensor entity."""
 
     @pytest.fixture
-    def mock_coordinator(self, mock_config_entry):
+    def mock_coordinator(self, mock_coordinator):
         """Mock coordinator with a mixed set of device data."""
-        coordinator = AsyncMock()
-        coordinator.entry = mock_config_entry
-        coordinator.data = {
+        mock_coordinator.data = {
             "door_001": {
                 "id": "door_001",
                 "name": "Front Door",
@@ -62,7 +58,7 @@ class TestEverhomeBinarySensor:
                 "states": {"general": "down"},
             },
         }
-        return coordinator
+        return mock_coordinator
 
     # ------------------------------------------------------------------
     # async_setup_entry
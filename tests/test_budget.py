@@ -0,0 +1,81 @@
+"""Test the Everhome request budget planner."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+
+import pytest
+
+from custom_components.everhome.budget import RequestBudget
+
+
+class TestRequestBudget:
+    """Test budget tracking and poll interval planning."""
+
+    def test_spending(self, freezer):
+        """Requests count against the budget until they leave the window."""
+        budget = RequestBudget(100, 3600)
+
+        for _ in range(10):
+            budget.spend()
+        assert budget.spent == 10
+        assert budget.remaining == 90
+
+        freezer.tick(timedelta(seconds=3601))
+        assert budget.remaining == 100
+
+    def test_poll_interval_keeps_reserve(self):
+        """Polls share the budget left after the command reserve."""
+        budget = RequestBudget(1000, 86400)
+
+        # 10 % (100 requests) are kept for commands
+        assert budget.reserve == 100
+        assert budget.poll_interval(60) == pytest.approx(86400 / 900)
+        # Never faster than the minimum interval
+        assert budget.poll_interval(300) == 300
+        assert RequestBudget(100, 86400).poll_interval(300) == pytest.approx(960)
+
+    def test_commands_beyond_reserve_slow_polling(self):
+        """Commands exceeding the reserve come out of the polling share."""
+        budget = RequestBudget(100, 86400)
+        for _ in range(40):
+            budget.spend(command=True)
+
+        assert budget.poll_interval(300) == pytest.approx(86400 / 60)
+
+    def test_background_requests_slow_polling(self):
+        """Planned background requests come out of the polling share."""
+        budget = RequestBudget(1000, 3600)
+
+        assert budget.poll_interval(1, background=600) == pytest.approx(3600 / 300)
+        assert budget.poll_interval(1, background=1000) == 3600
+
+    def test_allows_keeps_reserve(self):
+        """Background requests may not use the command reserve."""
+        budget = RequestBudget(100, 3600)
+        for _ in range(85):
+            budget.spend()
+
+        assert budget.allows(5)
+        assert not budget.allows(6)
+
+    def test_exhausted_budget(self):
+        """Without room for polls the interval is the whole period."""
+        budget = RequestBudget(10, 3600, reserve=1.0)
+
+        assert budget.poll_interval(300) == 3600
+
+    def test_exhaustion_projection(self, freezer):
+        """The projection is only given when the rate exceeds the budget."""
+        budget = RequestBudget(100, 3600)
+        assert budget.exhausted_in() is None
+
+        freezer.tick(timedelta(seconds=60))
+        for _ in range(10):
+            budget.spend()
+        # 10 requests per minute would need 600 per hour
+        assert budget.exhausted_in() == pytest.approx(90 / (10 / 60))
+
+        freezer.tick(timedelta(seconds=3540))
+        budget.spend()
+        assert budget.exhausted_in() is None
@@ -0,0 +1,229 @@
+"""Test recording and replaying Everhome traffic."""
+
+from __future__ import annotations
+
+import glob
+import gzip
+import os
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.everhome.capture import (
+    EVENT_COMMAND,
+    EVENT_DEVICES,
+    REDACTED,
+    CaptureEvent,
+    CaptureRecorder,
+    async_create_recorder,
+    redact,
+)
+from custom_components.everhome.const import COVER_SUBTYPES
+
+from .harness import async_attach_entities, async_simulated_coordinator
+from .replay import CaptureReplay, read_capture
+from .simulator import EverhomeSimulator, build_population
+
+
+class TestRedact:
+    """Test removing identifying values from payloads."""
+
+    def test_names_and_ids_are_replaced(self):
+        """Names are redacted and ids mapped to stable pseudonyms."""
+        pseudonyms: dict[str, str] = {}
+        payload = [
+            {
+                "id": "abc",
+                "name": "Kitchen",
+                "subtype": "shutter",
+                "states": {"general": "up", "room": "Ground floor"},
+                "gateway_id": 17,
+            },
+            {"id": "def", "name": "Hall", "subtype": "light"},
+        ]
+
+        redacted = redact(payload, pseudonyms)
+
+        assert redacted == [
+            {
+                "id": "device_1",
+                "name": REDACTED,
+                "subtype": "shutter",
+                "states": {"general": "up", "room": REDACTED},
+                "gateway_id": "device_2",
+            },
+            {"id": "device_3", "name": REDACTED, "subtype": "light"},
+        ]
+        # The same id keeps its pseudonym
+        assert redact({"id": "abc"}, pseudonyms) == {"id": "device_1"}
+        assert payload[0]["name"] == "Kitchen"
+
+
+class TestCaptureRecorder:
+    """Test recording polls and commands of a coordinator."""
+
+    @pytest.fixture(autouse=True)
+    def _sockets(self, socket_enabled):
+        """Allow the simulator to listen on localhost."""
+
+    async def test_records_redacted_traffic(self, hass: HomeAssistant, tmp_path):
+        """Responses and commands are written without names or ids."""
+        simulator = EverhomeSimulator(build_population(12, unsupported=3))
+        path = str(tmp_path / "capture.jsonl.gz")
+        async with async_simulated_coordinator(hass, simulator) as coordinator:
+            coordinator.recorder = CaptureRecorder(path)
+            await coordinator.async_refresh()
+            cover = next(
+                device
+                for device in simulator.devices.values()
+                if device.subtype in COVER_SUBTYPES
+            )
+            assert await coordinator.execute_device_action(cover.id, "down")
+            await coordinator.async_refresh()
+            await coordinator.recorder.async_stop(hass)
+
+        events = await hass.async_add_executor_job(read_capture, path)
+        with gzip.open(path, "rt") as capture:
+            text = capture.read()
+
+        assert [event.kind for event in events] == [
+            EVENT_DEVICES,
+            EVENT_COMMAND,
+            EVENT_DEVICES,
+        ]
+        polled = events[0].devices
+        assert polled is not None
+        # Unsupported devices are recorded too
+        assert len(polled) == 15
+        assert {device["name"] for device in polled} == {REDACTED}
+        command = events[1]
+        assert command.action == "down"
+        assert command.status == 200
+        assert command.device_id in {device["id"] for device in polled}
+        assert 0 <= events[0].offset <= events[2].offset
+        for device in simulator.devices.values():
+            assert device.id not in text
+            assert device.name not in text
+
+    async def test_failed_poll_is_recorded(self, hass: HomeAssistant, tmp_path):
+        """An error response is recorded with its status and no devices."""
+        simulator = EverhomeSimulator(build_population(4))
+        simulator.recorded_response = (503, None)
+        path = str(tmp_path / "capture.jsonl.gz")
+        async with async_simulated_coordinator(hass, simulator) as coordinator:
+            coordinator.recorder = CaptureRecorder(path)
+            await coordinator.async_refresh()
+            await coordinator.recorder.async_stop(hass)
+
+        events = await hass.async_add_executor_job(read_capture, path)
+
+        assert events == [CaptureEvent(events[0].offset, EVENT_DEVICES, 503)]
+
+    async def test_async_create_recorder(self, hass: HomeAssistant):
+        """The created recorder writes to the config directory."""
+        recorder = await async_create_recorder(hass, "entry_1")
+        recorder.record_command("device", "up", None, 200)
+        await recorder.async_stop(hass)
+
+        paths = glob.glob(hass.config.path("everhome_capture_entry_1_*.jsonl.gz"))
+        events = await hass.async_add_executor_job(read_capture, paths[0])
+        for path in paths:
+            os.remove(path)
+
+        assert len(paths) == 1
+        assert events[0].device_id == "device_1"
+
+    async def test_async_stop_closes_off_the_loop(self, hass: HomeAssistant, tmp_path):
+        """Stopping waits for the writer thread in the executor."""
+        recorder = CaptureRecorder(str(tmp_path / "capture.jsonl.gz"))
+        recorder.record_command("device", "up", None, 200)
+
+        with patch.object(
+            hass, "async_add_executor_job", wraps=hass.async_add_executor_job
+        ) as executor_job:
+            await recorder.async_stop(hass)
+            await recorder.async_stop(hass)
+        # Events after the stop are dropped, not submitted
+        recorder.record_command("device", "down", None, 200)
+
+        executor_job.assert_called_once()
+        events = await hass.async_add_executor_job(read_capture, recorder.path)
+        assert [event.action for event in events] == ["up"]
+
+    def test_unknown_version_is_rejected(self, tmp_path):
+        """Captures of another format version are not read."""
+        path = tmp_path / "capture.jsonl.gz"
+        with gzip.open(path, "wt") as capture:
+            capture.write('{"version": 99}\n')
+
+        with pytest.raises(ValueError):
+            read_capture(str(path))
+
+
+class TestCaptureReplay:
+    """Test replaying a capture through a coordinator."""
+
+    @pytest.fixture(autouse=True)
+    def _sockets(self, socket_enabled):
+        """Allow the simulator to listen on localhost."""
+
+    async def _record(self, hass: HomeAssistant, path: str) -> dict[str, dict]:
+        simulator = EverhomeSimulator(build_population(10, unsupported=2))
+        async with async_simulated_coordinator(hass, simulator) as coordinator:
+            coordinator.recorder = CaptureRecorder(path)
+            await coordinator.async_refresh()
+            for device in simulator.devices.values():
+                if device.subtype in COVER_SUBTYPES:
+                    await coordinator.execute_device_action(device.id, "down")
+            await coordinator.execute_device_action("unknown", "up")
+            await coordinator.async_refresh()
+            await coordinator.recorder.async_stop(hass)
+            return dict(coordinator.data)
+
+    async def test_replay_reproduces_the_recording(self, hass: HomeAssistant, tmp_path):
+        """Replaying serves the recorded devices and command outcomes."""
+        path = str(tmp_path / "capture.jsonl.gz")
+        recorded = await self._record(hass, path)
+        events = await hass.async_add_executor_job(read_capture, path)
+
+        simulator = EverhomeSimulator()
+        async with async_simulated_coordinator(hass, simulator) as coordinator:
+            first = await CaptureReplay(
+                events[:1], simulator, coordinator, speed=0
+            ).async_run()
+            entities = await async_attach_entities(hass, coordinator)
+            report = await CaptureReplay(
+                events[1:], simulator, coordinator, speed=0
+            ).async_run()
+
+        assert first.devices == [len(recorded)]
+        assert len(entities) >= len(recorded)
+        assert report.polls == 1
+        assert report.failed_polls == 0
+        assert report.devices == [len(recorded)]
+        assert report.commands == sum(event.kind == EVENT_COMMAND for event in events)
+        assert report.command_mismatches == 0
+        # The moving covers reach the entities
+        assert report.state_writes > 0
+
+    async def test_replay_keeps_the_recorded_pace(self, hass: HomeAssistant):
+        """Waits between events are the recorded gaps divided by the speed."""
+        events = [
+            CaptureEvent(10.0, EVENT_DEVICES, 503),
+            CaptureEvent(12.0, EVENT_COMMAND, 0, device_id="device_1", action="up"),
+            CaptureEvent(16.0, EVENT_DEVICES, 200, devices=[]),
+        ]
+        simulator = EverhomeSimulator()
+        async with async_simulated_coordinator(hass, simulator) as coordinator:
+            with patch("tests.replay.asyncio.sleep", AsyncMock()) as sleep:
+                report = await CaptureReplay(
+                    events, simulator, coordinator, speed=4
+                ).async_run()
+
+        assert [call.args[0] for call in sleep.await_args_list] == [0.5, 1.0]
+        assert report.duration == 6.0
+        assert report.polls == 2
+        assert report.failed_polls == 1
+        assert report.command_mismatches == 0
+        assert report.devices == [0, 0]
@@ -0,0 +1,122 @@
+"""Test the coordinator against a misbehaving simulated cloud."""
+
+from __future__ import annotations
+
+import logging
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.update_coordinator import UpdateFailed
+
+from custom_components.everhome.const import UPDATE_INTERVAL
+
+from .chaos import PROFILES, ChaosInjector, ChaosProfile
+from .harness import async_run_chaos_profile, async_simulated_coordinator
+from .simulator import EverhomeSimulator, build_population
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class TestChaosInjector:
+    """Test fault decisions."""
+
+    def test_inactive_injects_nothing(self):
+        """No fault is injected while the injector is inactive."""
+        injector = ChaosInjector(
+            ChaosProfile("all", error_rate=1, truncate_rate=1, missing_rate=1)
+        )
+        injector.active = False
+
+        assert injector.error() is None
+        assert not injector.truncate()
+        assert not injector.drop_device()
+        assert not injector.injected
+
+    def test_error_burst(self):
+        """A triggered error fails the configured number of requests in a row."""
+        injector = ChaosInjector(ChaosProfile("burst", error_rate=1, error_burst=3))
+
+        assert [injector.error() for _ in range(3)] == [(503, {})] * 3
+        assert injector.injected["error"] == 3
+
+    def test_throttle_sends_retry_after(self):
+        """Throttled requests carry a Retry-After header."""
+        injector = ChaosInjector(
+            ChaosProfile("throttle", throttle_rate=1, retry_after=30)
+        )
+
+        assert injector.error() == (429, {"Retry-After": "30"})
+
+    def test_reproducible(self):
+        """The same seed injects the same faults."""
+        profile = ChaosProfile("flaky", error_rate=0.3, missing_rate=0.3)
+        first, second = ChaosInjector(profile, 7), ChaosInjector(profile, 7)
+
+        assert [(first.error(), first.drop_device()) for _ in range(50)] == [
+            (second.error(), second.drop_device()) for _ in range(50)
+        ]
+
+
+class TestSimulatorChaos:
+    """Test faults on the wire."""
+
+    @pytest.fixture(autouse=True)
+    def _sockets(self, socket_enabled):
+        """Allow the simulator to listen on localhost."""
+
+    async def test_truncated_device_list(self, hass: HomeAssistant):
+        """A truncated /device body fails the poll."""
+        simulator = EverhomeSimulator(
+            build_population(20), chaos=ChaosProfile("cut", truncate_rate=1)
+        )
+        async with async_simulated_coordinator(hass, simulator) as coordinator:
+            with pytest.raises(UpdateFailed, match="Invalid device list"):
+                await coordinator._async_update_data()
+
+    async def test_slow_drip_device_list(self, hass: HomeAssistant):
+        """A body trickling in small chunks still parses."""
+        simulator = EverhomeSimulator(
+            build_population(20),
+            chaos=ChaosProfile("drip", drip_rate=1, drip_chunk=64),
+            time_scale=0,
+        )
+        async with async_simulated_coordinator(hass, simulator) as coordinator:
+            await coordinator.async_refresh()
+
+        assert coordinator.last_update_success
+        assert len(coordinator.data) == 20
+        assert simulator.delayed > 0
+
+    async def test_token_failure(self, hass: HomeAssistant):
+        """A failing token endpoint fails the poll without reaching /device."""
+        simulator = EverhomeSimulator(
+            build_population(20), chaos=ChaosProfile("token", token_error_rate=1)
+        )
+        async with async_simulated_coordinator(hass, simulator) as coordinator:
+            await coordinator.async_refresh()
+
+        assert not coordinator.last_update_success
+        assert simulator.requests["GET /device"] == 0
+
+
+class TestChaosProfiles:
+    """Measure recovery, request amplification and state writes per profile."""
+
+    @pytest.fixture(autouse=True)
+    def _sockets(self, socket_enabled):
+        """Allow the simulator to listen on localhost."""
+
+    @pytest.mark.parametrize("name", sorted(PROFILES))
+    async def test_profile(self, hass: HomeAssistant, freezer, name):
+        """The coordinator recovers from every profile without request storms."""
+        report = await async_run_chaos_profile(hass, PROFILES[name], freezer.tick)
+        _LOGGER.info("Chaos report: %s", report.as_dict())
+
+        assert report.recovery_time is not None
+        assert report.recovery_time <= UPDATE_INTERVAL
+        assert report.amplification <= 1.5
+        # Every entity writes at most once per poll
+        assert report.peak_writes <= report.entities
+        if not report.stale_polls:
+            # Faults that leave the snapshot fresh cause no write storms
+            assert report.state_writes <= report.entities // 4
@@ -0,0 +1,251 @@
+"""Test queueing commands while the Everhome cloud is unreachable."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import aiohttp
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.everhome.command_queue import CommandQueue, QueuedCommand
+from custom_components.everhome.const import COVER_SUBTYPES
+
+from .harness import async_simulated_coordinator
+from .simulator import EverhomeSimulator, build_population
+
+
+class _Clock:
+    """Wall clock advanced by hand."""
+
+    def __init__(self) -> None:
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _queue(hass: HomeAssistant, clock: _Clock, **kwargs: Any) -> CommandQueue:
+    return CommandQueue(
+        hass,
+        "entry_1",
+        kwargs.pop("expiry", 300),
+        flush_interval=0,
+        clock=clock,
+        **kwargs,
+    )
+
+
+class TestCommandQueue:
+    """Test the persisted command queue."""
+
+    async def test_newer_command_supersedes(self, hass: HomeAssistant):
+        """Only the last movement of a device stays queued."""
+        queue = _queue(hass, _Clock())
+
+        assert queue.async_add("shutter", "up") == (0, 0)
+        queue.async_add("light", "on")
+        assert queue.async_add("shutter", "down") == (1, 0)
+        assert queue.async_add("shutter", "set_position", {"position": 40}) == (1, 0)
+        # Other actions and devices are kept
+        queue.async_add("light", "set_brightness", {"brightness": 10})
+        queue.async_add("other", "up")
+
+        assert [(c.device_id, c.action) for c in queue.commands] == [
+            ("light", "on"),
+            ("shutter", "set_position"),
+            ("light", "set_brightness"),
+            ("other", "up"),
+        ]
+
+    async def test_full_queue_drops_oldest(self, hass: HomeAssistant):
+        """A full queue makes room by dropping its oldest command."""
+        queue = _queue(hass, _Clock(), max_size=2)
+
+        queue.async_add("a", "up")
+        queue.async_add("b", "up")
+
+        assert queue.async_add("c", "up") == (0, 1)
+        assert [c.device_id for c in queue.commands] == ["b", "c"]
+
+    async def test_flush_sends_in_order_and_drops_expired(self, hass: HomeAssistant):
+        """Expired commands are not sent, the rest are sent oldest first."""
+        clock = _Clock()
+        queue = _queue(hass, clock, expiry=60)
+        queue.async_add("a", "up")
+        clock.now += 40
+        queue.async_add("b", "down")
+        queue.async_add("c", "on")
+        clock.now += 30
+        sent: list[QueuedCommand] = []
+
+        async def send(command: QueuedCommand) -> bool:
+            sent.append(command)
+            return command.device_id != "c"
+
+        result = await queue.async_flush(send)
+
+        assert [c.device_id for c in sent] == ["b", "c"]
+        assert (result.sent, result.failed, result.expired) == (1, 1, 1)
+        assert result.remaining == 0
+        assert len(queue) == 0
+
+    async def test_flush_stops_when_unreachable(self, hass: HomeAssistant):
+        """The rest of the queue is kept when the cloud goes away again."""
+        queue = _queue(hass, _Clock())
+        for device_id in ("a", "b", "c"):
+            queue.async_add(device_id, "up")
+        answers = iter([True, None])
+
+        async def send(command: QueuedCommand) -> bool | None:
+            return next(answers)
+
+        result = await queue.async_flush(send)
+
+        assert result.sent == 1
+        assert result.remaining == 2
+        assert [c.device_id for c in queue.commands] == ["b", "c"]
+
+    async def test_queue_survives_restart(self, hass: HomeAssistant, hass_storage):
+        """Saved commands are restored, without those expired meanwhile."""
+        clock = _Clock()
+        queue = _queue(hass, clock, expiry=60)
+        queue.async_add("a", "up")
+        clock.now += 30
+        queue.async_add("b", "set_position", {"position": 20})
+        await queue.async_save()
+
+        clock.now += 45
+        restored = _queue(hass, clock, expiry=60)
+        await restored.async_load()
+
+        assert "everhome.entry_1.commands" in hass_storage
+        assert restored.commands == [
+            QueuedCommand("b", "set_position", {"position": 20}, 1_000_090.0)
+        ]
+
+
+class TestCoordinatorCommandQueue:
+    """Test the coordinator queueing commands during outages."""
+
+    @pytest.fixture(autouse=True)
+    def _sockets(self, socket_enabled):
+        """Allow the simulator to listen on localhost."""
+
+    async def test_commands_are_sent_after_recovery(self, hass: HomeAssistant):
+        """Commands issued during an outage collapse and are sent later."""
+        simulator = EverhomeSimulator(build_population(6))
+        covers = [
+            device
+            for device in simulator.devices.values()
+            if device.subtype in COVER_SUBTYPES
+        ]
+        async with async_simulated_coordinator(hass, simulator) as coordinator:
+            coordinator.command_queue = _queue(hass, _Clock())
+            await coordinator.async_refresh()
+
+            simulator.recorded_command_status = 503
+            assert not await coordinator.execute_device_action(covers[0].id, "up")
+            # Queued behind the first command without reaching the cloud
+            simulator.recorded_command_status = None
+            assert not await coordinator.execute_device_action(covers[0].id, "down")
+            await coordinator._flush_task
+            await coordinator.async_shutdown()
+            assert len(coordinator.command_queue) == 0
+
+            metrics = coordinator.metrics
+            assert metrics.commands_queued == 2
+            assert metrics.commands_superseded == 1
+            assert metrics.commands_flushed == 1
+            assert metrics.command_queue_size == 0
+            # Only the later command reached the cloud once it was back
+            assert metrics.commands_by_action == {
+                ("up", False): 1,
+                ("down", True): 1,
+            }
+
+    async def test_flush_waits_for_a_successful_poll(self, hass: HomeAssistant):
+        """A failed poll leaves the queue alone, a successful one flushes it."""
+        simulator = EverhomeSimulator(build_population(6))
+        cover = next(
+            device
+            for device in simulator.devices.values()
+            if device.subtype in COVER_SUBTYPES
+        )
+        async with async_simulated_coordinator(hass, simulator) as coordinator:
+            coordinator.command_queue = _queue(hass, _Clock())
+            await coordinator.async_refresh()
+            simulator.recorded_command_status = 503
+            assert not await coordinator.execute_device_action(cover.id, "down")
+            assert coordinator._flush_task is None
+
+            simulator.recorded_response = (503, None)
+            await coordinator.async_refresh()
+            assert coordinator._flush_task is None
+
+            simulator.recorded_response = None
+            simulator.recorded_command_status = None
+            await coordinator.async_refresh()
+            await coordinator._flush_task
+            await coordinator.async_shutdown()
+
+            assert len(coordinator.command_queue) == 0
+            assert coordinator.metrics.commands_by_action[("down", True)] == 1
+
+    @pytest.mark.parametrize(
+        "error",
+        [
+            aiohttp.ClientConnectionError("Cannot connect"),
+            asyncio.TimeoutError(),
+            aiohttp.ClientResponseError(MagicMock(), (), status=503),
+        ],
+        ids=["connection", "timeout", "server_error"],
+    )
+    async def test_failed_token_refresh_is_queued(
+        self, hass: HomeAssistant, error: Exception
+    ):
+        """A command is queued when the token cannot be refreshed either."""
+        simulator = EverhomeSimulator(build_population(2))
+        async with async_simulated_coordinator(hass, simulator) as coordinator:
+            coordinator.command_queue = _queue(hass, _Clock())
+            await coordinator.async_refresh()
+
+            with patch.object(
+                coordinator.auth, "async_get_access_token", side_effect=error
+            ):
+                result = await coordinator.execute_device_action("shutter", "up")
+
+            assert result.queued
+            assert [c.action for c in coordinator.command_queue.commands] == ["up"]
+
+    async def test_rejected_token_refresh_is_raised(self, hass: HomeAssistant):
+        """A refresh the cloud rejects needs a reauth, not a queue."""
+        simulator = EverhomeSimulator(build_population(2))
+        error = aiohttp.ClientResponseError(MagicMock(), (), status=400)
+        async with async_simulated_coordinator(hass, simulator) as coordinator:
+            coordinator.command_queue = _queue(hass, _Clock())
+            await coordinator.async_refresh()
+
+            with (
+                patch.object(
+                    coordinator.auth, "async_get_access_token", side_effect=error
+                ),
+                pytest.raises(aiohttp.ClientResponseError),
+            ):
+                await coordinator.execute_device_action("shutter", "up")
+
+            assert len(coordinator.command_queue) == 0
+
+    async def test_rejected_command_is_not_queued(self, hass: HomeAssistant):
+        """A command the cloud rejects is not retried."""
+        simulator = EverhomeSimulator(build_population(2))
+        async with async_simulated_coordinator(hass, simulator) as coordinator:
+            coordinator.command_queue = _queue(hass, _Clock())
+            await coordinator.async_refresh()
+
+            assert not await coordinator.execute_device_action("unknown", "up")
+
+            assert len(coordinator.command_queue) == 0
+            assert coordinator.metrics.commands_queued == 0
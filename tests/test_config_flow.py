@@ -11,8 +11,15 @@ from homeassistant import config_entries
 from homeassistant.core import HomeAssistant
 from homeassistant.data_entry_flow import FlowResultType
 
-from custom_components.everhome.config_flow import ConfigFlow
-from custom_components.everhome.const import API_BASE_URL, DOMAIN
+from custom_components.everhome.config_flow import ConfigFlow, EverhomeOptionsFlow
+from custom_components.everhome.const import (
+    API_BASE_URL,
+    CONF_UNAVAILABLE_AFTER,
+    CONF_UNAVAILABLE_MISSES,
+    DEFAULT_UNAVAILABLE_AFTER,
+    DEFAULT_UNAVAILABLE_MISSES,
+    DOMAIN,
+)
 
 
 @pytest.fixture
@@ -238,3 +245,41 @@ class TestEverhomeConfigFlow:
         logger = flow.logger
 
         assert logger.name == "custom_components.everhome.config_flow"
+
+
+class TestEverhomeOptionsFlow:
+    """Test Everhome options flow."""
+
+    async def test_options_flow_defaults(self, hass: HomeAssistant, mock_config_entry):
+        """The form is pre-filled with the default hysteresis settings."""
+        mock_config_entry.add_to_hass(hass)
+
+        flow = EverhomeOptionsFlow(mock_config_entry)
+        flow.hass = hass
+        result = await flow.async_step_init()
+
+        assert result["type"] == FlowResultType.FORM
+        assert result["step_id"] == "init"
+        schema = result["data_schema"]({})
+        assert schema[CONF_UNAVAILABLE_MISSES] == DEFAULT_UNAVAILABLE_MISSES
+        assert schema[CONF_UNAVAILABLE_AFTER] == DEFAULT_UNAVAILABLE_AFTER
+
+    async def test_options_flow_saves_input(
+        self, hass: HomeAssistant, mock_config_entry
+    ):
+        """Submitted options are stored on the entry."""
+        mock_config_entry.add_to_hass(hass)
+
+        flow = EverhomeOptionsFlow(mock_config_entry)
+        flow.hass = hass
+        user_input = {CONF_UNAVAILABLE_MISSES: 5, CONF_UNAVAILABLE_AFTER: 600}
+        result = await flow.async_step_init(user_input)
+
+        assert result["type"] == FlowResultType.CREATE_ENTRY
+        assert result["data"] == user_input
+
+    def test_options_flow_registered(self, mock_config_entry):
+        """The config flow exposes the options flow."""
+        flow = ConfigFlow.async_get_options_flow(mock_config_entry)
+
+        assert isinstance(flow, EverhomeOptionsFlow)
@@ -3,19 +3,58 @@
 from __future__ import annotations
 
 import asyncio
-from datetime import timedelta
-from unittest.mock import AsyncMock
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import aiohttp
 import pytest
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ConfigEntryAuthFailed
 from homeassistant.helpers.update_coordinator import UpdateFailed
-
-from custom_components.everhome.const import DOMAIN, UPDATE_INTERVAL
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.everhome.const import (
+    API_BASE_URL,
+    CONF_BUDGET_PERIOD,
+    CONF_FAST_POLL_INTERVAL,
+    CONF_LOOP_STALL_THRESHOLD,
+    CONF_LOOP_WATCHDOG,
+    CONF_PUSH,
+    CONF_REQUEST_BUDGET,
+    CONF_UNAVAILABLE_AFTER,
+    CONF_UNAVAILABLE_MISSES,
+    DATA_ACCOUNTS,
+    DEFAULT_STALE_WINDOW,
+    DEFAULT_UNAVAILABLE_AFTER,
+    DEFAULT_UNAVAILABLE_MISSES,
+    DOMAIN,
+    FAST_TIER_CONCURRENCY,
+    PUSH_POLL_INTERVAL,
+    UPDATE_INTERVAL,
+)
 from custom_components.everhome.coordinator import (
+    ENDPOINT_DEVICE_DETAIL,
     EverhomeDataUpdateCoordinator,
+    account_fingerprint,
 )
+from custom_components.everhome.watchdog import NULL_WATCHDOG, LoopWatchdog
+
+
+def _body(payload) -> bytes:
+    """Encode a JSON payload the way the API returns it."""
+    return json.dumps(payload).encode()
+
+
+def _content(body: bytes, chunk_size: int = 7) -> MagicMock:
+    """Mock a response stream delivering the body in small chunks."""
+
+    async def iter_chunked(size):
+        for index in range(0, len(body), chunk_size):
+            yield body[index : index + chunk_size]
+
+    content = MagicMock()
+    content.iter_chunked = iter_chunked
+    return content
 
 
 class TestEverhomeDataUpdateCoordinator:
@@ -38,6 +77,9 @@ class TestEverhomeDataUpdateCoordinator:
         if method == "get":
             mock_auth.aiohttp_session.get = mock_method
         elif method == "post":
+            # Commands answered without a device state unless a test sets one
+            if not isinstance(mock_response.read.return_value, bytes):
+                mock_response.read.return_value = b'{"success": true}'
             mock_auth.aiohttp_session.post = mock_method
 
     @pytest.fixture
@@ -63,7 +105,7 @@ class TestEverhomeDataUpdateCoordinator:
         assert coordinator.hass == hass
         assert coordinator.entry == mock_config_entry
         assert coordinator.name == DOMAIN
-        assert coordinator.update_interval == timedelta(seconds=UPDATE_INTERVAL)
+        assert coordinator.update_interval is None
 
     async def test_update_data_success(
         self, coordinator, mock_auth, mock_shutter_device, mock_awning_device
@@ -80,7 +122,7 @@ class TestEverhomeDataUpdateCoordinator:
 
         mock_response = AsyncMock()
         mock_response.status = 200
-        mock_response.json = AsyncMock(return_value=devices_data)
+        mock_response.content = _content(_body(devices_data))
 
         # Setup aiohttp mock with proper async context manager
         self._setup_aiohttp_mock(mock_auth, mock_response, "get")
@@ -161,7 +203,7 @@ class TestEverhomeDataUpdateCoordinator:
 
         mock_response = AsyncMock()
         mock_response.status = 200
-        mock_response.json = AsyncMock(return_value=devices_data)
+        mock_response.content = _content(_body(devices_data))
 
         self._setup_aiohttp_mock(mock_auth, mock_response, "get")
 
@@ -199,7 +241,9 @@ class TestEverhomeDataUpdateCoordinator:
 
         result = await coordinator.execute_device_action("device_001", "open")
 
-        assert result is True
+        assert result.success
+        assert result.status == 200
+        assert not result.complete
 
         # Verify API call
         mock_auth.async_get_access_token.assert_called_once()
@@ -215,7 +259,7 @@ class TestEverhomeDataUpdateCoordinator:
             "device_001", "set_position", {"position": 50}
         )
 
-        assert result is True
+        assert result.success
 
         # Call arguments verification removed (function mock doesn't support call_args)
         # Test verifies functionality by checking return value
@@ -231,7 +275,7 @@ class TestEverhomeDataUpdateCoordinator:
 
         result = await coordinator.execute_device_action("device_001", "invalid_action")
 
-        assert result is False
+        assert not result.success
 
     async def test_execute_device_action_client_error(self, coordinator, mock_auth):
         """Test device action execution with client error."""
@@ -244,7 +288,7 @@ class TestEverhomeDataUpdateCoordinator:
 
         result = await coordinator.execute_device_action("device_001", "open")
 
-        assert result is False
+        assert not result.success
 
     async def test_execute_device_action_timeout_error(self, coordinator, mock_auth):
         """Test device action execution with timeout error."""
@@ -257,7 +301,7 @@ class TestEverhomeDataUpdateCoordinator:
 
         result = await coordinator.execute_device_action("device_001", "open")
 
-        assert result is False
+        assert not result.success
 
     async def test_execute_device_action_auth_token_refresh(
         self, coordinator, mock_auth
@@ -282,7 +326,7 @@ class TestEverhomeDataUpdateCoordinator:
         """Test get devices with empty response."""
         mock_response = AsyncMock()
         mock_response.status = 200
-        mock_response.json = AsyncMock(return_value=[])
+        mock_response.content = _content(_body([]))
 
         # Setup aiohttp mock with proper async context manager
         self._setup_aiohttp_mock(mock_auth, mock_response, "get")
@@ -295,7 +339,7 @@ class TestEverhomeDataUpdateCoordinator:
         """Test that coordinator constructs correct API URLs."""
         mock_response = AsyncMock()
         mock_response.status = 200
-        mock_response.json = AsyncMock(return_value=[])
+        mock_response.content = _content(_body([]))
 
         # Setup aiohttp mock with proper async context manager
         self._setup_aiohttp_mock(mock_auth, mock_response, "get")
@@ -326,7 +370,7 @@ class TestEverhomeDataUpdateCoordinator:
 
         mock_response = AsyncMock()
         mock_response.status = 200
-        mock_response.json = AsyncMock(return_value=devices_data)
+        mock_response.content = _content(_body(devices_data))
 
         # Setup aiohttp mock with proper async context manager
         self._setup_aiohttp_mock(mock_auth, mock_response, "get")
@@ -341,3 +385,719 @@ class TestEverhomeDataUpdateCoordinator:
 
         # Verify API was called (call_count not available with function mock)
         # Test passes if no exceptions were raised
+
+    async def test_missing_device_keeps_last_state(self, coordinator, mock_auth):
+        """A device missing from one poll stays in the snapshot."""
+        shutter = {"id": "shutter_001", "subtype": "shutter", "position": 40}
+        coordinator.data = {"shutter_001": shutter}
+
+        mock_response = AsyncMock()
+        mock_response.status = 200
+        mock_response.content = _content(_body([]))
+        self._setup_aiohttp_mock(mock_auth, mock_response, "get")
+
+        result = await coordinator._async_update_data()
+
+        assert result["shutter_001"] is shutter
+        assert coordinator.missed_polls["shutter_001"] == 1
+
+    async def test_missing_device_dropped_after_consecutive_misses(
+        self, coordinator, mock_auth
+    ):
+        """A device is dropped once it reaches the miss threshold."""
+        coordinator.data = {"shutter_001": {"id": "shutter_001"}}
+
+        mock_response = AsyncMock()
+        mock_response.status = 200
+        mock_response.content = _content(_body([]))
+        self._setup_aiohttp_mock(mock_auth, mock_response, "get")
+
+        for _ in range(DEFAULT_UNAVAILABLE_MISSES - 1):
+            coordinator.data = await coordinator._async_update_data()
+            assert "shutter_001" in coordinator.data
+
+        coordinator.data = await coordinator._async_update_data()
+
+        assert "shutter_001" not in coordinator.data
+        assert "shutter_001" not in coordinator.missed_polls
+        assert "shutter_001" not in coordinator.last_seen
+
+    async def test_missing_device_dropped_after_time(self, coordinator, mock_auth):
+        """A device unseen for longer than the window is dropped on its first miss."""
+        coordinator.data = {"shutter_001": {"id": "shutter_001"}}
+        coordinator.last_seen["shutter_001"] = 0.0
+
+        mock_response = AsyncMock()
+        mock_response.status = 200
+        mock_response.content = _content(_body([]))
+        self._setup_aiohttp_mock(mock_auth, mock_response, "get")
+
+        with patch(
+            "custom_components.everhome.coordinator.time.monotonic",
+            return_value=float(DEFAULT_UNAVAILABLE_AFTER),
+        ):
+            result = await coordinator._async_update_data()
+
+        assert "shutter_001" not in result
+
+    async def test_reappearing_device_resets_miss_count(self, coordinator, mock_auth):
+        """A device seen again starts counting misses from zero."""
+        coordinator.data = {"shutter_001": {"id": "shutter_001"}}
+        coordinator.missed_polls["shutter_001"] = DEFAULT_UNAVAILABLE_MISSES - 1
+
+        mock_response = AsyncMock()
+        mock_response.status = 200
+        mock_response.content = _content(
+            _body([{"id": "shutter_001", "subtype": "shutter"}])
+        )
+        self._setup_aiohttp_mock(mock_auth, mock_response, "get")
+
+        await coordinator._async_update_data()
+
+        assert "shutter_001" not in coordinator.missed_polls
+
+    def test_hysteresis_options(self, hass: HomeAssistant, mock_auth):
+        """Thresholds are read from the config entry options."""
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            options={CONF_UNAVAILABLE_MISSES: 1, CONF_UNAVAILABLE_AFTER: 60},
+        )
+
+        coordinator = EverhomeDataUpdateCoordinator(hass, mock_auth, entry)
+
+        assert coordinator._unavailable_misses == 1
+        assert coordinator._unavailable_after == 60
+
+    async def test_failed_poll_serves_stale_snapshot(self, coordinator, mock_auth):
+        """A failed poll within the staleness window returns the last snapshot."""
+        snapshot = {"shutter_001": {"id": "shutter_001", "subtype": "shutter"}}
+        coordinator.data = snapshot
+        coordinator._snapshot_time = 0.0
+        mock_auth.async_get_access_token.side_effect = aiohttp.ClientError("down")
+
+        with patch(
+            "custom_components.everhome.coordinator.time.monotonic",
+            return_value=60.0,
+        ):
+            result = await coordinator._async_update_data()
+            assert coordinator.snapshot_age == 60.0
+
+        assert result is snapshot
+        assert coordinator.stale is True
+
+    async def test_failed_poll_after_window_raises(self, coordinator, mock_auth):
+        """Once the window expires the failure reaches the base coordinator."""
+        coordinator.data = {"shutter_001": {"id": "shutter_001"}}
+        coordinator._snapshot_time = 0.0
+        mock_auth.async_get_access_token.side_effect = aiohttp.ClientError("down")
+
+        with (
+            patch(
+                "custom_components.everhome.coordinator.time.monotonic",
+                return_value=float(DEFAULT_STALE_WINDOW),
+            ),
+            pytest.raises(UpdateFailed),
+        ):
+            await coordinator._async_update_data()
+
+    async def test_http_error_serves_stale_snapshot(self, coordinator, mock_auth):
+        """Non-200 responses are also covered by the staleness window."""
+        coordinator.data = {"shutter_001": {"id": "shutter_001"}}
+        coordinator._snapshot_time = 0.0
+
+        mock_response = AsyncMock()
+        mock_response.status = 503
+        mock_response.text.return_value = "Service Unavailable"
+        self._setup_aiohttp_mock(mock_auth, mock_response, "get")
+
+        with patch(
+            "custom_components.everhome.coordinator.time.monotonic",
+            return_value=1.0,
+        ):
+            result = await coordinator._async_update_data()
+
+        assert "shutter_001" in result
+
+    async def test_successful_poll_clears_stale(self, coordinator, mock_auth):
+        """A successful poll resets the stale flag and snapshot time."""
+        coordinator.stale = True
+
+        mock_response = AsyncMock()
+        mock_response.status = 200
+        mock_response.content = _content(_body([]))
+        self._setup_aiohttp_mock(mock_auth, mock_response, "get")
+
+        await coordinator._async_update_data()
+
+        assert coordinator.stale is False
+        assert coordinator.stale_since is None
+        assert coordinator.snapshot_age is not None
+        assert coordinator.snapshot_timestamp is not None
+
+    async def test_poll_records_metrics(self, coordinator, mock_auth):
+        """A successful poll records latency, payload size and device counts."""
+        devices_data = [
+            {"id": "shutter_001", "subtype": "shutter"},
+            {"id": "speaker_001", "subtype": "speaker"},
+        ]
+        body = _body(devices_data)
+
+        mock_response = AsyncMock()
+        mock_response.status = 200
+        mock_response.content = _content(body)
+        self._setup_aiohttp_mock(mock_auth, mock_response, "get")
+
+        await coordinator._async_update_data()
+
+        metrics = coordinator.metrics
+        assert metrics.polls == 1
+        assert metrics.payload_bytes == len(body)
+        assert metrics.decoded_devices == 2
+        assert metrics.supported_devices == 1
+        assert metrics.last_poll_latency is not None
+        assert metrics.poll_latency_p50 == metrics.last_poll_latency
+
+    async def test_failed_poll_records_failure(self, coordinator, mock_auth):
+        """A failed poll increments the failure counter."""
+        mock_auth.async_get_access_token.side_effect = aiohttp.ClientError("down")
+
+        with pytest.raises(UpdateFailed):
+            await coordinator._async_update_data()
+
+        assert coordinator.metrics.poll_failures == 1
+        assert coordinator.metrics.polls == 0
+
+    async def test_command_records_metrics(self, coordinator, mock_auth):
+        """Commands record latency and their outcome."""
+        mock_response = AsyncMock()
+        mock_response.status = 200
+        self._setup_aiohttp_mock(mock_auth, mock_response, "post")
+        await coordinator.execute_device_action("device_001", "up")
+
+        mock_response.status = 500
+        mock_response.text.return_value = "boom"
+        await coordinator.execute_device_action("device_001", "up")
+
+        metrics = coordinator.metrics
+        assert metrics.commands == 2
+        assert metrics.command_errors == 1
+        assert metrics.command_error_rate == 50
+        assert metrics.last_command_latency is not None
+
+    async def test_returned_state_is_merged(self, coordinator, mock_auth):
+        """A device state in the execute response updates the snapshot."""
+        coordinator.data = {
+            "shutter_001": {
+                "id": "shutter_001",
+                "subtype": "shutter",
+                "states": {"general": "up", "battery": "ok"},
+                "position": 100,
+            }
+        }
+        listener = MagicMock()
+        coordinator.async_add_listener(listener)
+        mock_response = AsyncMock()
+        mock_response.status = 200
+        mock_response.read.return_value = _body(
+            {
+                "success": True,
+                "device": {
+                    "id": "shutter_001",
+                    "states": {"general": "closing", "battery": "ok"},
+                    "position": 100,
+                },
+            }
+        )
+        self._setup_aiohttp_mock(mock_auth, mock_response, "post")
+
+        result = await coordinator.execute_device_action("shutter_001", "down")
+
+        assert result.success
+        assert result.complete
+        assert coordinator.data["shutter_001"]["states"]["general"] == "closing"
+        assert coordinator.data["shutter_001"]["subtype"] == "shutter"
+        assert coordinator.metrics.command_states_applied == 1
+        listener.assert_called_once()
+
+    async def test_partial_returned_state(self, coordinator, mock_auth):
+        """A partial state is merged but still needs the follow-up poll."""
+        coordinator.data = {
+            "shutter_001": {
+                "id": "shutter_001",
+                "states": {"general": "up", "battery": "ok"},
+                "position": 100,
+            }
+        }
+        mock_response = AsyncMock()
+        mock_response.status = 200
+        mock_response.read.return_value = _body(
+            {"id": "shutter_001", "states": {"general": "closing"}}
+        )
+        self._setup_aiohttp_mock(mock_auth, mock_response, "post")
+
+        result = await coordinator.execute_device_action("shutter_001", "down")
+
+        assert result.success
+        assert not result.complete
+        assert coordinator.data["shutter_001"]["states"] == {
+            "general": "closing",
+            "battery": "ok",
+        }
+
+    async def test_state_of_another_device_is_ignored(self, coordinator, mock_auth):
+        """A returned state is only applied to the commanded device."""
+        device = {"id": "shutter_001", "states": {"general": "up"}}
+        coordinator.data = {"shutter_001": device}
+        mock_response = AsyncMock()
+        mock_response.status = 200
+        mock_response.read.return_value = _body(
+            {"id": "shutter_002", "states": {"general": "down"}}
+        )
+        self._setup_aiohttp_mock(mock_auth, mock_response, "post")
+
+        result = await coordinator.execute_device_action("shutter_001", "down")
+
+        assert result.success
+        assert not result.complete
+        assert coordinator.data["shutter_001"] is device
+
+    async def test_loop_watchdog_disabled_by_default(self, coordinator):
+        """Without the option no sections are timed."""
+        assert coordinator.watchdog is NULL_WATCHDOG
+
+    async def test_loop_watchdog_times_poll_sections(
+        self, hass: HomeAssistant, mock_auth
+    ):
+        """With the option set the synchronous poll sections are timed."""
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            options={CONF_LOOP_WATCHDOG: True, CONF_LOOP_STALL_THRESHOLD: 20},
+        )
+        coordinator = EverhomeDataUpdateCoordinator(hass, mock_auth, entry)
+        mock_response = AsyncMock()
+        mock_response.status = 200
+        mock_response.content = _content(
+            _body([{"id": "shutter_001", "subtype": "shutter"}])
+        )
+        self._setup_aiohttp_mock(mock_auth, mock_response, "get")
+
+        await coordinator._async_update_data()
+
+        assert isinstance(coordinator.watchdog, LoopWatchdog)
+        assert coordinator.watchdog.threshold == 0.02
+        assert set(coordinator.metrics.loop_block_max) == {"parse", "snapshot"}
+
+    async def test_poll_streams_device_list(self, coordinator, mock_auth):
+        """Unsupported devices are dropped and only used fields are kept."""
+        devices_data = [
+            {"id": "gateway_001", "subtype": "gateway", "log": ["x" * 1000] * 50},
+            {
+                "id": "shutter_001",
+                "name": "Kitchen",
+                "subtype": "shutter",
+                "room": "Kitchen",
+                "states": {"general": "open"},
+            },
+        ]
+        mock_response = AsyncMock()
+        mock_response.status = 200
+        mock_response.content = _content(_body(devices_data), 1024)
+        self._setup_aiohttp_mock(mock_auth, mock_response, "get")
+
+        result = await coordinator._async_update_data()
+
+        assert result == {
+            "shutter_001": {
+                "id": "shutter_001",
+                "name": "Kitchen",
+                "subtype": "shutter",
+                "states": {"general": "open"},
+            }
+        }
+        assert coordinator.metrics.decoded_devices == 2
+        assert coordinator.metrics.parse_buffer_peak < 2048
+
+    async def test_large_device_list_parsed_in_executor(
+        self, hass: HomeAssistant, coordinator, mock_auth
+    ):
+        """Past the threshold the device list is parsed off the event loop."""
+        devices_data = [
+            {"id": f"shutter_{index:03}", "subtype": "shutter"} for index in range(20)
+        ] + [{"id": "speaker_001", "subtype": "speaker"}]
+        mock_response = AsyncMock()
+        mock_response.status = 200
+        mock_response.content = _content(_body(devices_data), 64)
+        self._setup_aiohttp_mock(mock_auth, mock_response, "get")
+
+        with (
+            patch(
+                "custom_components.everhome.coordinator.DECODE_EXECUTOR_THRESHOLD",
+                256,
+            ),
+            patch.object(
+                hass, "async_add_executor_job", wraps=hass.async_add_executor_job
+            ) as executor_job,
+        ):
+            result = await coordinator._async_update_data()
+
+        assert len(result) == 20
+        assert coordinator.metrics.decoded_devices == 21
+        assert coordinator.metrics.executor_decodes == executor_job.call_count
+        assert executor_job.call_count > 1
+        # Batches keep the parser's memory bounded
+        assert coordinator.metrics.parse_buffer_peak < 512
+
+    async def test_truncated_device_list(self, coordinator, mock_auth):
+        """A device list cut off mid-stream fails the poll."""
+        mock_response = AsyncMock()
+        mock_response.status = 200
+        mock_response.content = _content(b'[{"id": "shutter_001", "sub')
+        self._setup_aiohttp_mock(mock_auth, mock_response, "get")
+
+        with pytest.raises(UpdateFailed, match="Invalid device list"):
+            await coordinator._async_update_data()
+
+    async def test_request_budget(self, hass: HomeAssistant, mock_auth):
+        """Polls, commands and token refreshes are charged to the budget."""
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            options={CONF_REQUEST_BUDGET: 100, CONF_BUDGET_PERIOD: "hour"},
+        )
+        coordinator = EverhomeDataUpdateCoordinator(hass, mock_auth, entry)
+        mock_auth.token_refreshes = 0
+        mock_response = AsyncMock()
+        mock_response.status = 200
+        mock_response.content = _content(_body([]))
+        self._setup_aiohttp_mock(mock_auth, mock_response, "get")
+        self._setup_aiohttp_mock(mock_auth, mock_response, "post")
+
+        await coordinator._async_update_data()
+        mock_auth.token_refreshes = 1
+        await coordinator.execute_device_action("shutter_001", "up")
+
+        assert coordinator.budget.spent == 3
+        assert coordinator.metrics.budget_remaining == 97
+        # 10 requests are reserved for commands, 90 polls fit in the hour
+        assert coordinator.poll_interval == UPDATE_INTERVAL
+
+    async def test_fast_tier_refreshes_safety_sensors(self, coordinator, mock_auth):
+        """Only fast tier devices are fetched and merged into the snapshot."""
+        coordinator.data = {
+            "smoke_001": {
+                "id": "smoke_001",
+                "name": "Hall",
+                "subtype": "smokedetector",
+                "states": {"general": "off"},
+            },
+            "shutter_001": {"id": "shutter_001", "subtype": "shutter"},
+        }
+        mock_response = AsyncMock()
+        mock_response.status = 200
+        mock_response.read = AsyncMock(
+            return_value=_body(
+                {
+                    "id": "smoke_001",
+                    "subtype": "smokedetector",
+                    "states": {"general": "on"},
+                    "history": [1, 2, 3],
+                }
+            )
+        )
+        urls = []
+
+        class MockContextManager:
+            async def __aenter__(self):
+                return mock_response
+
+            async def __aexit__(self, exc_type, exc_val, exc_tb):
+                return None
+
+        def mock_get(url, **kwargs):
+            urls.append(url)
+            return MockContextManager()
+
+        mock_auth.aiohttp_session.get = mock_get
+        updates = []
+        coordinator.async_add_listener(lambda: updates.append(True))
+
+        await coordinator.async_refresh_fast_tier()
+
+        assert urls == [f"{API_BASE_URL}/device/smoke_001"]
+        assert coordinator.data["smoke_001"] == {
+            "id": "smoke_001",
+            "name": "Hall",
+            "subtype": "smokedetector",
+            "states": {"general": "on"},
+        }
+        assert updates == [True]
+        assert coordinator.metrics.fast_refreshes == 1
+
+    async def test_fast_tier_falls_back_without_endpoint(self, coordinator, mock_auth):
+        """An API without per-device fetches disables the fast tier."""
+        coordinator.data = {
+            "water_001": {"id": "water_001", "subtype": "waterdetector"},
+        }
+        mock_response = AsyncMock()
+        mock_response.status = 404
+        self._setup_aiohttp_mock(mock_auth, mock_response, "get")
+
+        await coordinator.async_refresh_fast_tier()
+        assert coordinator.fast_tier_supported is False
+
+        mock_auth.async_get_access_token.reset_mock()
+        await coordinator.async_refresh_fast_tier()
+        mock_auth.async_get_access_token.assert_not_called()
+
+    async def test_fast_tier_bounds_concurrency(self, coordinator, mock_auth):
+        """Only a few fast tier devices are fetched at once."""
+        coordinator.data = {
+            f"smoke_{index}": {"id": f"smoke_{index}", "subtype": "smokedetector"}
+            for index in range(FAST_TIER_CONCURRENCY * 3)
+        }
+        active = peak = 0
+
+        async def get_device(device_id):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0)
+            active -= 1
+            return None
+
+        with patch.object(coordinator, "_get_device", side_effect=get_device):
+            await coordinator.async_refresh_fast_tier()
+
+        assert peak == FAST_TIER_CONCURRENCY
+
+    async def test_fast_tier_ignores_invalid_response(self, coordinator, mock_auth):
+        """A device response that is not JSON is skipped."""
+        coordinator.data = {
+            "water_001": {"id": "water_001", "subtype": "waterdetector"},
+        }
+        mock_response = AsyncMock()
+        mock_response.status = 200
+        mock_response.read = AsyncMock(return_value=b"<html>")
+        self._setup_aiohttp_mock(mock_auth, mock_response, "get")
+
+        assert await coordinator._get_device("water_001") is None
+        assert ENDPOINT_DEVICE_DETAIL in coordinator.metrics.histograms
+
+    async def test_fast_tier_within_budget(self, hass: HomeAssistant, mock_auth):
+        """The fast tier slows polls down and stops before the reserve."""
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            options={
+                CONF_REQUEST_BUDGET: 1800,
+                CONF_BUDGET_PERIOD: "day",
+                CONF_FAST_POLL_INTERVAL: 300,
+            },
+        )
+        coordinator = EverhomeDataUpdateCoordinator(hass, mock_auth, entry)
+        mock_auth.token_refreshes = 0
+        coordinator.data = {
+            f"smoke_{index}": {"id": f"smoke_{index}", "subtype": "smokedetector"}
+            for index in range(5)
+        }
+
+        with patch.object(coordinator, "_get_device", return_value=None) as get:
+            await coordinator.async_refresh_fast_tier()
+            assert get.call_count == 5
+            # 5 devices every 5 minutes take 1440 of the 1620 polling requests
+            assert coordinator.poll_interval == pytest.approx(86400 / 180)
+
+            budget = coordinator.budget
+            for _ in range(budget.remaining - budget.reserve - 4):
+                coordinator.budget.spend()
+            await coordinator.async_refresh_fast_tier()
+
+        assert get.call_count == 5
+        assert coordinator.metrics.fast_refreshes_skipped == 1
+
+    async def test_fast_tier_without_safety_sensors(self, coordinator, mock_auth):
+        """Accounts without fast tier devices make no requests."""
+        coordinator.data = {"shutter_001": {"id": "shutter_001", "subtype": "shutter"}}
+
+        await coordinator.async_refresh_fast_tier()
+
+        mock_auth.async_get_access_token.assert_not_called()
+
+    async def test_apply_push_merges_states(self, coordinator):
+        """Pushed changes update only the devices they name."""
+        coordinator.data = {
+            "shutter_001": {
+                "id": "shutter_001",
+                "name": "Bedroom",
+                "subtype": "shutter",
+                "states": {"general": "down", "battery": "ok"},
+            },
+            "light_001": {"id": "light_001", "subtype": "light"},
+        }
+        light = coordinator.data["light_001"]
+        updates = []
+        coordinator.async_add_listener(lambda: updates.append(True))
+
+        applied = coordinator.async_apply_push(
+            [
+                {"id": "shutter_001", "states": {"general": "up"}, "history": []},
+                {"id": "unknown_001", "states": {"general": "on"}},
+            ]
+        )
+
+        assert applied == 1
+        assert coordinator.data["shutter_001"] == {
+            "id": "shutter_001",
+            "name": "Bedroom",
+            "subtype": "shutter",
+            "states": {"general": "up", "battery": "ok"},
+        }
+        assert coordinator.data["light_001"] is light
+        assert coordinator.metrics.push_events == 1
+        assert updates == [True]
+
+    async def test_push_slows_polling(self, hass: HomeAssistant, mock_auth):
+        """Push mode keeps polling only as a slow safety net."""
+        entry = MockConfigEntry(domain=DOMAIN, options={CONF_PUSH: True})
+        coordinator = EverhomeDataUpdateCoordinator(hass, mock_auth, entry)
+
+        assert coordinator.push is True
+        assert coordinator.poll_interval == PUSH_POLL_INTERVAL
+
+
+class TestEverhomeAccountSharing:
+    """Test sharing one poller between entries of the same account."""
+
+    DEVICES = {"shutter_001": {"id": "shutter_001", "subtype": "shutter"}}
+
+    @pytest.fixture
+    async def make_coordinator(self, hass: HomeAssistant):
+        """Create coordinators that are shut down after the test."""
+        coordinators = []
+
+        def make(devices) -> EverhomeDataUpdateCoordinator:
+            entry = MockConfigEntry(domain=DOMAIN, title="Everhome")
+            coordinator = EverhomeDataUpdateCoordinator(hass, AsyncMock(), entry)
+            coordinator.data = dict(devices)
+            coordinators.append(coordinator)
+            return coordinator
+
+        yield make
+        for coordinator in coordinators:
+            await coordinator.async_shutdown()
+
+    async def test_account_fingerprint(self):
+        """The fingerprint depends on the device ids only."""
+        assert account_fingerprint({}) is None
+        assert account_fingerprint({"a": {}, "b": {}}) == account_fingerprint(
+            {"b": {"name": "x"}, "a": {}}
+        )
+        assert account_fingerprint({"a": {}}) != account_fingerprint({"b": {}})
+        assert account_fingerprint({2: {}, 1: {}}) == account_fingerprint(
+            {"1": {}, "2": {}}
+        )
+
+    async def test_second_entry_follows(self, hass: HomeAssistant, make_coordinator):
+        """A second entry of the same account stops polling and mirrors data."""
+        leader = make_coordinator(self.DEVICES)
+        follower = make_coordinator(self.DEVICES)
+        leader.async_join_account()
+        follower.async_join_account()
+        updates = []
+        follower.async_add_listener(lambda: updates.append(follower.data))
+
+        snapshot = {"shutter_001": {"id": "shutter_001", "position": 10}}
+        leader.async_set_updated_data(snapshot)
+
+        assert follower.leader is leader
+        assert leader.followers == [follower]
+        assert updates == [snapshot]
+        assert hass.data[DATA_ACCOUNTS] == {leader.account: leader}
+
+    async def test_other_account_polls_itself(
+        self, hass: HomeAssistant, make_coordinator
+    ):
+        """Entries with different devices keep their own poller."""
+        first = make_coordinator(self.DEVICES)
+        second = make_coordinator({"light_001": {"id": "light_001"}})
+        first.async_join_account()
+        second.async_join_account()
+
+        assert second.leader is None
+        assert len(hass.data[DATA_ACCOUNTS]) == 2
+
+    async def test_entry_without_devices_follows_later(
+        self, hass: HomeAssistant, make_coordinator
+    ):
+        """An entry is matched once a poll returns its devices."""
+        first = make_coordinator({})
+        second = make_coordinator(self.DEVICES)
+        first.async_join_account()
+        second.async_join_account()
+        assert first.account is None
+
+        with patch.object(first, "_async_update_data", return_value=self.DEVICES):
+            await first.async_refresh()
+
+        assert first.leader is second
+        assert hass.data[DATA_ACCOUNTS] == {second.account: second}
+
+    async def test_changed_devices_regroup(self, hass: HomeAssistant, make_coordinator):
+        """A leader whose devices change moves, with its followers, to a match."""
+        devices = {**self.DEVICES, "light_001": {"id": "light_001"}}
+        leader = make_coordinator(self.DEVICES)
+        follower = make_coordinator(self.DEVICES)
+        other = make_coordinator(devices)
+        for coordinator in (leader, follower, other):
+            coordinator.async_join_account()
+        assert len(hass.data[DATA_ACCOUNTS]) == 2
+
+        with patch.object(leader, "_async_update_data", return_value=devices):
+            await leader.async_refresh()
+
+        assert leader.leader is other
+        assert follower.leader is other
+        assert other.followers == [follower, leader]
+        assert hass.data[DATA_ACCOUNTS] == {other.account: other}
+
+    async def test_follower_refresh_goes_to_leader(
+        self, hass: HomeAssistant, make_coordinator
+    ):
+        """Refreshes requested after a command are run by the leader."""
+        leader = make_coordinator(self.DEVICES)
+        follower = make_coordinator(self.DEVICES)
+        leader.async_join_account()
+        follower.async_join_account()
+
+        with patch.object(leader, "async_request_refresh") as request_refresh:
+            await follower.async_request_refresh()
+
+        request_refresh.assert_awaited_once()
+
+    async def test_leader_hands_over_on_unload(
+        self, hass: HomeAssistant, make_coordinator
+    ):
+        """Unloading the polling entry promotes the first follower."""
+        leader = make_coordinator(self.DEVICES)
+        first = make_coordinator(self.DEVICES)
+        second = make_coordinator(self.DEVICES)
+        for coordinator in (leader, first, second):
+            coordinator.async_join_account()
+
+        leader.async_leave_account()
+
+        assert hass.data[DATA_ACCOUNTS] == {leader.account: first}
+        assert first.leader is None
+        assert second.leader is first
+        assert first.followers == [second]
+
+    async def test_follower_leaves(self, hass: HomeAssistant, make_coordinator):
+        """Unloading a follower detaches it from the leader."""
+        leader = make_coordinator(self.DEVICES)
+        follower = make_coordinator(self.DEVICES)
+        leader.async_join_account()
+        follower.async_join_account()
+
+        follower.async_leave_account()
+        leader.async_leave_account()
+
+        assert leader.followers == []
+        assert hass.data[DATA_ACCOUNTS] == {}
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from unittest.mock import AsyncMock, patch
+from unittest.mock import patch
 
 import pytest
 from homeassistant.components.cover import (
@@ -21,11 +21,9 @@ class TestEverhomeCover:
     """Test Everhome cover entity."""
 
     @pytest.fixture
-    def mock_coordinator(self, mock_config_entry):
+    def mock_coordinator(self, mock_coordinator):
         """Mock coordinator with device data."""
-        coordinator = AsyncMock()
-        coordinator.entry = mock_config_entry
-        coordinator.data = {
+        mock_coordinator.data = {
             "shutter_001": {
                 "id": "shutter_001",
                 "name": "Bedroom Shutter",
@@ -41,9 +39,7 @@ class TestEverhomeCover:
                 "position": 75,
             },
         }
-        coordinator.execute_device_action = AsyncMock(return_value=True)
-        coordinator.async_request_refresh = AsyncMock()
-        return coordinator
+        return mock_coordinator
 
     async def test_async_setup_entry(
         self, hass: HomeAssistant, mock_config_entry, mock_coordinator
@@ -0,0 +1,88 @@
+"""Test Everhome diagnostics."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from unittest.mock import MagicMock
+
+import pytest
+from homeassistant.components.diagnostics import REDACTED
+from homeassistant.core import HomeAssistant
+
+from custom_components.everhome.const import DOMAIN
+from custom_components.everhome.diagnostics import (
+    async_get_config_entry_diagnostics,
+    async_get_device_diagnostics,
+)
+from custom_components.everhome.metrics import EverhomeMetrics
+
+
+class TestEverhomeDiagnostics:
+    """Test Everhome diagnostics."""
+
+    @pytest.fixture
+    def mock_coordinator(self, mock_config_entry):
+        """Mock coordinator with one device and a few recorded calls."""
+        coordinator = MagicMock()
+        coordinator.entry = mock_config_entry
+        coordinator.update_interval = timedelta(seconds=300)
+        coordinator.last_update_success = True
+        coordinator.last_exception = None
+        coordinator.snapshot_age = 12.5
+        coordinator.stale = False
+        coordinator.missed_polls = {}
+        coordinator.last_seen = {"shutter_001": 0.0}
+        coordinator.data = {
+            "shutter_001": {
+                "id": "shutter_001",
+                "name": "Bedroom Shutter",
+                "subtype": "shutter",
+                "states": {"general": "down"},
+            }
+        }
+        coordinator.metrics = EverhomeMetrics()
+        coordinator.metrics.record_call("GET /device", 200, 0.3, 1024)
+        coordinator.metrics.record_call("GET /device", 500, 12.0, 0)
+        return coordinator
+
+    async def test_config_entry_diagnostics(
+        self, hass: HomeAssistant, mock_config_entry, mock_coordinator
+    ):
+        """Entry diagnostics are redacted and include metrics and scheduling."""
+        hass.data.setdefault(DOMAIN, {})
+        hass.data[DOMAIN][mock_config_entry.entry_id] = mock_coordinator
+
+        result = await async_get_config_entry_diagnostics(hass, mock_config_entry)
+
+        assert result["entry"]["data"]["access_token"] == REDACTED
+        assert result["entry"]["data"]["refresh_token"] == REDACTED
+        assert result["devices"]["shutter_001"]["name"] == REDACTED
+        assert result["devices"]["shutter_001"]["subtype"] == "shutter"
+        assert result["scheduling"]["update_interval"] == 300
+        assert result["scheduling"]["snapshot_age"] == 12.5
+
+        histogram = result["metrics"]["histograms"]["GET /device"]
+        assert histogram["count"] == 2
+        assert histogram["buckets"]["0.5"] == 1
+        assert histogram["buckets"]["+Inf"] == 1
+
+        calls = result["metrics"]["recent_calls"]
+        assert [call["status"] for call in calls] == [200, 500]
+        assert calls[0]["bytes"] == 1024
+
+    async def test_device_diagnostics(
+        self, hass: HomeAssistant, mock_config_entry, mock_coordinator
+    ):
+        """Device diagnostics return the redacted device snapshot."""
+        hass.data.setdefault(DOMAIN, {})
+        hass.data[DOMAIN][mock_config_entry.entry_id] = mock_coordinator
+        device = MagicMock()
+        device.identifiers = {(DOMAIN, "shutter_001")}
+
+        result = await async_get_device_diagnostics(hass, mock_config_entry, device)
+
+        assert result["device_id"] == "shutter_001"
+        assert result["data"]["name"] == REDACTED
+        assert result["data"]["states"] == {"general": "down"}
+        assert result["missed_polls"] == 0
+        assert result["seconds_since_seen"] is not None
@@ -0,0 +1,192 @@
+"""Test the shared Everhome entity behaviour."""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from custom_components.everhome.const import ATTR_LAST_SNAPSHOT
+from custom_components.everhome.coordinator import CommandResult
+from custom_components.everhome.cover import EverhomeCover
+from custom_components.everhome.light import EverhomeLight
+
+SNAPSHOT_TIME = datetime(2024, 3, 1, 12, 0, tzinfo=timezone.utc)
+
+
+class TestEverhomeEntity:
+    """Test state write suppression in EverhomeEntity."""
+
+    @pytest.fixture
+    def mock_coordinator(self, mock_coordinator):
+        """Mock coordinator with a cover and a dimmable light."""
+        mock_coordinator.data = {
+            "shutter_001": {
+                "id": "shutter_001",
+                "name": "Bedroom Shutter",
+                "subtype": "shutter",
+                "states": {"general": "down"},
+                "position": 0,
+            },
+            "light_001": {
+                "id": "light_001",
+                "name": "Desk Lamp",
+                "subtype": "light",
+                "capabilities": ["set_brightness"],
+                "states": {"general": "on", "brightness": 50},
+            },
+        }
+        return mock_coordinator
+
+    def test_first_update_writes_state(self, mock_coordinator):
+        """An entity without a recorded state always writes."""
+        cover = EverhomeCover(
+            mock_coordinator, "shutter_001", mock_coordinator.data["shutter_001"]
+        )
+
+        with patch.object(cover, "async_write_ha_state") as mock_write:
+            cover._handle_coordinator_update()
+
+        mock_write.assert_called_once()
+        assert mock_coordinator.metrics.state_writes == 1
+        assert mock_coordinator.metrics.state_writes_skipped == 0
+
+    def test_unchanged_state_skips_write(self, mock_coordinator):
+        """A refresh that yields the same derived state does not write."""
+        cover = EverhomeCover(
+            mock_coordinator, "shutter_001", mock_coordinator.data["shutter_001"]
+        )
+
+        with patch.object(cover, "async_write_ha_state") as mock_write:
+            cover._handle_coordinator_update()
+            cover._handle_coordinator_update()
+            cover._handle_coordinator_update()
+
+        mock_write.assert_called_once()
+        assert mock_coordinator.metrics.state_writes == 1
+        assert mock_coordinator.metrics.state_writes_skipped == 2
+
+    def test_changed_state_writes(self, mock_coordinator):
+        """A change in position is written."""
+        cover = EverhomeCover(
+            mock_coordinator, "shutter_001", mock_coordinator.data["shutter_001"]
+        )
+
+        with patch.object(cover, "async_write_ha_state") as mock_write:
+            cover._handle_coordinator_update()
+            mock_coordinator.data["shutter_001"] = {
+                **mock_coordinator.data["shutter_001"],
+                "states": {"general": "up"},
+                "position": 100,
+            }
+            cover._handle_coordinator_update()
+
+        assert mock_write.call_count == 2
+        assert mock_coordinator.metrics.state_writes == 2
+
+    def test_availability_change_writes(self, mock_coordinator):
+        """A device disappearing from the snapshot is written."""
+        cover = EverhomeCover(
+            mock_coordinator, "shutter_001", mock_coordinator.data["shutter_001"]
+        )
+
+        with patch.object(cover, "async_write_ha_state") as mock_write:
+            cover._handle_coordinator_update()
+            del mock_coordinator.data["shutter_001"]
+            cover._handle_coordinator_update()
+
+        assert mock_write.call_count == 2
+
+    def test_brightness_change_writes(self, mock_coordinator):
+        """Brightness is part of the light's derived state."""
+        light = EverhomeLight(
+            mock_coordinator, "light_001", mock_coordinator.data["light_001"]
+        )
+
+        with patch.object(light, "async_write_ha_state") as mock_write:
+            light._handle_coordinator_update()
+            mock_coordinator.data["light_001"] = {
+                **mock_coordinator.data["light_001"],
+                "states": {"general": "on", "brightness": 80},
+            }
+            light._handle_coordinator_update()
+            light._handle_coordinator_update()
+
+        assert mock_write.call_count == 2
+        assert mock_coordinator.metrics.state_writes_skipped == 1
+
+    def test_unavailable_when_update_failed(self, mock_coordinator):
+        """Entities are unavailable once the coordinator gives up on the data."""
+        cover = EverhomeCover(
+            mock_coordinator, "shutter_001", mock_coordinator.data["shutter_001"]
+        )
+        assert cover.available is True
+
+        mock_coordinator.last_update_success = False
+
+        assert cover.available is False
+
+    def test_last_snapshot_attribute_when_stale(self, mock_coordinator):
+        """The snapshot time is exposed only while serving stale data."""
+        cover = EverhomeCover(
+            mock_coordinator, "shutter_001", mock_coordinator.data["shutter_001"]
+        )
+        assert cover.extra_state_attributes is None
+
+        mock_coordinator.stale_since = SNAPSHOT_TIME
+
+        assert cover.extra_state_attributes == {ATTR_LAST_SNAPSHOT: SNAPSHOT_TIME}
+
+    def test_stale_polls_write_once(self, mock_coordinator):
+        """Failed polls serving the same snapshot write only when going stale."""
+        cover = EverhomeCover(
+            mock_coordinator, "shutter_001", mock_coordinator.data["shutter_001"]
+        )
+
+        with patch.object(cover, "async_write_ha_state") as mock_write:
+            cover._handle_coordinator_update()
+            mock_coordinator.stale_since = SNAPSHOT_TIME
+            for _ in range(3):
+                cover._handle_coordinator_update()
+            mock_coordinator.stale_since = None
+            cover._handle_coordinator_update()
+
+        assert mock_write.call_count == 3
+        assert mock_coordinator.metrics.state_writes_skipped == 2
+
+    async def test_command_refreshes_within_span(self, mock_coordinator):
+        """Commands execute and refresh inside a command span."""
+        cover = EverhomeCover(
+            mock_coordinator, "shutter_001", mock_coordinator.data["shutter_001"]
+        )
+        mock_coordinator.execute_device_action = AsyncMock(
+            return_value=CommandResult(True, 200)
+        )
+        mock_coordinator.async_request_refresh = AsyncMock()
+        mock_coordinator.tracer = MagicMock()
+
+        await cover._async_execute("up")
+
+        mock_coordinator.tracer.span.assert_called_once_with(
+            "command", device_id="shutter_001", action="up"
+        )
+        mock_coordinator.execute_device_action.assert_called_once_with(
+            "shutter_001", "up"
+        )
+        mock_coordinator.async_request_refresh.assert_called_once()
+
+    async def test_complete_returned_state_skips_refresh(self, mock_coordinator):
+        """No poll follows a command answered with the complete device state."""
+        cover = EverhomeCover(
+            mock_coordinator, "shutter_001", mock_coordinator.data["shutter_001"]
+        )
+        mock_coordinator.execute_device_action = AsyncMock(
+            return_value=CommandResult(True, 200, complete=True)
+        )
+        mock_coordinator.async_request_refresh = AsyncMock()
+        mock_coordinator.tracer = MagicMock()
+
+        await cover._async_execute("up")
+
+        mock_coordinator.async_request_refresh.assert_not_called()
@@ -41,6 +41,10 @@ class TestEverhomeInit:
 
         # Mock coordinator
         mock_coordinator = AsyncMock()
+        mock_coordinator.async_join_account = MagicMock()
+        mock_coordinator.async_leave_account = MagicMock()
+        mock_coordinator.push = False
+        mock_coordinator.fast_poll_interval = 30
         mock_coordinator.async_config_entry_first_refresh.return_value = None
 
         with (
@@ -53,6 +57,10 @@ class TestEverhomeInit:
             patch.object(
                 hass.config_entries, "async_forward_entry_setups"
             ) as mock_forward_setups,
+            patch("custom_components.everhome.async_get_scheduler") as mock_scheduler,
+            patch(
+                "custom_components.everhome.async_track_time_interval"
+            ) as mock_track_interval,
         ):
 
             mock_get_impl.return_value = mock_implementation
@@ -71,6 +79,45 @@ class TestEverhomeInit:
             # Verify coordinator was set up
             mock_coordinator.async_config_entry_first_refresh.assert_called_once()
             mock_forward_setups.assert_called_once_with(mock_config_entry, PLATFORMS)
+            mock_scheduler.return_value.async_add.assert_called_once_with(
+                mock_coordinator
+            )
+            mock_track_interval.assert_called_once()
+
+    async def test_setup_entry_push(
+        self,
+        hass: HomeAssistant,
+        mock_config_entry,
+    ):
+        """Test push mode registers the webhook instead of the fast tier."""
+        mock_config_entry.add_to_hass(hass)
+
+        mock_coordinator = AsyncMock()
+        mock_coordinator.async_join_account = MagicMock()
+        mock_coordinator.async_leave_account = MagicMock()
+        mock_coordinator.push = True
+
+        with (
+            patch(OAUTH2_GET_IMPL),
+            patch(OAUTH2_SESSION),
+            patch("custom_components.everhome.EverhomeAuth", return_value=AsyncMock()),
+            patch(
+                "custom_components.everhome.EverhomeDataUpdateCoordinator",
+                return_value=mock_coordinator,
+            ),
+            patch.object(hass.config_entries, "async_forward_entry_setups"),
+            patch("custom_components.everhome.async_get_scheduler"),
+            patch(
+                "custom_components.everhome.async_track_time_interval"
+            ) as mock_track_interval,
+            patch("custom_components.everhome.async_setup_push") as mock_setup_push,
+        ):
+            assert await async_setup_entry(hass, mock_config_entry) is True
+
+        mock_setup_push.assert_called_once_with(
+            hass, mock_config_entry, mock_coordinator
+        )
+        mock_track_interval.assert_not_called()
 
     async def test_setup_entry_auth_failed(
         self,
@@ -188,6 +235,10 @@ class TestEverhomeInit:
 
         # Mock coordinator that fails on first refresh
         mock_coordinator = AsyncMock()
+        mock_coordinator.async_join_account = MagicMock()
+        mock_coordinator.async_leave_account = MagicMock()
+        mock_coordinator.push = False
+        mock_coordinator.fast_poll_interval = 0
         mock_coordinator.async_config_entry_first_refresh.side_effect = Exception(
             "Refresh failed"
         )
@@ -218,6 +269,10 @@ class TestEverhomeInit:
         # Set up initial data
         hass.data.setdefault(DOMAIN, {})
         mock_coordinator = AsyncMock()
+        mock_coordinator.async_join_account = MagicMock()
+        mock_coordinator.async_leave_account = MagicMock()
+        mock_coordinator.push = False
+        mock_coordinator.fast_poll_interval = 0
         hass.data[DOMAIN][mock_config_entry.entry_id] = mock_coordinator
 
         with patch.object(
@@ -230,6 +285,7 @@ class TestEverhomeInit:
             assert result is True
             assert mock_config_entry.entry_id not in hass.data[DOMAIN]
             mock_unload_platforms.assert_called_once_with(mock_config_entry, PLATFORMS)
+            mock_coordinator.async_leave_account.assert_called_once()
 
     async def test_unload_entry_failure(
         self,
@@ -240,6 +296,10 @@ class TestEverhomeInit:
         # Set up initial data
         hass.data.setdefault(DOMAIN, {})
         mock_coordinator = AsyncMock()
+        mock_coordinator.async_join_account = MagicMock()
+        mock_coordinator.async_leave_account = MagicMock()
+        mock_coordinator.push = False
+        mock_coordinator.fast_poll_interval = 0
         hass.data[DOMAIN][mock_config_entry.entry_id] = mock_coordinator
 
         with patch.object(
@@ -290,6 +350,10 @@ class TestEverhomeInit:
         mock_auth = AsyncMock()
         mock_auth.async_get_access_token.return_value = "test_token"
         mock_coordinator = AsyncMock()
+        mock_coordinator.async_join_account = MagicMock()
+        mock_coordinator.async_leave_account = MagicMock()
+        mock_coordinator.push = False
+        mock_coordinator.fast_poll_interval = 0
         mock_coordinator.async_config_entry_first_refresh.return_value = None
 
         with (
@@ -300,6 +364,8 @@ class TestEverhomeInit:
                 "custom_components.everhome.EverhomeDataUpdateCoordinator"
             ) as mock_coordinator_class,
             patch.object(hass.config_entries, "async_forward_entry_setups"),
+            patch("custom_components.everhome.async_get_scheduler"),
+            patch("custom_components.everhome.async_track_time_interval"),
         ):
 
             mock_get_impl.return_value = mock_implementation
@@ -2,8 +2,6 @@
 
 from __future__ import annotations
 
-from unittest.mock import AsyncMock
-
 import pytest
 from homeassistant.components.light import ATTR_BRIGHTNESS, ColorMode
 from homeassistant.core import HomeAssistant
@@ -16,11 +14,9 @@ class TestEverhomeLight:
     """Test Everhome light entity."""
 
     @pytest.fixture
-    def mock_coordinator(self, mock_config_entry):
+    def mock_coordinator(self, mock_coordinator):
         """Mock coordinator with a mixed set of device data."""
-        coordinator = AsyncMock()
-        coordinator.entry = mock_config_entry
-        coordinator.data = {
+        mock_coordinator.data = {
             "light_001": {
                 "id": "light_001",
                 "name": "Living Room Light",
@@ -42,9 +38,7 @@ class TestEverhomeLight:
                 "states": {"general": "down"},
             },
         }
-        coordinator.execute_device_action = AsyncMock(return_value=True)
-        coordinator.async_request_refresh = AsyncMock()
-        return coordinator
+        return mock_coordinator
 
     # ------------------------------------------------------------------
     # async_setup_entry
@@ -0,0 +1,161 @@
+"""Test the memory retained by an Everhome setup with tracemalloc."""
+
+from __future__ import annotations
+
+import gc
+import logging
+import os
+import time
+import tracemalloc
+from collections import Counter
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.everhome.const import COVER_SUBTYPES, UPDATE_INTERVAL
+
+from .harness import async_attach_entities, async_simulated_coordinator
+from .simulator import EverhomeSimulator, build_population
+
+_LOGGER = logging.getLogger(__name__)
+
+# Bytes an account may retain per supported device, covering the snapshot
+# entry and the entities with their DeviceInfo and attributes
+RETAINED_BYTES_PER_DEVICE = 6_000
+
+# Bytes repeated polls may add to what a warmed up setup retains, which
+# leaves room for the bounded caches of aiohttp and yarl to keep filling
+POLL_GROWTH_ALLOWANCE = 16_000
+
+_PACKAGE = os.path.join("custom_components", "everhome")
+
+
+def _module(filename: str) -> str:
+    """Return a short module name for a source file."""
+    path = filename.replace(os.sep, "/")
+    if f"/{_PACKAGE.replace(os.sep, '/')}/" in path:
+        return "everhome." + path.rsplit("/", 1)[1].removesuffix(".py")
+    for marker in ("/site-packages/", "/lib/python3"):
+        if marker in path:
+            rest = path.split(marker, 1)[1].split("/")
+            # Skip the version component of the standard library path
+            return rest[1 if marker == "/lib/python3" else 0].removesuffix(".py")
+    return path.rsplit("/", 1)[-1].removesuffix(".py")
+
+
+def retained_by_module(
+    before: tracemalloc.Snapshot, after: tracemalloc.Snapshot
+) -> Counter[str]:
+    """Group the bytes retained between two snapshots by module.
+
+    An allocation counts towards the innermost integration module on its
+    traceback, so dicts decoded by json for the parser count as parser
+    memory, and towards the allocating module otherwise.
+    """
+    grouped: Counter[str] = Counter()
+    for stat in after.compare_to(before, "traceback"):
+        if not stat.size_diff:
+            continue
+        frames = list(reversed(stat.traceback))
+        owner = next(
+            (frame for frame in frames if _PACKAGE in frame.filename), frames[0]
+        )
+        grouped[_module(owner.filename)] += stat.size_diff
+    return grouped
+
+
+def _snapshot() -> tracemalloc.Snapshot:
+    gc.collect()
+    return tracemalloc.take_snapshot().filter_traces(
+        [tracemalloc.Filter(False, tracemalloc.__file__)]
+    )
+
+
+@pytest.fixture
+def traced():
+    """Trace allocations during the test."""
+    tracemalloc.start(10)
+    yield
+    tracemalloc.stop()
+
+
+class TestMemoryFootprint:
+    """Test the retained size of coordinator data and entities."""
+
+    @pytest.fixture(autouse=True)
+    def _sockets(self, socket_enabled):
+        """Allow the simulator to listen on localhost."""
+
+    @pytest.mark.parametrize(
+        "devices", [100, pytest.param(1_000, marks=pytest.mark.soak)]
+    )
+    async def test_retained_bytes_per_device(
+        self, hass: HomeAssistant, traced, devices: int
+    ):
+        """A full setup stays within the per-device budget."""
+        simulator = EverhomeSimulator(
+            build_population(devices, unsupported=devices // 4), time_scale=0
+        )
+        async with async_simulated_coordinator(hass, simulator) as coordinator:
+            # Connections and lazily created state are not per device
+            await coordinator.async_refresh()
+            coordinator.data = {}
+            before = _snapshot()
+
+            await coordinator.async_refresh()
+            entities = await async_attach_entities(hass, coordinator)
+            after = _snapshot()
+
+            report = retained_by_module(before, after)
+            retained = sum(report.values())
+            _LOGGER.info(
+                "%d devices, %d entities retain %d bytes: %s",
+                devices,
+                len(entities),
+                retained,
+                report.most_common(10),
+            )
+            assert retained / devices <= RETAINED_BYTES_PER_DEVICE
+
+    @pytest.mark.parametrize(
+        "hours", [1, pytest.param(6, marks=pytest.mark.soak)], ids=lambda h: f"{h}h"
+    )
+    async def test_polls_do_not_grow(
+        self, hass: HomeAssistant, traced, freezer, caplog, hours: int
+    ):
+        """Hours of polls and commands leave the retained memory flat."""
+        # Captured debug records would otherwise be retained by the test
+        caplog.set_level(logging.WARNING)
+        # A debug loop keeps tracebacks and reprs of handles it has scheduled
+        hass.loop.set_debug(False)
+        simulator = EverhomeSimulator(
+            build_population(20), clock=lambda: time.monotonic(), time_scale=0
+        )
+        async with async_simulated_coordinator(hass, simulator) as coordinator:
+            await coordinator.async_refresh()
+            await async_attach_entities(hass, coordinator)
+            covers = [
+                device.id
+                for device in simulator.devices.values()
+                if device.subtype in COVER_SUBTYPES
+            ]
+
+            async def run_hours(hours: int) -> None:
+                for poll in range(hours * 3600 // UPDATE_INTERVAL):
+                    freezer.tick(UPDATE_INTERVAL)
+                    action = "up" if poll % 2 else "down"
+                    await coordinator.execute_device_action(
+                        covers[poll % len(covers)], action
+                    )
+                    await coordinator.async_refresh()
+
+            # Let the latency windows and connection pool reach their steady state
+            await run_hours(hours)
+            before = _snapshot()
+            await run_hours(hours)
+            after = _snapshot()
+
+            report = retained_by_module(before, after)
+            assert (
+                sum(report.values()) <= POLL_GROWTH_ALLOWANCE
+            ), f"Growth over {hours} hours: {report.most_common(10)}"
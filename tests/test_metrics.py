@@ -0,0 +1,70 @@
+"""Test Everhome in-process metrics."""
+
+from __future__ import annotations
+
+from custom_components.everhome.metrics import (
+    LATENCY_WINDOW,
+    CallLog,
+    EverhomeMetrics,
+    LatencyHistogram,
+)
+
+
+class TestEverhomeMetrics:
+    """Test Everhome metrics counters."""
+
+    def test_percentiles(self):
+        """Rolling percentiles use the nearest-rank method."""
+        metrics = EverhomeMetrics()
+        for latency in range(1, 21):
+            metrics.record_poll(latency / 100, 0, 0, 0)
+
+        assert metrics.poll_latency_p50 == 0.1
+        assert metrics.poll_latency_p95 == 0.19
+
+    def test_latency_window_is_bounded(self):
+        """Only the most recent samples are kept."""
+        metrics = EverhomeMetrics()
+        for _ in range(LATENCY_WINDOW + 10):
+            metrics.record_command(0.1, True, "up")
+
+        assert len(metrics.command_latencies) == LATENCY_WINDOW
+        assert metrics.commands == LATENCY_WINDOW + 10
+
+    def test_error_rate_without_commands(self):
+        """No commands means no error rate."""
+        assert EverhomeMetrics().command_error_rate is None
+
+    def test_call_log_wraps_around(self):
+        """The call log keeps only the newest calls, oldest first."""
+        log = CallLog(size=3)
+        for status in (200, 201, 202, 203, 204):
+            log.record("GET /device", status, 0.1, 10)
+
+        assert len(log) == 3
+        assert [call["status"] for call in log.as_list()] == [202, 203, 204]
+
+    def test_histogram_buckets(self):
+        """Samples land in the first bucket whose bound they do not exceed."""
+        histogram = LatencyHistogram()
+        histogram.observe(0.05)
+        histogram.observe(0.3)
+        histogram.observe(60.0)
+
+        buckets = histogram.as_dict()["buckets"]
+        assert buckets["0.05"] == 1
+        assert buckets["0.5"] == 1
+        assert buckets["+Inf"] == 1
+        assert histogram.count == 3
+
+    def test_record_call_per_endpoint(self):
+        """Each endpoint gets its own histogram."""
+        metrics = EverhomeMetrics()
+        metrics.record_call("GET /device", 200, 0.1, 100)
+        metrics.record_call("POST /device/{device_id}/execute", 200, 0.2, 0)
+
+        assert set(metrics.histograms) == {
+            "GET /device",
+            "POST /device/{device_id}/execute",
+        }
+        assert len(metrics.calls) == 2
@@ -0,0 +1,88 @@
+"""Test the incremental /device list parser."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from custom_components.everhome.const import SUPPORTED_SUBTYPES
+from custom_components.everhome.parser import DeviceListParser
+
+
+def _parse(body: bytes, chunk_size: int) -> tuple[DeviceListParser, list[dict]]:
+    parser = DeviceListParser(SUPPORTED_SUBTYPES)
+    devices = []
+    for index in range(0, len(body), chunk_size):
+        devices.extend(parser.feed(body[index : index + chunk_size]))
+    parser.close()
+    return parser, devices
+
+
+class TestDeviceListParser:
+    """Test the streaming device list parser."""
+
+    DEVICES = [
+        {"id": "gateway_001", "subtype": "gateway", "states": {"general": "on"}},
+        {
+            "id": "shutter_001",
+            "name": 'Kitchen "south" {window}',
+            "room": "Kitchen",
+            "subtype": "shutter",
+            "states": {"general": "open"},
+            "position": 40,
+        },
+        {"subtype": "meter", "id": "meter_001", "readings": [{"subtype": "light"}]},
+        {"id": "light_001", "name": "subtype", "subtype": "light"},
+        {"id": "unknown_001"},
+        {"id": "broken_001", "subtype": None},
+    ]
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, 5, 64, 100_000])
+    def test_keeps_supported_devices(self, chunk_size):
+        """Results do not depend on where the chunks are split."""
+        body = json.dumps(self.DEVICES).encode()
+
+        parser, devices = _parse(body, chunk_size)
+
+        assert devices == [
+            {
+                "id": "shutter_001",
+                "name": 'Kitchen "south" {window}',
+                "subtype": "shutter",
+                "states": {"general": "open"},
+                "position": 40,
+            },
+            {"id": "light_001", "name": "subtype", "subtype": "light"},
+        ]
+        assert parser.decoded == len(self.DEVICES)
+
+    def test_peak_buffer_is_bounded(self):
+        """Memory does not grow with the number of devices."""
+        devices = [
+            {"id": f"meter_{index}", "subtype": "meter", "data": "x" * 500}
+            for index in range(1000)
+        ]
+        devices.append({"id": "shutter_001", "subtype": "shutter"})
+        body = json.dumps(devices).encode()
+
+        parser, result = _parse(body, 4096)
+
+        assert [device["id"] for device in result] == ["shutter_001"]
+        assert parser.peak_buffer < 4096 + 1024
+        assert len(body) > 500_000
+
+    def test_truncated_list(self):
+        """A list cut off mid-device is rejected on close."""
+        parser = DeviceListParser(SUPPORTED_SUBTYPES)
+        parser.feed(b'[{"id": "shutter_001", "subtype": "shut')
+
+        with pytest.raises(ValueError, match="Truncated"):
+            parser.close()
+
+    def test_not_a_list(self):
+        """A top level object is rejected."""
+        parser = DeviceListParser(SUPPORTED_SUBTYPES)
+
+        with pytest.raises(ValueError, match="not a JSON array"):
+            parser.feed(b'{"error": "maintenance"}')
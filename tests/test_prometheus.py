@@ -0,0 +1,125 @@
+"""Test the Everhome Prometheus metrics endpoint."""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+import pytest
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.everhome.const import CONF_METRICS_PER_DEVICE, DOMAIN
+from custom_components.everhome.metrics import EverhomeMetrics
+from custom_components.everhome.prometheus import (
+    CONTENT_TYPE,
+    EverhomeMetricsView,
+    render_metrics,
+)
+
+
+class TestEverhomePrometheus:
+    """Test Prometheus rendering of Everhome metrics."""
+
+    @pytest.fixture
+    def mock_coordinator(self, mock_config_entry):
+        """Mock coordinator with recorded activity."""
+        coordinator = MagicMock()
+        coordinator.entry = mock_config_entry
+        coordinator.auth.token_refreshes = 2
+        coordinator.data = {"shutter_001": {"id": "shutter_001"}}
+        coordinator.missed_polls = {"shutter_001": 1}
+        coordinator.last_seen = {}
+        metrics = coordinator.metrics = EverhomeMetrics()
+        metrics.record_poll(0.2, 100, 3, 1)
+        metrics.record_call("GET /device", 200, 0.2, 100)
+        metrics.record_call("GET /device", 429, 0.02, 0)
+        metrics.record_command(0.1, True, "up")
+        metrics.record_command(0.1, False, "up")
+        metrics.state_writes_skipped = 7
+        metrics.record_loop_block("decode", 0.25, True)
+        return coordinator
+
+    def _setup(self, hass: HomeAssistant, coordinator) -> None:
+        hass.data.setdefault(DOMAIN, {})
+        hass.data[DOMAIN][coordinator.entry.entry_id] = coordinator
+
+    async def test_render_counters(self, hass: HomeAssistant, mock_coordinator):
+        """Counters are rendered once per family with entry labels."""
+        self._setup(hass, mock_coordinator)
+
+        text = render_metrics(hass)
+
+        assert text.count("# TYPE everhome_polls_total counter") == 1
+        assert 'everhome_polls_total{entry="test_entry_id"} 1' in text
+        assert 'everhome_token_refreshes_total{entry="test_entry_id"} 2' in text
+        assert 'everhome_throttled_total{entry="test_entry_id"} 1' in text
+        assert (
+            'everhome_state_writes_total{entry="test_entry_id",result="skipped"} 7'
+            in text
+        )
+        assert (
+            'everhome_commands_total{entry="test_entry_id",action="up",'
+            'outcome="error"} 1' in text
+        )
+
+    async def test_render_histogram(self, hass: HomeAssistant, mock_coordinator):
+        """Histogram buckets are cumulative."""
+        self._setup(hass, mock_coordinator)
+
+        text = render_metrics(hass)
+
+        labels = 'entry="test_entry_id",endpoint="GET /device"'
+        assert f'everhome_request_duration_seconds_bucket{{{labels},le="0.05"}} 1' in (
+            text
+        )
+        assert f'everhome_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2' in (
+            text
+        )
+        assert f"everhome_request_duration_seconds_count{{{labels}}} 2" in text
+
+    async def test_render_loop_stalls(self, hass: HomeAssistant, mock_coordinator):
+        """Loop stalls are labelled by section."""
+        self._setup(hass, mock_coordinator)
+
+        text = render_metrics(hass)
+
+        labels = 'entry="test_entry_id",section="decode"'
+        assert f"everhome_loop_stalls_total{{{labels}}} 1" in text
+        assert f"everhome_loop_block_max_seconds{{{labels}}} 0.25" in text
+
+    async def test_per_device_series_disabled_by_default(
+        self, hass: HomeAssistant, mock_coordinator
+    ):
+        """No per-device series are rendered unless enabled."""
+        self._setup(hass, mock_coordinator)
+
+        assert "everhome_device_" not in render_metrics(hass)
+
+    async def test_per_device_series_enabled(
+        self, hass: HomeAssistant, mock_coordinator
+    ):
+        """Per-device series are rendered when the option is set."""
+        mock_coordinator.entry = MockConfigEntry(
+            domain=DOMAIN,
+            entry_id="per_device_entry",
+            options={CONF_METRICS_PER_DEVICE: True},
+        )
+        self._setup(hass, mock_coordinator)
+
+        text = render_metrics(hass)
+
+        assert (
+            'everhome_device_missed_polls{entry="per_device_entry",'
+            'device="shutter_001"} 1' in text
+        )
+
+    async def test_view_requires_auth(self, hass: HomeAssistant, mock_coordinator):
+        """The view is authenticated and returns the exposition format."""
+        self._setup(hass, mock_coordinator)
+        view = EverhomeMetricsView(hass)
+
+        response = await view.get(MagicMock())
+
+        assert view.requires_auth is True
+        assert response.headers["Content-Type"] == CONTENT_TYPE
+        assert b"everhome_polls_total" in response.body
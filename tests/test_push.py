@@ -0,0 +1,165 @@
+"""Test Everhome webhook push."""
+
+from __future__ import annotations
+
+import json
+import logging
+from http import HTTPStatus
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from homeassistant.components import webhook
+from homeassistant.const import CONF_WEBHOOK_ID
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+from homeassistant.util.aiohttp import MockRequest
+
+from custom_components.everhome.const import CONF_PUSH, CONF_PUSH_URL, DOMAIN
+from custom_components.everhome.coordinator import EverhomeDataUpdateCoordinator
+from custom_components.everhome.push import async_setup_push
+
+
+async def _post(hass: HomeAssistant, webhook_id: str, body: bytes) -> int:
+    """Post a synthetic event to a webhook, return the response status."""
+    request = MockRequest(content=body, mock_source="test", method="POST")
+    response = await webhook.async_handle_webhook(hass, webhook_id, request)
+    return response.status
+
+
+class TestEverhomePush:
+    """Test pushing device changes to the webhook."""
+
+    @pytest.fixture
+    async def coordinator(self, hass: HomeAssistant, mock_config_entry):
+        """Set up push for an entry with one known device."""
+        assert await async_setup_component(hass, "webhook", {})
+        mock_config_entry.add_to_hass(hass)
+        hass.config_entries.async_update_entry(
+            mock_config_entry, options={CONF_PUSH: True}
+        )
+        coordinator = EverhomeDataUpdateCoordinator(
+            hass, AsyncMock(), mock_config_entry
+        )
+        coordinator.data = {
+            "shutter_001": {
+                "id": "shutter_001",
+                "subtype": "shutter",
+                "states": {"general": "down"},
+            }
+        }
+        hass.data.setdefault(DOMAIN, {})[mock_config_entry.entry_id] = coordinator
+        async_setup_push(hass, mock_config_entry, coordinator)
+        yield coordinator
+        hass.data[DOMAIN].pop(mock_config_entry.entry_id)
+
+    async def test_webhook_id_is_stored(self, coordinator, mock_config_entry):
+        """Test setup generates and keeps a webhook id."""
+        webhook_id = mock_config_entry.data[CONF_WEBHOOK_ID]
+        assert webhook_id
+
+        # A reload keeps the id configured in the cloud
+        webhook.async_unregister(coordinator.hass, webhook_id)
+        async_setup_push(coordinator.hass, mock_config_entry, coordinator)
+        assert mock_config_entry.data[CONF_WEBHOOK_ID] == webhook_id
+
+    async def test_webhook_id_is_not_logged(
+        self, coordinator, mock_config_entry, caplog
+    ):
+        """Test the logged push URL leaves out the secret webhook id."""
+        webhook_id = mock_config_entry.data[CONF_WEBHOOK_ID]
+        webhook.async_unregister(coordinator.hass, webhook_id)
+        caplog.set_level(logging.DEBUG, logger="custom_components.everhome.push")
+
+        with patch(
+            "homeassistant.components.webhook.async_generate_url",
+            return_value=f"https://example.com/api/webhook/{webhook_id}",
+        ):
+            async_setup_push(coordinator.hass, mock_config_entry, coordinator)
+
+        assert "https://example.com/api/webhook/**REDACTED**" in caplog.text
+        assert webhook_id not in caplog.text
+        assert [
+            record.levelno
+            for record in caplog.records
+            if record.name == "custom_components.everhome.push"
+        ] == [logging.DEBUG]
+
+    async def test_push_url_is_shown(self, coordinator, mock_config_entry):
+        """Test the full push URL is shown once per URL in a notification."""
+        hass = coordinator.hass
+        webhook_id = mock_config_entry.data[CONF_WEBHOOK_ID]
+        url = f"https://example.com/api/webhook/{webhook_id}"
+
+        with (
+            patch(
+                "homeassistant.components.webhook.async_generate_url",
+                return_value=url,
+            ),
+            patch(
+                "custom_components.everhome.push.persistent_notification.async_create"
+            ) as notify,
+        ):
+            webhook.async_unregister(hass, webhook_id)
+            async_setup_push(hass, mock_config_entry, coordinator)
+            # A restart with the same URL does not notify again
+            webhook.async_unregister(hass, webhook_id)
+            async_setup_push(hass, mock_config_entry, coordinator)
+
+        notify.assert_called_once()
+        assert url in notify.call_args.args[1]
+        assert mock_config_entry.data[CONF_PUSH_URL] == url
+
+    async def test_push_updates_device(
+        self, hass: HomeAssistant, coordinator, mock_config_entry
+    ):
+        """Test a synthetic event updates the device in place."""
+        updates = []
+        coordinator.async_add_listener(lambda: updates.append(True))
+        body = {"devices": [{"id": "shutter_001", "states": {"general": "up"}}]}
+
+        status = await _post(
+            hass, mock_config_entry.data[CONF_WEBHOOK_ID], json.dumps(body).encode()
+        )
+
+        assert status == HTTPStatus.OK
+        assert coordinator.data["shutter_001"]["states"] == {"general": "up"}
+        assert coordinator.metrics.push_events == 1
+        assert updates == [True]
+
+    async def test_push_single_device(
+        self, hass: HomeAssistant, coordinator, mock_config_entry
+    ):
+        """Test a payload may carry a single device object."""
+        status = await _post(
+            hass,
+            mock_config_entry.data[CONF_WEBHOOK_ID],
+            b'{"id": "shutter_001", "position": 40}',
+        )
+
+        assert status == HTTPStatus.OK
+        assert coordinator.data["shutter_001"]["position"] == 40
+
+    @pytest.mark.parametrize("body", [b"not json", b"[1, 2", b'"device"'])
+    async def test_invalid_payload(
+        self, hass: HomeAssistant, coordinator, mock_config_entry, body
+    ):
+        """Test invalid payloads are rejected without touching the data."""
+        data = coordinator.data
+
+        status = await _post(hass, mock_config_entry.data[CONF_WEBHOOK_ID], body)
+
+        assert status == HTTPStatus.BAD_REQUEST
+        assert coordinator.data is data
+        assert coordinator.metrics.push_events == 0
+
+    async def test_unloaded_entry(
+        self, hass: HomeAssistant, coordinator, mock_config_entry
+    ):
+        """Test pushes for an entry without a coordinator are not found."""
+        hass.data[DOMAIN][mock_config_entry.entry_id] = MagicMock()
+
+        status = await _post(
+            hass, mock_config_entry.data[CONF_WEBHOOK_ID], b'{"id": "shutter_001"}'
+        )
+
+        assert status == HTTPStatus.NOT_FOUND
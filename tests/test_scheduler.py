@@ -0,0 +1,129 @@
+"""Test the Everhome poll scheduler."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.everhome.const import DATA_SCHEDULER
+from custom_components.everhome.metrics import EverhomeMetrics
+from custom_components.everhome.scheduler import PollScheduler, async_get_scheduler
+
+
+def _coordinator(entry_id: str) -> MagicMock:
+    coordinator = MagicMock()
+    coordinator.entry.entry_id = entry_id
+    coordinator.leader = None
+    coordinator.poll_interval = 300
+    coordinator.metrics = EverhomeMetrics()
+    coordinator.async_refresh = AsyncMock()
+    return coordinator
+
+
+class TestPollScheduler:
+    """Test spreading polls of several entries."""
+
+    async def _advance(self, hass: HomeAssistant, freezer, seconds: float) -> None:
+        freezer.tick(timedelta(seconds=seconds))
+        async_fire_time_changed(hass)
+        await hass.async_block_till_done()
+
+    async def test_phases_are_spread(self, hass: HomeAssistant, freezer):
+        """Entries get evenly spaced phases."""
+        scheduler = PollScheduler(hass, interval=300, jitter=0)
+        coordinators = [_coordinator(f"entry_{index}") for index in range(3)]
+
+        removers = [scheduler.async_add(c) for c in coordinators]
+
+        assert [c.metrics.poll_phase for c in coordinators] == [0, 100, 200]
+
+        removers[1]()
+        assert [
+            coordinators[0].metrics.poll_phase,
+            coordinators[2].metrics.poll_phase,
+        ] == [0, 150]
+        for remove in (removers[0], removers[2]):
+            remove()
+
+    async def test_polls_follow_phases(self, hass: HomeAssistant, freezer):
+        """Each entry polls once per interval at its own phase."""
+        scheduler = PollScheduler(hass, interval=300, jitter=0)
+        first, second = _coordinator("entry_1"), _coordinator("entry_2")
+        removers = [scheduler.async_add(first), scheduler.async_add(second)]
+
+        # Both entries just ran their first refresh during setup, so the
+        # first entry skips its phase 0 slot
+        await self._advance(hass, freezer, 149)
+        assert first.async_refresh.await_count == 0
+        assert second.async_refresh.await_count == 0
+
+        await self._advance(hass, freezer, 2)
+        assert first.async_refresh.await_count == 0
+        assert second.async_refresh.await_count == 1
+
+        await self._advance(hass, freezer, 150)
+        assert first.async_refresh.await_count == 1
+        assert first.metrics.last_poll_spacing == pytest.approx(301)
+
+        await self._advance(hass, freezer, 150)
+        assert second.async_refresh.await_count == 2
+        assert second.metrics.last_poll_spacing == pytest.approx(300)
+
+        for remove in removers:
+            remove()
+
+    async def test_followers_are_skipped(self, hass: HomeAssistant, freezer):
+        """Entries mirroring another entry of their account do not poll."""
+        scheduler = PollScheduler(hass, interval=300, jitter=0)
+        follower = _coordinator("entry_1")
+        follower.leader = MagicMock()
+        remove = scheduler.async_add(follower)
+
+        await self._advance(hass, freezer, 301)
+
+        follower.async_refresh.assert_not_awaited()
+        remove()
+
+    async def test_concurrent_polls_are_capped(self, hass: HomeAssistant, freezer):
+        """No more than max_concurrent polls run at once."""
+        scheduler = PollScheduler(hass, interval=300, jitter=0, max_concurrent=1)
+        release = asyncio.Event()
+        running = []
+        peak = 0
+
+        async def refresh() -> None:
+            nonlocal peak
+            running.append(1)
+            peak = max(peak, len(running))
+            await release.wait()
+            running.pop()
+
+        coordinators = [_coordinator(f"entry_{index}") for index in range(3)]
+        for coordinator in coordinators:
+            coordinator.async_refresh = AsyncMock(side_effect=refresh)
+        polls = [
+            hass.async_create_task(
+                scheduler._async_poll(
+                    MagicMock(coordinator=coordinator, last_poll=None)
+                )
+            )
+            for coordinator in coordinators
+        ]
+        await asyncio.sleep(0)
+        release.set()
+        await asyncio.gather(*polls)
+
+        assert peak == 1
+        assert all(c.async_refresh.await_count == 1 for c in coordinators)
+
+    async def test_shared_scheduler(self, hass: HomeAssistant):
+        """All entries use the same scheduler."""
+        scheduler = async_get_scheduler(hass)
+
+        assert async_get_scheduler(hass) is scheduler
+        assert hass.data[DATA_SCHEDULER] is scheduler
@@ -0,0 +1,137 @@
+"""Test Everhome diagnostic sensors."""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock
+
+import pytest
+from homeassistant.const import EntityCategory
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.everhome.budget import RequestBudget
+from custom_components.everhome.const import DOMAIN
+from custom_components.everhome.coordinator import EverhomeDataUpdateCoordinator
+from custom_components.everhome.metrics import EverhomeMetrics
+from custom_components.everhome.sensor import (
+    BUDGET_SENSORS,
+    SENSORS,
+    EverhomeDiagnosticSensor,
+    async_setup_entry,
+)
+
+
+class TestEverhomeDiagnosticSensor:
+    """Test Everhome diagnostic sensor entities."""
+
+    @pytest.fixture
+    def mock_coordinator(self, mock_coordinator):
+        """Mock coordinator with some recorded metrics."""
+        mock_coordinator.metrics.record_poll(0.25, 2048, 10, 4)
+        mock_coordinator.metrics.record_poll(0.75, 4096, 12, 5)
+        mock_coordinator.metrics.record_command(0.1, True, "up")
+        mock_coordinator.metrics.record_command(0.3, False, "down")
+        return mock_coordinator
+
+    def _sensor(self, coordinator, key: str) -> EverhomeDiagnosticSensor:
+        description = next(d for d in SENSORS + BUDGET_SENSORS if d.key == key)
+        return EverhomeDiagnosticSensor(coordinator, description)
+
+    async def test_async_setup_entry_creates_all_sensors(
+        self, hass: HomeAssistant, mock_config_entry, mock_coordinator
+    ):
+        """One sensor per description is created for the config entry."""
+        hass.data.setdefault(DOMAIN, {})
+        hass.data[DOMAIN][mock_config_entry.entry_id] = mock_coordinator
+
+        entities: list[EverhomeDiagnosticSensor] = []
+
+        def mock_add_entities(new_entities):
+            entities.extend(new_entities)
+
+        await async_setup_entry(hass, mock_config_entry, mock_add_entities)
+
+        assert len(entities) == len(SENSORS)
+        assert all(e.entity_category == EntityCategory.DIAGNOSTIC for e in entities)
+        unique_ids = {e.unique_id for e in entities}
+        assert f"{DOMAIN}_{mock_config_entry.entry_id}_poll_latency" in unique_ids
+
+    async def test_budget_sensors_with_budget(
+        self, hass: HomeAssistant, mock_config_entry, mock_coordinator
+    ):
+        """Budget sensors are only created when a budget is configured."""
+        mock_coordinator.budget = RequestBudget(1000, 86400)
+        mock_coordinator.metrics.budget_remaining = 990
+        mock_coordinator.metrics.poll_interval = 300.0
+        hass.data.setdefault(DOMAIN, {})
+        hass.data[DOMAIN][mock_config_entry.entry_id] = mock_coordinator
+        entities: list[EverhomeDiagnosticSensor] = []
+
+        await async_setup_entry(hass, mock_config_entry, entities.extend)
+
+        assert len(entities) == len(SENSORS) + len(BUDGET_SENSORS)
+        assert self._sensor(mock_coordinator, "budget_remaining").native_value == 990
+        assert (
+            self._sensor(mock_coordinator, "budget_exhausted_in").native_value is None
+        )
+        assert self._sensor(mock_coordinator, "poll_interval").native_value == 300
+
+    def test_poll_values(self, mock_coordinator):
+        """Poll sensors report the latest and rolling values."""
+        assert self._sensor(mock_coordinator, "poll_latency").native_value == 750.0
+        assert self._sensor(mock_coordinator, "poll_latency_p50").native_value == 250.0
+        assert self._sensor(mock_coordinator, "poll_latency_p95").native_value == 750.0
+        assert self._sensor(mock_coordinator, "payload_size").native_value == 4096
+        assert self._sensor(mock_coordinator, "decoded_devices").native_value == 12
+        assert self._sensor(mock_coordinator, "supported_devices").native_value == 5
+
+    def test_command_values(self, mock_coordinator):
+        """Command sensors report latency and error rate."""
+        assert self._sensor(mock_coordinator, "command_latency").native_value == 300.0
+        assert self._sensor(mock_coordinator, "command_error_rate").native_value == 50.0
+
+    def test_values_before_first_sample(self, mock_coordinator):
+        """Sensors report unknown until something has been measured."""
+        mock_coordinator.metrics = EverhomeMetrics()
+
+        for description in SENSORS:
+            assert self._sensor(mock_coordinator, description.key).native_value is None
+
+    async def test_follower_reports_leader_polls(self, hass: HomeAssistant):
+        """An entry sharing another's poller reports that poller's polls."""
+        coordinators = []
+        for title in ("First", "Second"):
+            entry = MockConfigEntry(domain=DOMAIN, title=title)
+            coordinator = EverhomeDataUpdateCoordinator(hass, AsyncMock(), entry)
+            coordinator.data = {"shutter_001": {"id": "shutter_001"}}
+            coordinator.async_join_account()
+            coordinators.append(coordinator)
+        leader, follower = coordinators
+        leader.metrics.record_poll(0.25, 2048, 10, 4)
+        follower.metrics.record_command(0.1, False, "up")
+
+        try:
+            assert follower.leader is leader
+            assert self._sensor(follower, "poll_latency").native_value == 250.0
+            assert self._sensor(follower, "supported_devices").native_value == 4
+            # Commands are sent by each entry itself
+            assert self._sensor(follower, "command_error_rate").native_value == 100
+            assert self._sensor(leader, "command_error_rate").native_value is None
+        finally:
+            for coordinator in coordinators:
+                coordinator.async_leave_account()
+                await coordinator.async_shutdown()
+
+    def test_always_available(self, mock_coordinator):
+        """Diagnostic sensors stay available when polls fail."""
+        mock_coordinator.last_update_success = False
+
+        assert self._sensor(mock_coordinator, "poll_latency").available is True
+
+    def test_device_info(self, mock_coordinator, mock_config_entry):
+        """Sensors are grouped under a service device for the entry."""
+        sensor = self._sensor(mock_coordinator, "poll_latency")
+
+        assert sensor.device_info["identifiers"] == {
+            (DOMAIN, mock_config_entry.entry_id)
+        }
@@ -0,0 +1,167 @@
+"""Test the local Everhome cloud simulator."""
+
+from __future__ import annotations
+
+from collections import Counter
+
+import aiohttp
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.everhome.const import SUPPORTED_SUBTYPES
+
+from .harness import async_simulated_coordinator
+from .simulator import (
+    COVER_SPEED,
+    UNSUPPORTED_SUBTYPES,
+    EverhomeSimulator,
+    SimulatedDevice,
+    build_population,
+)
+
+
+class FakeClock:
+    """Clock advanced by hand."""
+
+    def __init__(self) -> None:
+        """Start at zero."""
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        """Return the current time."""
+        return self.now
+
+
+class TestSimulatedDevices:
+    """Test the simulated device population."""
+
+    def test_population_covers_all_subtypes(self):
+        """Devices are spread evenly across the supported subtypes."""
+        devices = build_population(len(SUPPORTED_SUBTYPES) * 3, unsupported=4)
+
+        counts = Counter(device.subtype for device in devices)
+        assert {subtype: counts[subtype] for subtype in SUPPORTED_SUBTYPES} == {
+            subtype: 3 for subtype in SUPPORTED_SUBTYPES
+        }
+        assert sum(counts[subtype] for subtype in UNSUPPORTED_SUBTYPES) == 4
+        assert len({device.id for device in devices}) == len(devices)
+
+    def test_population_is_reproducible(self):
+        """The same seed builds the same account."""
+        first = [device.as_dict() for device in build_population(40, seed=3)]
+        second = [device.as_dict() for device in build_population(40, seed=3)]
+        assert first == second
+
+    def test_cover_travels_over_time(self):
+        """A cover reports its movement until it reaches the target."""
+        cover = SimulatedDevice(
+            id="shutter_1",
+            name="Shutter",
+            subtype="shutter",
+            states={"general": "up"},
+            position=100.0,
+            capabilities=["up", "down", "stop", "set_position"],
+        )
+
+        assert cover.execute("down", {}, 0.0)
+        cover.advance(50 / COVER_SPEED)
+        assert cover.as_dict()["position"] == 50
+        assert cover.states["general"] == "closing"
+
+        cover.advance(100 / COVER_SPEED)
+        assert cover.as_dict()["position"] == 0
+        assert cover.states["general"] == "down"
+
+        assert cover.execute("set_position", {"position": 30}, 200.0)
+        cover.advance(200.0 + 10 / COVER_SPEED)
+        assert cover.execute("stop", {}, 200.0 + 10 / COVER_SPEED)
+        assert cover.as_dict()["position"] == 10
+        assert cover.states["general"] == "stopped"
+
+    def test_sensors_reject_commands(self):
+        """Sensors do not accept commands."""
+        sensor = build_population(1, subtypes=["smokedetector"])[0]
+        assert not sensor.execute("on", {}, 0.0)
+
+
+class TestSimulatorServer:
+    """Test the integration against the simulator over HTTP."""
+
+    @pytest.fixture
+    async def simulator(self, socket_enabled):
+        """Simulate an account on a hand driven clock."""
+        return EverhomeSimulator(build_population(26, unsupported=5), clock=FakeClock())
+
+    @pytest.fixture
+    async def coordinator(self, hass: HomeAssistant, simulator):
+        """Create a coordinator polling the simulator."""
+        async with async_simulated_coordinator(hass, simulator) as coordinator:
+            yield coordinator
+
+    async def test_poll(self, coordinator, simulator):
+        """A poll returns the supported devices only."""
+        await coordinator.async_refresh()
+
+        assert coordinator.last_update_success
+        assert len(coordinator.data) == 26
+        assert simulator.requests["GET /device"] == 1
+
+    async def test_command_moves_cover(self, coordinator, simulator):
+        """A command starts a cover moving, later polls see it arrive."""
+        shutter = next(
+            device
+            for device in simulator.devices.values()
+            if device.subtype == "shutter"
+        )
+        shutter.position = 100.0
+        shutter.states["general"] = "up"
+
+        assert await coordinator.execute_device_action(shutter.id, "down")
+        await coordinator.async_refresh()
+        assert coordinator.data[shutter.id]["states"]["general"] == "closing"
+
+        simulator.clock.now += 100 / COVER_SPEED
+        await coordinator.async_refresh()
+        assert coordinator.data[shutter.id]["position"] == 0
+        assert coordinator.data[shutter.id]["states"]["general"] == "down"
+        assert simulator.requests["POST /device/{device_id}/execute"] == 1
+
+    async def test_unsupported_command(self, coordinator, simulator):
+        """Commands a device does not support fail."""
+        sensor = next(
+            device
+            for device in simulator.devices.values()
+            if device.subtype == "waterdetector"
+        )
+        assert not await coordinator.execute_device_action(sensor.id, "on")
+
+    async def test_token_required(self, simulator):
+        """Requests without a valid token are rejected."""
+        await simulator.start()
+        async with aiohttp.ClientSession() as session:
+            async with session.get(f"{simulator.base_url}/device") as resp:
+                assert resp.status == 401
+            async with session.post(
+                f"{simulator.base_url}/oauth2/token",
+                data={"grant_type": "refresh_token", "refresh_token": "x"},
+            ) as resp:
+                token = (await resp.json())["access_token"]
+            async with session.get(
+                f"{simulator.base_url}/device",
+                headers={"Authorization": f"Bearer {token}"},
+            ) as resp:
+                assert resp.status == 200
+        await simulator.stop()
+
+    def test_expired_tokens_are_forgotten(self):
+        """Issuing a token drops the expired ones."""
+        clock = FakeClock()
+        simulator = EverhomeSimulator([], clock=clock, token_lifetime=60)
+        simulator.issue_token()
+        clock.now = 30
+        kept = simulator.issue_token()
+        clock.now = 61
+
+        latest = simulator.issue_token()
+
+        assert set(simulator._tokens) == {kept, latest}
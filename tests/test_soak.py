@@ -0,0 +1,126 @@
+"""Soak test the Everhome coordinator against the simulator."""
+
+from __future__ import annotations
+
+import logging
+import tracemalloc
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.everhome.const import UPDATE_INTERVAL
+from custom_components.everhome.metrics import LATENCY_WINDOW
+
+from .harness import SoakReport, SoakSample, async_run_soak
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _sample(elapsed: float, **values: int | float | None) -> SoakSample:
+    return SoakSample(
+        **{
+            "elapsed": elapsed,
+            "requests": 300,
+            "latency": 0.01,
+            "memory": None,
+            "timers": 2,
+            "tasks": 1,
+            **values,
+        }
+    )
+
+
+class TestSoakReport:
+    """Test flagging resources that keep growing."""
+
+    def test_flat_series_are_not_flagged(self):
+        """Fluctuating and constant resources pass."""
+        report = SoakReport(
+            samples=[
+                _sample(1, requests=300, latency=0.012),
+                _sample(2, requests=301, latency=0.010),
+                _sample(3, requests=299, latency=0.011),
+                _sample(4, requests=300, latency=0.012),
+            ]
+        )
+
+        assert report.growing() == []
+
+    def test_monotonic_series_are_flagged(self):
+        """A resource that never shrinks and ends higher is flagged."""
+        report = SoakReport(
+            samples=[
+                _sample(1, memory=1000, timers=2),
+                _sample(2, memory=1200, timers=3),
+                _sample(3, memory=1200, timers=4),
+                _sample(4, memory=1500, timers=5),
+            ]
+        )
+
+        assert report.growing() == ["memory", "timers"]
+        assert report.series("memory") == [1000, 1200, 1200, 1500]
+
+    def test_noise_is_not_flagged(self):
+        """A poll landing on either side of a sample is not growth."""
+        report = SoakReport(
+            samples=[_sample(1, requests=113)]
+            + [_sample(elapsed, requests=114) for elapsed in range(2, 8)]
+        )
+
+        assert report.growing() == []
+
+    def test_short_runs_are_not_flagged(self):
+        """Two samples are too few to call a trend."""
+        report = SoakReport(samples=[_sample(1, tasks=1), _sample(2, tasks=2)])
+
+        assert report.growing() == []
+
+
+class TestSoak:
+    """Run the coordinator for days of virtual time."""
+
+    @pytest.fixture(autouse=True)
+    def _environment(self, socket_enabled, caplog, hass: HomeAssistant):
+        """Allow the simulator to listen and keep the run quiet."""
+        # Captured debug records would otherwise grow with the run
+        caplog.set_level(logging.WARNING)
+        # A debug loop keeps tracebacks and reprs of handles it has scheduled
+        hass.loop.set_debug(False)
+
+    async def _soak(
+        self, hass: HomeAssistant, freezer, days: float, **kwargs
+    ) -> SoakReport:
+        tracemalloc.start()
+        try:
+            report = await async_run_soak(
+                hass, freezer.tick, days, sample_every=days * 86400 / 8, **kwargs
+            )
+        finally:
+            tracemalloc.stop()
+        for sample in report.samples:
+            _LOGGER.debug("Soak sample: %s", sample)
+        return report
+
+    @pytest.mark.soak
+    async def test_soak_two_days(self, hass: HomeAssistant, freezer):
+        """Two days of polls and commands leave no resource growing."""
+        # Commands fill the bounded command latency window before the first
+        # sample, so filling it is not mistaken for growing memory
+        command_every = 600
+        assert LATENCY_WINDOW * command_every < 2 * 86400 / 4
+        report = await self._soak(hass, freezer, 2, command_every=command_every)
+
+        assert len(report.samples) == 7
+        # Polls keep to the scheduler's grid; commands return the device
+        # state, so they need no follow-up refresh
+        assert report.polls == pytest.approx(2 * 86400 / UPDATE_INTERVAL, abs=2)
+        assert report.commands == 2 * 86400 / command_every
+        assert report.growing() == [], report.samples
+
+    @pytest.mark.soak
+    async def test_soak_four_weeks(self, hass: HomeAssistant, freezer):
+        """Four weeks of polls and commands leave no resource growing."""
+        report = await self._soak(hass, freezer, 28)
+
+        assert report.polls == pytest.approx(28 * 86400 / UPDATE_INTERVAL, abs=2)
+        assert report.growing() == [], report.samples
@@ -2,8 +2,6 @@
 
 from __future__ import annotations
 
-from unittest.mock import AsyncMock
-
 import pytest
 from homeassistant.components.switch import SwitchDeviceClass
 from homeassistant.core import HomeAssistant
@@ -16,11 +14,9 @@ class TestEverhomeSwitch:
     """Test Everhome switch entity."""
 
     @pytest.fixture
-    def mock_coordinator(self, mock_config_entry):
+    def mock_coordinator(self, mock_coordinator):
         """Mock coordinator with a mixed set of device data."""
-        coordinator = AsyncMock()
-        coordinator.entry = mock_config_entry
-        coordinator.data = {
+        mock_coordinator.data = {
             "socket_001": {
                 "id": "socket_001",
                 "name": "Living Room Socket",
@@ -41,9 +37,7 @@ class TestEverhomeSwitch:
                 "states": {"general": "down"},
             },
         }
-        coordinator.execute_device_action = AsyncMock(return_value=True)
-        coordinator.async_request_refresh = AsyncMock()
-        return coordinator
+        return mock_coordinator
 
     # ------------------------------------------------------------------
     # async_setup_entry
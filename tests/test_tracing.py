@@ -0,0 +1,117 @@
+"""Test Everhome tracing spans."""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.everhome.tracing import (
+    NULL_TRACER,
+    Tracer,
+    async_create_tracer,
+    span,
+)
+
+
+class _ListHandler(logging.Handler):
+    """Collect emitted trace events."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.events: list[dict] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.events.append(json.loads(record.getMessage()))
+
+
+class TestEverhomeTracing:
+    """Test the contextvar based tracer."""
+
+    @pytest.fixture
+    def handler(self):
+        """Handler collecting events."""
+        return _ListHandler()
+
+    @pytest.fixture
+    def tracer(self, handler):
+        """Tracer writing to the list handler."""
+        tracer = Tracer(handler, "test")
+        yield tracer
+        tracer.stop()
+
+    def test_nested_spans_share_trace(self, tracer, handler):
+        """Child spans opened with span() attach to the active trace."""
+        with tracer.span("command", action="up"):
+            with span("token"):
+                pass
+            with span("request"):
+                pass
+        tracer.stop()
+
+        by_name = {event["name"]: event for event in handler.events}
+        root = by_name["command"]
+        assert root["ph"] == "X"
+        assert root["args"]["parent_id"] is None
+        assert root["args"]["action"] == "up"
+        for name in ("token", "request"):
+            assert by_name[name]["tid"] == root["tid"]
+            assert by_name[name]["args"]["parent_id"] == root["args"]["span_id"]
+
+    def test_separate_roots_get_separate_traces(self, tracer, handler):
+        """Each root span starts a new trace."""
+        with tracer.span("refresh"):
+            pass
+        with tracer.span("refresh"):
+            pass
+        tracer.stop()
+
+        assert len({event["tid"] for event in handler.events}) == 2
+
+    def test_span_without_trace_is_noop(self, handler):
+        """span() outside a trace records nothing."""
+        with span("decode"):
+            pass
+        with NULL_TRACER.span("command"):
+            pass
+
+        assert handler.events == []
+
+    def test_null_tracer_joins_active_trace(self, tracer, handler):
+        """A disabled tracer still nests inside an enabled trace."""
+        with tracer.span("refresh"):
+            with NULL_TRACER.span("command"):
+                pass
+        tracer.stop()
+
+        assert [event["name"] for event in handler.events] == ["command", "refresh"]
+
+    async def test_async_create_tracer_writes_file(self, hass: HomeAssistant):
+        """The created tracer writes JSON lines to the config directory."""
+        tracer = await async_create_tracer(hass, "entry_1")
+        with tracer.span("refresh"):
+            pass
+        await tracer.async_stop(hass)
+
+        path = hass.config.path("everhome_trace_entry_1.jsonl")
+        with open(path, encoding="utf-8") as trace_file:
+            event = json.loads(trace_file.readline())
+        os.remove(path)
+
+        assert event["name"] == "refresh"
+
+    async def test_async_stop_closes_off_the_loop(self, hass: HomeAssistant, handler):
+        """Stopping joins the listener and closes the file in the executor."""
+        tracer = Tracer(handler, "test")
+        threads = []
+        handler.close = lambda: threads.append(threading.current_thread())
+
+        await tracer.async_stop(hass)
+        await NULL_TRACER.async_stop(hass)
+
+        assert threads
+        assert threads[0] is not threading.main_thread()
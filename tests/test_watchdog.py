@@ -0,0 +1,70 @@
+"""Test the Everhome event loop watchdog."""
+
+from __future__ import annotations
+
+import logging
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.everhome.metrics import EverhomeMetrics
+from custom_components.everhome.watchdog import NULL_WATCHDOG, LoopWatchdog
+
+
+class TestEverhomeLoopWatchdog:
+    """Test timing of synchronous sections."""
+
+    def test_fast_section_is_not_a_stall(self, caplog):
+        """Sections under the threshold only update the worst time."""
+        metrics = EverhomeMetrics()
+        watchdog = LoopWatchdog(metrics, 0.05)
+
+        with patch(
+            "custom_components.everhome.watchdog.time.perf_counter",
+            side_effect=[1.0, 1.01],
+        ):
+            with watchdog.measure("decode", 100):
+                pass
+
+        assert metrics.loop_stalls == {}
+        assert metrics.loop_block_max == {"decode": pytest.approx(0.01)}
+        assert "blocked the event loop" not in caplog.text
+
+    def test_slow_section_is_logged_and_counted(self, caplog):
+        """Sections over the threshold are logged with their size."""
+        metrics = EverhomeMetrics()
+        watchdog = LoopWatchdog(metrics, 0.05)
+
+        with (
+            caplog.at_level(logging.WARNING),
+            patch(
+                "custom_components.everhome.watchdog.time.perf_counter",
+                side_effect=[1.0, 1.2, 2.0, 2.1],
+            ),
+        ):
+            with watchdog.measure("filter", 5000):
+                pass
+            with watchdog.measure("filter", 5000):
+                pass
+
+        assert metrics.loop_stalls == {"filter": 2}
+        assert metrics.loop_block_max["filter"] > 0.19
+        assert "filter blocked the event loop for 200.0 ms (size 5000)" in caplog.text
+
+    def test_section_is_measured_when_it_raises(self):
+        """A failing section still records its time."""
+        metrics = EverhomeMetrics()
+        watchdog = LoopWatchdog(metrics, 1.0)
+
+        try:
+            with watchdog.measure("snapshot"):
+                raise ValueError
+        except ValueError:
+            pass
+
+        assert "snapshot" in metrics.loop_block_max
+
+    def test_null_watchdog(self):
+        """The disabled watchdog records nothing."""
+        with NULL_WATCHDOG.measure("decode", 1):
+            pass